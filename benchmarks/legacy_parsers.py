@@ -0,0 +1,215 @@
+"""
+The markdown parsers as they were before the single-pass tokenizers, kept
+verbatim so parser_benchmark.py can report them as the baseline.
+"""
+
+import re
+from typing import List
+
+def parse_hn_markdown(markdown_content: str) -> List[dict]:
+    """Parse HackerNews markdown content to extract posts.
+    
+    Args:
+        markdown_content: The markdown content from ScraperAPI
+        
+    Returns:
+        List of dictionaries containing post information
+    """
+    posts = []
+    lines = markdown_content.split('\n')
+    
+    current_post = {}
+    for line in lines:
+        line = line.strip()
+        
+        # Skip empty lines
+        if not line:
+            continue
+            
+        # Look for post titles (usually start with [title](url) format)
+        if line.startswith('[') and '](http' in line:
+            # Save previous post if exists
+            if current_post.get('title'):
+                posts.append(current_post.copy())
+                current_post = {}
+            
+            # Extract title and URL
+            title_end = line.find('](http')
+            if title_end > 1:
+                title = line[1:title_end]
+                url_start = line.find('](') + 2
+                url_end = line.find(')', url_start)
+                url = line[url_start:url_end] if url_end > url_start else ''
+                
+                current_post['title'] = title
+                current_post['url'] = url
+                current_post['points'] = 0
+                current_post['comments'] = 0
+        
+        # Look for points and comments (usually in format like "X points|user|time ago|Y comments")
+        elif 'points' in line and 'ago' in line:
+            parts = line.split('|')
+            for part in parts:
+                part = part.strip()
+                if 'points' in part:
+                    try:
+                        points = int(part.split()[0])
+                        current_post['points'] = points
+                    except:
+                        pass
+                elif 'comment' in part:
+                    try:
+                        comments = int(part.split()[0])
+                        current_post['comments'] = comments
+                    except:
+                        pass
+    
+    # Don't forget the last post
+    if current_post.get('title'):
+        posts.append(current_post)
+    
+    return posts
+
+def parse_reddit_search_markdown(markdown_content: str) -> List[dict]:
+    """Parse Reddit search markdown to extract post information.
+    
+    Args:
+        markdown_content: The markdown content from ScraperAPI
+        
+    Returns:
+        List of dictionaries containing post information
+    """
+    posts = []
+    lines = markdown_content.split('\n')
+    
+    current_post = {}
+    in_post_section = False
+    
+    for i, line in enumerate(lines):
+        line = line.strip()
+        
+        if not line:
+            continue
+        
+        # Look for post titles which are typically in the format: [ Title ](/r/subreddit/...)
+        if line.startswith('## [ ') and ' ](/r/' in line:
+            # Save previous post if exists
+            if current_post.get('title'):
+                posts.append(current_post.copy())
+                current_post = {}
+            
+            # Extract title
+            title_end = line.find(' ](/r/')
+            if title_end > 4:  # "## [ " is 5 chars
+                title = line[4:title_end]  # Skip the "## [ " prefix
+                
+                # Extract URL and subreddit
+                url_start = line.find('](/') + 2
+                url_end = line.find(')', url_start)
+                url = "https://www.reddit.com" + line[url_start:url_end] if url_end > url_start else ''
+                
+                # Extract subreddit from URL
+                subreddit = ""
+                if '/r/' in url:
+                    subreddit_start = url.find('/r/') + 3
+                    subreddit_end = url.find('/', subreddit_start)
+                    if subreddit_end > subreddit_start:
+                        subreddit = url[subreddit_start:subreddit_end]
+                
+                current_post['title'] = title
+                current_post['url'] = url
+                current_post['upvotes'] = 0
+                current_post['comments'] = 0
+                current_post['subreddit'] = subreddit if subreddit else ""
+                in_post_section = True
+        
+        # Look for explicit subreddit info (r/subreddit format)
+        elif in_post_section and line.startswith('r/'):
+            current_post['subreddit'] = line.split()[0].replace('r/', '')
+        
+        # Look for votes and comments info
+        elif in_post_section and 'votes' in line and 'comments' in line:
+            # This line might contain vote and comment counts
+            parts = line.split('·')
+            for part in parts:
+                part = part.strip()
+                if 'votes' in part:
+                    numbers = re.findall(r'\d+', part)
+                    if numbers:
+                        current_post['upvotes'] = int(numbers[0])
+                elif 'comments' in part:
+                    numbers = re.findall(r'\d+', part)
+                    if numbers:
+                        current_post['comments'] = int(numbers[0])
+        
+        # Check if we're starting a new section (which means end of current post)
+        elif in_post_section and line.startswith('---'):
+            in_post_section = False
+    
+    # Don't forget the last post
+    if current_post.get('title'):
+        posts.append(current_post)
+    
+    return posts
+
+def parse_reddit_comments_markdown(markdown_content: str) -> List[dict]:
+    """Parse Reddit comments from markdown.
+    
+    Args:
+        markdown_content: The markdown content from ScraperAPI
+        
+    Returns:
+        List of dictionaries containing comment information
+    """
+    comments = []
+    lines = markdown_content.split('\n')
+    
+    current_comment = {}
+    in_comment_section = False
+    
+    for line in lines:
+        line = line.strip()
+        
+        # Detect if we're in the comments section
+        if 'comments' in line.lower() and ('sort by' in line.lower() or 'best' in line.lower()):
+            in_comment_section = True
+            continue
+        
+        if not in_comment_section:
+            continue
+        
+        # Look for comment content
+        # Reddit comments in markdown often appear with username first, then the comment text
+        if line.startswith('[u/') or line.startswith('u/'):
+            # This is likely a username line, the next line might be the comment
+            if current_comment.get('text'):
+                # Save previous comment
+                comments.append(current_comment.copy())
+                current_comment = {}
+            
+            current_comment['upvotes'] = 0
+            # Try to find the comment text in the next few lines
+            continue
+        
+        # If we have a current comment being built and this line looks like content
+        if current_comment and not current_comment.get('text') and line and len(line) > 5 and not line.startswith('[') and not line.startswith('*'):
+            current_comment['text'] = line
+        
+        # Look for upvotes in comments
+        elif 'upvote' in line.lower() or 'point' in line.lower() or 'vote' in line.lower():
+            numbers = re.findall(r'\d+', line)
+            if numbers and current_comment:
+                current_comment['upvotes'] = int(numbers[0])
+    
+    # Don't forget the last comment
+    if current_comment.get('text'):
+        comments.append(current_comment)
+    
+    # If we couldn't parse any comments properly, create a fallback comment
+    if not comments:
+        comments.append({
+            'text': "Unable to parse comments. Reddit's comment structure may have changed.",
+            'upvotes': 0
+        })
+    
+    return comments
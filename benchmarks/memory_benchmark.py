@@ -0,0 +1,150 @@
+"""
+Benchmark peak memory of a validation as the number of posts grows.
+
+Runs whole validations (steps 2-7) against the local stand-in services of
+worker_benchmark.py, with comment threads fetched for every post, and
+measures each run's peak Python heap with tracemalloc. The post analyses of
+steps 5-6 come from a fixed stand-in analysis (Gemini has no local stand-in);
+step 7 falls back to the basic report when the placeholder Gemini key is
+rejected.
+
+Part of the peak is search pages and comment threads the run adds to the
+process-wide caches, which outlive the run (up to SEARCH_CACHE_SIZE and
+COMMENT_CACHE_SIZE entries). That part is reported as cache_growth_mb;
+run_heap_mb is the rest of the peak, the memory the run itself works with.
+
+Usage:
+    python benchmarks/memory_benchmark.py [--posts 250 1000 4000] [--pages 5]
+
+A warm-up run comes first, so one-time allocations (imports, connection
+pools) are not counted. Everything the runs write goes to a temporary
+directory that is removed afterwards.
+"""
+
+import gc
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from worker_benchmark import StandInServices, BUSINESS_IDEA, HN_HITS_PER_PAGE, REDDIT_POSTS_PER_PAGE
+
+STAND_IN_ANALYSIS = {
+    "relevant": True,
+    "pain_points": ["Chasing late invoice payments", "Manual reminders"],
+    "solutions_mentioned": ["Spreadsheets", "Accounting suites"],
+    "market_signals": ["Would pay for automated reminders"],
+    "sentiment": "negative",
+    "engagement_score": 6
+}
+
+def stand_in_stages():
+    """Stage runner: steps 2-4 for real, steps 5-6 with the stand-in analysis."""
+    from business_validator.stages import InProcessStages
+
+    class StandInAnalysisStages(InProcessStages):
+        def map(self, run, stage_name: str, items, payload: Dict[str, Any], progress=None, output: Optional[Any] = None) -> List[Dict[str, Any]]:
+            if stage_name not in ("hn_analysis", "reddit_analysis"):
+                return super().map(run, stage_name, items, payload, progress, output)
+            for i, post in enumerate(items):
+                run.check_cancelled()
+                analysis = dict(STAND_IN_ANALYSIS, post_url=post.get("url"))
+                if stage_name == "reddit_analysis":
+                    analysis["subreddit_context"] = f"r/{post.get('subreddit', 'freelance')}"
+                output.append(analysis)
+                if progress:
+                    progress(i + 1, [analysis])
+            return [{}] if len(items) else []
+
+    return StandInAnalysisStages()
+
+def run_round(name: str, posts: int, pages: int) -> Dict[str, Any]:
+    """Validate once with about `posts` posts per platform; returns the run's peak heap."""
+    from business_validator.run_context import RunContext
+    from business_validator.validator import validate_business_idea
+
+    # Enough keywords that the smaller Reddit pages still yield `posts` posts
+    keywords = [f"invoicing freelancers {name} {i}" for i in range(math.ceil(posts / (pages * REDDIT_POSTS_PER_PAGE)))]
+    run = RunContext(BUSINESS_IDEA, {
+        "HN_DELAY": 0,
+        "REDDIT_DELAY": 0,
+        "MAX_PAGES_PER_KEYWORD_HN": max(1, math.ceil(posts / (len(keywords) * HN_HITS_PER_PAGE))),
+        "MAX_PAGES_PER_KEYWORD_REDDIT": pages,
+        "HN_COMMENT_POSTS": posts,
+        # Large enough that every collected post is sampled
+        "ANALYSIS_BUDGET": 3 * posts,
+        "CASCADE_MODE": False,
+        "ENRICH_ARTICLES": False,
+        # The stand-in analyses are all alike and would converge after a few dozen posts
+        "EARLY_STOPPING": False
+    })
+
+    gc.collect()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    analysis = validate_business_idea(BUSINESS_IDEA, run=run, keywords=keywords, stages=stand_in_stages())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    # What the run left behind: entries added to the process-wide caches
+    retained, _ = tracemalloc.get_traced_memory()
+
+    counters = run.metrics.snapshot()["counters"]
+    unique_posts = {}
+    for platform, filename in (("hn", "02_hn_page_policy.json"), ("reddit", "03_reddit_page_policy.json")):
+        with open(os.path.join(run.data_dir, filename), encoding="utf-8") as f:
+            unique_posts[platform] = json.load(f)["unique_posts"]
+    return {
+        "round": name,
+        "hn_posts": unique_posts["hn"],
+        "reddit_posts": unique_posts["reddit"],
+        "comment_threads": counters.get("hn.comment_fetches", 0) + counters.get("reddit.comment_fetches", 0),
+        "report_score": analysis.overall_score,
+        "seconds": round(elapsed, 1),
+        "peak_heap_mb": round((peak - baseline) / 2 ** 20, 2),
+        "cache_growth_mb": round((retained - baseline) / 2 ** 20, 2),
+        "run_heap_mb": round((peak - retained) / 2 ** 20, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, nargs="+", default=[250, 1000, 4000], help="Posts per platform in each measured run")
+    parser.add_argument("--pages", type=int, default=5, help="Reddit search pages per keyword")
+    parser.add_argument("--warmup", type=int, default=600, help="Posts per platform in the unmeasured warm-up run")
+    args = parser.parse_args()
+
+    services = StandInServices(0.0, max(args.pages, 100))
+    work_dir = tempfile.mkdtemp(prefix="memory_benchmark_")
+    os.environ.update({
+        "SCRAPERAPI_KEY": "benchmark",
+        "SCRAPERAPI_ENDPOINT": f"{services.base_url}/scraperapi/",
+        "SCRAPERAPI_ACCOUNT_URL": f"{services.base_url}/account",
+        "HN_API_BASE": f"{services.base_url}/hn",
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "benchmark")
+    })
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    tracemalloc.start()
+    try:
+        run_round("warmup", args.warmup, args.pages)
+        results = [run_round(f"p{posts}", posts, args.pages) for posts in args.posts]
+    finally:
+        tracemalloc.stop()
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps({"stand_in_requests": services.requests, "rounds": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
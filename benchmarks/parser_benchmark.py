@@ -0,0 +1,141 @@
+"""
+Benchmark the HN and Reddit markdown parsers against the parsers they replaced.
+
+Measures throughput (pages/s, MB/s) and the junk-record rate (records that are
+not real posts or comments, e.g. "6 points" titles, image links or titles that
+still carry Algolia highlight markers) of the current parsers and of the
+previous ones (legacy_parsers.py) over the same recorded pages.
+
+Usage:
+    python benchmarks/parser_benchmark.py [--corpus DIR] [--runs RUN_DIR ...] [--repeat N]
+
+Pages come from, in order of preference:
+- a --corpus directory of markdown pages in hn/, reddit_search/ and
+  reddit_comments/ subdirectories (*.md);
+- the markdown pages archived by past runs (raw_index.jsonl), from the given
+  run directories or from every run under validation_data/;
+- the fixtures in benchmarks/fixtures/, search pages rebuilt from the records
+  the previous parser saved under validation_data/ (its junk records keep the
+  page's image link and "N points" meta lines). No raw comment page was ever
+  recorded, so comment parsing is only benchmarked on archived or --corpus pages.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from business_validator.config import DATA_DIR
+from business_validator.scrapers.hackernews import parse_hn_markdown
+from business_validator.scrapers.reddit import parse_reddit_search_markdown, parse_reddit_comments_markdown
+from business_validator.utils.archive import read_index, load_body
+from benchmarks import legacy_parsers
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Archived (endpoint, tier) pairs that hold markdown pages
+ARCHIVED_KINDS = {
+    ("hn_search", "rendered"): "hn",
+    ("reddit_search", "markdown"): "reddit_search",
+    ("reddit_search", "rendered"): "reddit_search",
+    ("reddit_comments", "markdown"): "reddit_comments",
+    ("reddit_comments", "rendered"): "reddit_comments"
+}
+
+_META_TITLE_RE = re.compile(r"^\d+ points?$")
+_HIGHLIGHT_RE = re.compile(r"(?<!\w)_[^_\s][^_]*_(?!\w)")
+_PLACEHOLDER = "Unable to parse comments"
+
+def is_junk_post(post: dict) -> bool:
+    """True for parsed records that are not real posts."""
+    title = (post.get('title') or "").strip()
+    return (
+        not title
+        or _META_TITLE_RE.match(title) is not None
+        or title.startswith("![")
+        or _HIGHLIGHT_RE.search(title) is not None
+        or not (post.get('url') or "").startswith("http")
+    )
+
+def is_junk_comment(comment: dict) -> bool:
+    """True for parsed records that are not real comments."""
+    text = (comment.get('text') or "").strip()
+    return not text or text.startswith(_PLACEHOLDER)
+
+def load_archived(run_dirs: List[str]) -> Dict[str, List[str]]:
+    """Load the markdown pages archived by past runs."""
+    corpus = {kind: [] for kind in set(ARCHIVED_KINDS.values())}
+    for run_dir in run_dirs:
+        for entry in read_index(run_dir):
+            kind = ARCHIVED_KINDS.get((entry["endpoint"], entry["tier"]))
+            if kind is not None:
+                corpus[kind].append(load_body(run_dir, entry))
+    return corpus
+
+def load_corpus(directory: str) -> Dict[str, List[str]]:
+    """Load recorded markdown pages from a corpus directory."""
+    corpus = {}
+    for kind in ("hn", "reddit_search", "reddit_comments"):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(directory, kind, "*.md"))):
+            with open(path, encoding="utf-8") as f:
+                pages.append(f.read())
+        corpus[kind] = pages
+    return corpus
+
+def run(pages: List[str], parse: Callable[[str], List[dict]], is_junk: Callable[[dict], bool], repeat: int) -> dict:
+    """Time a parser over the pages and count its junk records."""
+    size = sum(len(page.encode("utf-8")) for page in pages)
+    records = [record for page in pages for record in parse(page)]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parse(page)
+    elapsed = time.perf_counter() - start
+    junk = sum(1 for record in records if is_junk(record))
+    return {
+        "pages": len(pages),
+        "records": len(records),
+        "junk_records": junk,
+        "junk_rate": round(junk / len(records), 4) if records else 0.0,
+        "pages_per_second": round(len(pages) * repeat / elapsed, 1) if elapsed else 0.0,
+        "mb_per_second": round(size * repeat / elapsed / 1e6, 2) if elapsed else 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of recorded markdown pages")
+    parser.add_argument("--runs", nargs="*", help="Run directories with archived pages (default: every run in validation_data)")
+    parser.add_argument("--repeat", type=int, default=50, help="Passes over the corpus when timing")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus, source = load_corpus(args.corpus), args.corpus
+    else:
+        run_dirs = args.runs or sorted(os.path.dirname(path) for path in glob.glob(os.path.join(DATA_DIR, "*", "raw_index.jsonl")))
+        corpus, source = load_archived(run_dirs), "archived pages"
+        if not any(corpus.values()):
+            corpus, source = load_corpus(FIXTURES_DIR), FIXTURES_DIR
+
+    parsers = {
+        "hn": (parse_hn_markdown, legacy_parsers.parse_hn_markdown, is_junk_post),
+        "reddit_search": (parse_reddit_search_markdown, legacy_parsers.parse_reddit_search_markdown, is_junk_post),
+        "reddit_comments": (parse_reddit_comments_markdown, legacy_parsers.parse_reddit_comments_markdown, is_junk_comment)
+    }
+    results = {"source": source}
+    for kind, (parse, legacy_parse, is_junk) in parsers.items():
+        if corpus.get(kind):
+            results[kind] = {
+                "old": run(corpus[kind], legacy_parse, is_junk, args.repeat),
+                "new": run(corpus[kind], parse, is_junk, args.repeat)
+            }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
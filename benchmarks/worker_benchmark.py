@@ -0,0 +1,268 @@
+"""
+Benchmark sharded validation throughput at different worker counts.
+
+Starts a local stand-in for the Algolia HN API, the ScraperAPI endpoint
+(serving Reddit search and comment JSON) and the ScraperAPI account endpoint,
+then for each worker count queues the same amount of search and
+comment-thread shards (steps 2-4, fresh keywords and posts every round so no
+process-level cache helps) and times how long the worker processes take to
+drain the queue. The analysis stages (5-6) are not included: they call Gemini,
+which has no local stand-in.
+
+Usage:
+    python benchmarks/worker_benchmark.py [--workers 1 2 4 8] [--keywords 16] [--posts 80] [--latency 0.05]
+
+Everything the run writes (task database, run store, logs) goes to a
+temporary directory that is removed afterwards.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import shutil
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List
+from urllib.parse import urlparse, parse_qs
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+BUSINESS_IDEA = "Invoicing tool for freelancers"
+HN_HITS_PER_PAGE = 50
+REDDIT_POSTS_PER_PAGE = 25
+COMMENTS_PER_THREAD = 60
+
+_COMMENT_HTML = ("<p>We moved our freelancer invoicing off spreadsheets last year &amp; the hardest part "
+                 "was chasing late payments. I&#x27;d pay for something that <i>automates reminders</i>.</p>")
+
+class StandInServices:
+    """Local stand-ins for the HN API, ScraperAPI and its account endpoint."""
+
+    def __init__(self, latency: float, pages: int):
+        self.latency = latency
+        self.pages = pages
+        self.requests = 0
+        self._lock = threading.Lock()
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with services._lock:
+                    services.requests += 1
+                status, body = services.respond(self.path)
+                time.sleep(services.latency)
+                data = body.encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Workers are terminated at the end of a round, possibly mid-request
+                    pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def respond(self, path: str):
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if url.path == "/account":
+            return 200, json.dumps({"concurrencyLimit": 10, "requestLimit": 0, "requestCount": 0})
+        if url.path == "/hn/search":
+            return 200, self.hn_search(query["query"][0], int(query.get("page", ["0"])[0]))
+        if url.path.startswith("/hn/items/"):
+            return 200, self.hn_item(url.path.rsplit("/", 1)[-1])
+        if url.path == "/scraperapi/":
+            target = urlparse(query["url"][0])
+            target_query = parse_qs(target.query)
+            if target.path == "/search.json":
+                return 200, self.reddit_search(target_query["q"][0], int(target_query.get("count", ["0"])[0]) // REDDIT_POSTS_PER_PAGE)
+            if "/comments/" in target.path:
+                return 200, self.reddit_comments()
+        return 404, "{}"
+
+    def hn_search(self, keyword: str, page: int) -> str:
+        prefix = zlib.crc32(keyword.encode()) % 10 ** 6 * 1000 + page * 100
+        hits = [{
+            "objectID": str(prefix + i),
+            "title": f"{BUSINESS_IDEA}: {keyword} ({page}.{i})",
+            "url": f"https://example.com/{prefix + i}",
+            "points": 10 + i,
+            "num_comments": 5 + i
+        } for i in range(HN_HITS_PER_PAGE)]
+        return json.dumps({"hits": hits, "page": page, "nbPages": self.pages})
+
+    def hn_item(self, item_id: str) -> str:
+        children = [{"type": "comment", "text": _COMMENT_HTML, "author": f"user{i}",
+                     "children": [{"type": "comment", "text": _COMMENT_HTML, "author": "reply", "children": []}]}
+                    for i in range(COMMENTS_PER_THREAD // 2)]
+        return json.dumps({"id": item_id, "type": "story", "children": children})
+
+    def reddit_search(self, keyword: str, page: int) -> str:
+        prefix = f"{zlib.crc32(keyword.encode()):x}{page}"
+        children = [{"kind": "t3", "data": {
+            "title": f"{BUSINESS_IDEA}? {keyword} ({page}.{i})",
+            "permalink": f"/r/freelance/comments/{prefix}{i}/thread/",
+            "score": 20 + i,
+            "num_comments": 10 + i,
+            "subreddit": "freelance",
+            "selftext": "Looking for a better way to send invoices and get paid on time."
+        }} for i in range(REDDIT_POSTS_PER_PAGE)]
+        after = f"t3_{prefix}" if page + 1 < self.pages else None
+        return json.dumps({"data": {"after": after, "children": children}})
+
+    def reddit_comments(self) -> str:
+        children = [{"kind": "t1", "data": {"body": _COMMENT_HTML, "score": i, "author": f"user{i}"}}
+                    for i in range(COMMENTS_PER_THREAD)]
+        return json.dumps([{}, {"data": {"children": children}}])
+
+def build_shards(round_id: str, keywords: int, posts: int, pages: int) -> Dict[str, List[dict]]:
+    """Shards for steps 2-4 with keywords and posts no earlier round has used."""
+    from business_validator.config import SHARD_POSTS_PER_TASK
+
+    keyword_list = [f"invoicing freelancers {round_id} {i}" for i in range(keywords)]
+    payload = {
+        "business_idea": BUSINESS_IDEA,
+        "keywords": keyword_list,
+        "config_overrides": {
+            "HN_DELAY": 0,
+            "REDDIT_DELAY": 0,
+            "MAX_PAGES_PER_KEYWORD_HN": pages,
+            "MAX_PAGES_PER_KEYWORD_REDDIT": pages
+        }
+    }
+    seed = zlib.crc32(round_id.encode()) % 10 ** 6
+    hn_posts = [{"title": f"{BUSINESS_IDEA} {round_id} {i}", "url": f"https://news.ycombinator.com/item?id={seed}{i:04d}",
+                 "hn_id": f"{seed}{i:04d}", "points": 10, "comments": 30} for i in range(posts)]
+    reddit_posts = [{"title": f"{BUSINESS_IDEA} {round_id} {i}",
+                     "url": f"https://www.reddit.com/r/freelance/comments/{round_id}{i}/thread/"} for i in range(posts)]
+
+    def split(items, size):
+        return [{"items": items[i:i + size], "payload": payload} for i in range(0, len(items), size)]
+
+    return {
+        "hn_search": split(keyword_list, 1),
+        "reddit_search": split(keyword_list, 1),
+        "hn_comments": split(hn_posts, SHARD_POSTS_PER_TASK),
+        "reddit_comments": split(reddit_posts, SHARD_POSTS_PER_TASK)
+    }
+
+def _wait_for_workers(queue, run_dir: str, workers: int, timeout: float = 120):
+    """Hand out warm-up shards until every worker process has run one."""
+    seen, deadline, warmup = set(), time.monotonic() + timeout, 0
+    while len(seen) < workers and time.monotonic() < deadline:
+        queued = sum(1 for task in queue.stage_tasks(run_dir, "hn_comments") if task["status"] == "queued")
+        if not queued:
+            warmup += 1
+            post = {"title": "warm-up", "url": "https://news.ycombinator.com/item?id=1", "hn_id": f"9{warmup}"}
+            queue.enqueue(run_dir, "hn_comments", [{"items": [post], "payload": {
+                "business_idea": BUSINESS_IDEA, "keywords": [], "config_overrides": {}}}])
+        seen = {task["worker"] for task in queue.stage_tasks(run_dir, "hn_comments") if task["status"] == "succeeded"}
+        time.sleep(0.05)
+    queue.purge(run_dir)
+    if len(seen) < workers:
+        raise RuntimeError(f"Only {len(seen)} of {workers} worker(s) started")
+
+def run_round(workers: int, args, work_dir: str) -> dict:
+    """Time how long `workers` processes take to drain one round of shards."""
+    from business_validator.jobs import TaskQueue, start_workers
+
+    db_path = os.path.join(work_dir, f"tasks_{workers}.sqlite3")
+    queue = TaskQueue(db_path)
+    run_dir = os.path.join(work_dir, "validation_data", f"benchmark_{workers}")
+    os.makedirs(run_dir, exist_ok=True)
+
+    processes = start_workers(workers, db_path=db_path)
+    try:
+        _wait_for_workers(queue, os.path.join(run_dir, "warmup"), workers)
+
+        shards = build_shards(f"w{workers}", args.keywords, args.posts, args.pages)
+        start = time.perf_counter()
+        for stage, stage_shards in shards.items():
+            queue.enqueue(run_dir, stage, stage_shards)
+        total = sum(len(stage_shards) for stage_shards in shards.values())
+        while True:
+            counts = queue.counts()
+            finished = counts.get("succeeded", 0) + counts.get("failed", 0)
+            if finished >= total:
+                break
+            time.sleep(0.02)
+        elapsed = time.perf_counter() - start
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    pages = threads = 0
+    for stage in shards:
+        for task in queue.stage_tasks(run_dir, stage):
+            if not task["result_path"]:
+                continue
+            with open(task["result_path"], encoding="utf-8") as f:
+                result = json.load(f)
+            if stage.endswith("_search"):
+                pages += result["policy"]["pages_fetched"]
+            else:
+                threads += sum(1 for post in result["items"] if post.get("comments_data"))
+    return {
+        "workers": workers,
+        "shards": total,
+        "failed": counts.get("failed", 0),
+        "search_pages": pages,
+        "comment_threads": threads,
+        "seconds": round(elapsed, 2),
+        "shards_per_second": round(total / elapsed, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to measure")
+    parser.add_argument("--keywords", type=int, default=16, help="Keywords per round (one search shard each, per platform)")
+    parser.add_argument("--posts", type=int, default=80, help="Posts per platform whose comment threads are fetched")
+    parser.add_argument("--pages", type=int, default=3, help="Search pages per keyword")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the stand-in services wait per response")
+    args = parser.parse_args()
+
+    services = StandInServices(args.latency, args.pages)
+    work_dir = tempfile.mkdtemp(prefix="worker_benchmark_")
+    # Workers are spawned, so they pick the stand-ins up from the environment and write under work_dir
+    os.environ.update({
+        "SCRAPERAPI_KEY": "benchmark",
+        "SCRAPERAPI_ENDPOINT": f"{services.base_url}/scraperapi/",
+        "SCRAPERAPI_ACCOUNT_URL": f"{services.base_url}/account",
+        "HN_API_BASE": f"{services.base_url}/hn",
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "benchmark")
+    })
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        results = [run_round(workers, args, work_dir) for workers in args.workers]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = round(baseline / result["seconds"], 2) if result["seconds"] else 0.0
+    print(json.dumps({"cpu_count": os.cpu_count(), "latency_seconds": args.latency,
+                      "stand_in_requests": services.requests, "rounds": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
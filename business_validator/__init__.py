@@ -6,5 +6,9 @@ data from HackerNews and Reddit.
 """
 
 from business_validator.validator import validate_business_idea, print_validation_report
+from business_validator.run_context import RunContext, RunConfig, RunCancelled
+from business_validator.batch import validate_batch
+from business_validator.streaming import iter_validation, aiter_validation
 
-__all__ = ['validate_business_idea', 'print_validation_report']
+__all__ = ['validate_business_idea', 'print_validation_report', 'RunContext', 'RunConfig', 'RunCancelled', 'validate_batch',
+           'iter_validation', 'aiter_validation']
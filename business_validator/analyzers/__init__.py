@@ -5,6 +5,9 @@ Analyzer modules for processing and analyzing scraped data.
 from business_validator.analyzers.keyword_generator_simple import generate_keywords
 from business_validator.analyzers.hackernews_analyzer import analyze_hn_post
 from business_validator.analyzers.reddit_analyzer import analyze_reddit_post
+from business_validator.analyzers.triage import iter_triage
+from business_validator.analyzers.summary import AnalysisSummary, PhraseCounter
+from business_validator.analyzers.convergence import ConvergenceMonitor
 from business_validator.analyzers.combined_analyzer import (
     generate_final_analysis,
     create_fallback_analysis,
@@ -15,6 +18,10 @@ __all__ = [
     'generate_keywords',
     'analyze_hn_post',
     'analyze_reddit_post',
+    'iter_triage',
+    'AnalysisSummary',
+    'PhraseCounter',
+    'ConvergenceMonitor',
     'generate_final_analysis',
     'create_fallback_analysis',
     'create_minimal_analysis'
@@ -3,47 +3,49 @@ Combined analysis functionality that synthesizes insights from multiple sources.
 """
 
 import logging
-import os
-import json
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 from business_validator.models import CombinedAnalysis, HNPostAnalysis, RedditPostAnalysis, PlatformInsight
+from business_validator.analyzers.summary import AnalysisSummary
+from business_validator.utils.context import current_config
+from business_validator.analyzers.llm_client import get_google_api_key, generate_structured
 
 def generate_final_analysis(
-    hn_analyses: List[HNPostAnalysis],
-    reddit_analyses: List[RedditPostAnalysis],
+    hn_analyses: Union[Iterable[HNPostAnalysis], AnalysisSummary],
+    reddit_analyses: Union[Iterable[RedditPostAnalysis], AnalysisSummary],
     business_idea: str,
-    keywords: List[str] = None
+    keywords: List[str] = None,
+    on_field: Optional[Callable[[str, Any], None]] = None,
+    estimates: Optional[Dict[str, Dict[str, Any]]] = None
 ) -> CombinedAnalysis:
     """Generate final combined analysis from multiple sources.
     
     Args:
-        hn_analyses: List of HackerNews post analyses
-        reddit_analyses: List of Reddit post analyses
+        hn_analyses: HackerNews post analyses, or their AnalysisSummary
+        reddit_analyses: Reddit post analyses, or their AnalysisSummary
         business_idea: The business idea being validated
         keywords: List of keywords used for search
+        on_field: Optional callback called with (field name, value) as each
+            report field is streamed back, so callers can render it early
+        estimates: Optional relevance rates extrapolated from the analyzed
+            sample to all collected posts (StratifiedSample.estimate), added
+            to the prompt and to the platform insights
         
     Returns:
         CombinedAnalysis object with synthesized insights
     """
     logging.info("Generating final combined analysis...")
+    hn_analyses = AnalysisSummary.of(hn_analyses, "HackerNews")
+    reddit_analyses = AnalysisSummary.of(reddit_analyses, "Reddit")
     
-    # Get API key from environment
-    google_api_key = os.getenv("GOOGLE_API_KEY")
-    
-    if not google_api_key or google_api_key == "your_google_api_key_here":
+    if not get_google_api_key():
         logging.warning("Google API key not found, using fallback analysis")
-        return create_fallback_analysis(hn_analyses, reddit_analyses, business_idea, keywords)
+        return create_fallback_analysis(hn_analyses, reddit_analyses, business_idea, keywords, estimates)
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=google_api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
         # Prepare the data for analysis
-        hn_summary = _summarize_hn_analyses(hn_analyses)
-        reddit_summary = _summarize_reddit_analyses(reddit_analyses)
+        hn_summary = _summarize_hn_analyses(hn_analyses, (estimates or {}).get("HackerNews"))
+        reddit_summary = _summarize_reddit_analyses(reddit_analyses, (estimates or {}).get("Reddit"))
         
         prompt = f"""Business Idea: "{business_idea}"
 Keywords Used: {keywords if keywords else 'Not provided'}
@@ -79,156 +81,146 @@ Instructions:
 
 Focus on providing actionable business intelligence."""
         
-        response = model.generate_content(prompt)
-        
-        # Try to parse the response as JSON
-        try:
-            # First, try to extract JSON from code block or text
-            json_match = response.text.strip()
-            if json_match.startswith('```json'):
-                json_match = json_match[7:-3].strip()
-            elif json_match.startswith('```'):
-                json_match = json_match[3:-3].strip()
-            
-            analysis_data = json.loads(json_match)
-            
-            # Convert platform insights to PlatformInsight objects
-            platform_insights = []
-            for insight_data in analysis_data.get('platform_insights', []):
-                platform_insights.append(PlatformInsight(
-                    platform=insight_data.get('platform', ''),
-                    insights=insight_data.get('insights', '')
-                ))
-            
-            # Validate the parsed data matches our model
-            return CombinedAnalysis(
-                overall_score=analysis_data.get('overall_score', 0),
-                market_validation_summary=analysis_data.get('market_validation_summary', ''),
-                key_pain_points=analysis_data.get('key_pain_points', []),
-                existing_solutions=analysis_data.get('existing_solutions', []),
-                market_opportunities=analysis_data.get('market_opportunities', []),
-                platform_insights=platform_insights,
-                recommendations=analysis_data.get('recommendations', [])
-            )
-        
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
-            logging.warning(f"JSON parsing failed: {e}")
-            logging.warning(f"Raw response: {response.text}")
-            return create_fallback_analysis(hn_analyses, reddit_analyses, business_idea, keywords)
+        config = current_config()
+        analysis = generate_structured(
+            prompt, CombinedAnalysis, model_name=config.ANALYSIS_MODEL, tier="synthesis", allow_partial=False,
+            on_field=_emitting_estimates(on_field, estimates) if on_field and config.STREAM_FINAL_ANALYSIS else None
+        )
+        return _with_estimates(analysis, estimates)
         
     except Exception as e:
         logging.error(f"Error generating final analysis with Gemini API: {e}")
-        return create_fallback_analysis(hn_analyses, reddit_analyses, business_idea, keywords)
+        return create_fallback_analysis(hn_analyses, reddit_analyses, business_idea, keywords, estimates)
 
-def _summarize_hn_analyses(analyses: List[HNPostAnalysis]) -> str:
+def _summarize_hn_analyses(analyses: Union[Iterable[HNPostAnalysis], AnalysisSummary], estimate: Optional[Dict[str, Any]] = None) -> str:
     """Create a summary of HackerNews analyses."""
-    if not analyses:
+    summary = AnalysisSummary.of(analyses, "HackerNews")
+    if not summary.analyzed:
         return "No HackerNews analyses available."
     
-    relevant_count = sum(1 for a in analyses if a.relevant)
-    total_count = len(analyses)
-    
-    all_pain_points = []
-    all_solutions = []
-    all_signals = []
-    
-    for analysis in analyses:
-        if analysis.relevant:
-            all_pain_points.extend(analysis.pain_points)
-            all_solutions.extend(analysis.solutions_mentioned)
-            all_signals.extend(analysis.market_signals)
-    
     return f"""
-    Total posts analyzed: {total_count}
-    Relevant posts: {relevant_count}
-    Common pain points: {', '.join(set(all_pain_points[:5]))}
-    Solutions mentioned: {', '.join(set(all_solutions[:5]))}
-    Market signals: {', '.join(set(all_signals[:5]))}
+    Total posts analyzed: {summary.analyzed}
+    Relevant posts: {summary.relevant}
+    Common pain points: {', '.join(summary.pain_points)}
+    Solutions mentioned: {', '.join(summary.solutions)}
+    Market signals: {', '.join(summary.signals)}
+    Sentiment of relevant posts: {_describe_sentiment(summary)}
+    Average engagement of relevant posts: {summary.average_engagement:.1f}/10
+    Relevance of all collected posts: {describe_estimate(estimate)}
     """
 
-def _summarize_reddit_analyses(analyses: List[RedditPostAnalysis]) -> str:
+def _summarize_reddit_analyses(analyses: Union[Iterable[RedditPostAnalysis], AnalysisSummary], estimate: Optional[Dict[str, Any]] = None) -> str:
     """Create a summary of Reddit analyses."""
-    if not analyses:
+    summary = AnalysisSummary.of(analyses, "Reddit")
+    if not summary.analyzed:
         return "No Reddit analyses available."
     
-    relevant_count = sum(1 for a in analyses if a.relevant)
-    total_count = len(analyses)
-    
-    all_pain_points = []
-    all_solutions = []
-    all_signals = []
-    subreddits = []
-    
-    for analysis in analyses:
-        if analysis.relevant:
-            all_pain_points.extend(analysis.pain_points)
-            all_solutions.extend(analysis.solutions_mentioned)
-            all_signals.extend(analysis.market_signals)
-            if analysis.subreddit_context:
-                subreddits.append(analysis.subreddit_context)
-    
     return f"""
-    Total posts analyzed: {total_count}
-    Relevant posts: {relevant_count}
-    Common pain points: {', '.join(set(all_pain_points[:5]))}
-    Solutions mentioned: {', '.join(set(all_solutions[:5]))}
-    Market signals: {', '.join(set(all_signals[:5]))}
-    Subreddit contexts: {', '.join(set(subreddits[:3]))}
+    Total posts analyzed: {summary.analyzed}
+    Relevant posts: {summary.relevant}
+    Common pain points: {', '.join(summary.pain_points)}
+    Solutions mentioned: {', '.join(summary.solutions)}
+    Market signals: {', '.join(summary.signals)}
+    Subreddit contexts: {', '.join(summary.subreddits)}
+    Sentiment of relevant posts: {_describe_sentiment(summary)}
+    Average engagement of relevant posts: {summary.average_engagement:.1f}/10
+    Relevance of all collected posts: {describe_estimate(estimate)}
     """
 
+def _describe_sentiment(summary: AnalysisSummary) -> str:
+    """Describe the sentiment histogram and its engagement-weighted score."""
+    if not summary.sentiment:
+        return "n/a"
+    counts = ', '.join(f"{label} {count}" for label, count in sorted(summary.sentiment.items(), key=lambda item: -item[1]))
+    return f"{counts} (engagement-weighted score {summary.sentiment_score:+.2f}, -1 negative to +1 positive)"
+
+def describe_estimate(estimate: Optional[Dict[str, Any]]) -> str:
+    """Describe an extrapolated relevance rate, e.g. "an estimated 41% of 1,240 posts are relevant (95% CI 30-52%, ...)"."""
+    if not estimate or estimate.get("relevance_rate") is None:
+        return "no estimate (posts were not sampled)"
+    text = (f"an estimated {estimate['relevance_rate']:.0%} of {estimate['posts']:,} posts are relevant "
+            f"(95% CI {estimate['low']:.0%}-{estimate['high']:.0%}, from {estimate['analyzed']} analyzed posts")
+    if estimate["coverage"] < 1:
+        text += f"; strata holding {1 - estimate['coverage']:.0%} of the posts were not analyzed"
+    return text + ")"
+
+def _insight_with_estimate(platform: str, text: str, estimates: Optional[Dict[str, Dict[str, Any]]]) -> str:
+    """Append a platform's extrapolated relevance rate to its insight text."""
+    estimate = (estimates or {}).get(platform)
+    if not estimate or estimate.get("relevance_rate") is None:
+        return text
+    text = text.rstrip()
+    if text and text[-1] not in ".!?":
+        text += "."
+    return f"{text} Relevance: {describe_estimate(estimate)}."
+
+def _with_estimates(analysis: CombinedAnalysis, estimates: Optional[Dict[str, Dict[str, Any]]]) -> CombinedAnalysis:
+    """Append each platform's extrapolated relevance rate to its platform insight."""
+    for insight in analysis.platform_insights:
+        insight.insights = _insight_with_estimate(insight.platform, insight.insights, estimates)
+    return analysis
+
+def _emitting_estimates(
+    on_field: Callable[[str, Any], None],
+    estimates: Optional[Dict[str, Dict[str, Any]]]
+) -> Callable[[str, Any], None]:
+    """Wrap a streaming callback so platform insights are emitted as the final report will hold them."""
+    def emit(name: str, value: Any):
+        if name == "platform_insights":
+            value = [dict(insight, insights=_insight_with_estimate(insight["platform"], insight["insights"], estimates))
+                     for insight in value]
+        on_field(name, value)
+    
+    return emit
+
 def create_fallback_analysis(
-    hn_analyses: List[HNPostAnalysis],
-    reddit_analyses: List[RedditPostAnalysis],
+    hn_analyses: Union[Iterable[HNPostAnalysis], AnalysisSummary],
+    reddit_analyses: Union[Iterable[RedditPostAnalysis], AnalysisSummary],
     business_idea: str,
-    keywords: List[str] = None
+    keywords: List[str] = None,
+    estimates: Optional[Dict[str, Dict[str, Any]]] = None
 ) -> CombinedAnalysis:
     """Create a basic fallback analysis when LLM is not available."""
     
-    if hn_analyses is None:
-        hn_analyses = []
-    if reddit_analyses is None:
-        reddit_analyses = []
+    hn = AnalysisSummary.of(hn_analyses, "HackerNews")
+    reddit = AnalysisSummary.of(reddit_analyses, "Reddit")
     
     # Basic aggregation
-    total_relevant = sum(1 for a in hn_analyses if a.relevant) + sum(1 for a in reddit_analyses if a.relevant)
-    total_posts = len(hn_analyses) + len(reddit_analyses)
-    
-    # Simple validation score based on relevance ratio
-    overall_score = min(100, max(0, int((total_relevant / max(total_posts, 1)) * 100)))
+    total_relevant = hn.relevant + reddit.relevant
+    total_posts = hn.analyzed + reddit.analyzed
     
-    # Aggregate pain points and solutions
-    all_pain_points = []
-    all_solutions = []
-    all_signals = []
+    # Simple validation score based on relevance ratio (extrapolated to all collected posts when sampled)
+    overall = (estimates or {}).get("overall") or {}
+    if overall.get("relevance_rate") is not None:
+        overall_score = min(100, max(0, int(overall["relevance_rate"] * 100)))
+    else:
+        overall_score = min(100, max(0, int((total_relevant / max(total_posts, 1)) * 100)))
     
-    for analysis in hn_analyses + reddit_analyses:
-        if hasattr(analysis, 'relevant') and analysis.relevant:
-            all_pain_points.extend(analysis.pain_points)
-            all_solutions.extend(analysis.solutions_mentioned)
-            if hasattr(analysis, 'market_signals'):
-                all_signals.extend(analysis.market_signals)
+    # Aggregate pain points and solutions (each platform's most common first)
+    all_pain_points = hn.pain_points + reddit.pain_points
+    all_solutions = hn.solutions + reddit.solutions
     
     # Create platform insights
     platform_insights = [
         PlatformInsight(
             platform="HackerNews",
-            insights=f"Analyzed {len(hn_analyses)} posts, {sum(1 for a in hn_analyses if a.relevant)} relevant"
+            insights=f"Analyzed {hn.analyzed} posts, {hn.relevant} relevant"
         ),
         PlatformInsight(
             platform="Reddit", 
-            insights=f"Analyzed {len(reddit_analyses)} posts, {sum(1 for a in reddit_analyses if a.relevant)} relevant"
+            insights=f"Analyzed {reddit.analyzed} posts, {reddit.relevant} relevant"
         )
     ]
     
-    return CombinedAnalysis(
+    return _with_estimates(CombinedAnalysis(
         overall_score=overall_score,
         market_validation_summary=f"Basic analysis of {total_posts} posts found {total_relevant} relevant discussions. Limited analysis due to API constraints.",
-        key_pain_points=list(set(all_pain_points[:5])) if all_pain_points else ["Limited data available"],
-        existing_solutions=list(set(all_solutions[:5])) if all_solutions else ["Limited data available"],
+        key_pain_points=list(dict.fromkeys(all_pain_points[:5])) if all_pain_points else ["Limited data available"],
+        existing_solutions=list(dict.fromkeys(all_solutions[:5])) if all_solutions else ["Limited data available"],
         market_opportunities=["Requires detailed analysis with full API access"],
         platform_insights=platform_insights,
         recommendations=["Obtain full API access for comprehensive analysis", "Gather more data from additional sources"]
-    )
+    ), estimates)
 
 def create_minimal_analysis(business_idea: str, data_dir: str = None) -> CombinedAnalysis:
     """Create minimal analysis when no data is available."""
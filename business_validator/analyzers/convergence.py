@@ -0,0 +1,164 @@
+"""
+Early stopping for the post analysis stages (steps 5-6).
+
+Analyzing more posts often stops changing the conclusion well before the
+sample is used up. A ConvergenceMonitor follows a platform's analyses as they
+complete and tells the stage to stop once the evidence has converged:
+
+- at least EARLY_STOP_MIN_RELEVANT relevant analyses;
+- the 95% confidence interval of the relevance rate is no wider than
+  +/- EARLY_STOP_RATE_TOLERANCE, and that of each sentiment share no wider
+  than +/- EARLY_STOP_SENTIMENT_TOLERANCE;
+- for EARLY_STOP_STABLE_CHECKS checks in a row, the EARLY_STOP_TOP_PAIN_POINTS
+  most common pain points kept their order (newly recurring ones may join
+  below them) and the relevance rate moved by less than its tolerance.
+
+The intervals are those of the platform's whole sample, not of all posts
+online: they are narrowed by the finite-population correction for the posts
+the stage would analyze, so they shrink to zero as the sample is used up and
+read as "the rest of the sample could not move the rate or a share by more
+than the tolerance". This keeps the defaults reachable at the default
+ANALYSIS_BUDGET (about 40 posts per platform). Only pain points counted at
+least EARLY_STOP_MIN_PAIN_POINT_COUNT times are ranked, and a check without
+a ranking is never stable: one-off phrases tie at one mention and keep their
+first-seen order, so their ranking would never change.
+
+Posts are analyzed in the order the stratified sample was drawn (strata
+interleaved, each in random order), so the posts left out by a stop are a
+random part of every stratum, and the relevance estimates of utils/sampling.py
+rest on the posts each stratum actually had analyzed.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+from business_validator.analyzers.summary import AnalysisSummary
+from business_validator.utils.context import current_config
+
+Z_95 = 1.96
+
+def wilson_margin(successes: int, n: int, z: float = Z_95) -> float:
+    """Half-width of the Wilson score interval of a proportion (1.0 without data)."""
+    if n <= 0:
+        return 1.0
+    p = successes / n
+    return z / (1 + z * z / n) * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+
+class ConvergenceMonitor:
+    """Follows one platform's analyses and decides when they have converged."""
+
+    def __init__(self, platform: str, total: int, config: Optional[Any] = None):
+        """
+        Args:
+            platform: "HackerNews" or "Reddit"
+            total: Posts the stage would analyze without stopping
+            config: Config to read the EARLY_STOP_* settings from (default: the current run's)
+        """
+        config = config or current_config()
+        self.platform = platform
+        self.total = total
+        self.min_relevant = config.EARLY_STOP_MIN_RELEVANT
+        self.check_every = max(1, config.EARLY_STOP_CHECK_EVERY)
+        self.stable_checks = max(1, config.EARLY_STOP_STABLE_CHECKS)
+        self.top_pain_points = max(1, config.EARLY_STOP_TOP_PAIN_POINTS)
+        self.min_pain_point_count = max(2, config.EARLY_STOP_MIN_PAIN_POINT_COUNT)
+        self.rate_tolerance = config.EARLY_STOP_RATE_TOLERANCE
+        self.sentiment_tolerance = config.EARLY_STOP_SENTIMENT_TOLERANCE
+        # Only the stage's own analyses (not those of triage-rejected posts)
+        self.summary = AnalysisSummary(platform)
+        self.posts_done = 0
+        self.checks = 0
+        self.stable = 0
+        self.converged = False
+        self._unchecked = 0
+        self._ranking: Optional[List[str]] = None
+        self._rate: Optional[float] = None
+
+    def update(self, posts_done: int, analyses: List[Dict[str, Any]]) -> bool:
+        """Fold in the analyses of newly finished posts.
+
+        Args:
+            posts_done: Posts the stage has finished so far
+            analyses: The analyses those posts produced
+
+        Returns:
+            True once the analyses have converged and the stage can stop
+        """
+        self.posts_done = posts_done
+        for analysis in analyses:
+            self.summary.add(analysis)
+        self._unchecked += len(analyses)
+        if not self.converged and self._unchecked >= self.check_every:
+            self._unchecked = 0
+            self.converged = self._check()
+        return self.converged
+
+    @property
+    def relevance_rate(self) -> float:
+        """Share of the analyses that were relevant."""
+        return self.summary.relevant / self.summary.analyzed if self.summary.analyzed else 0.0
+
+    @property
+    def _unseen_share(self) -> float:
+        """Finite-population correction: how much of the sample's uncertainty is left."""
+        if self.total <= 1:
+            return 1.0
+        return math.sqrt(max(0, self.total - self.summary.analyzed) / (self.total - 1))
+
+    @property
+    def relevance_margin(self) -> float:
+        """Confidence interval half-width of the sample's relevance rate."""
+        return wilson_margin(self.summary.relevant, self.summary.analyzed) * self._unseen_share
+
+    @property
+    def sentiment_margin(self) -> float:
+        """Widest confidence interval half-width among the sentiment shares of relevant posts."""
+        if not self.summary.relevant:
+            return 1.0
+        margin = max(wilson_margin(count, self.summary.relevant) for count in self.summary.sentiment.values())
+        return margin * self._unseen_share
+
+    def _ranking_now(self) -> List[str]:
+        """The top pain points among those mentioned at least min_pain_point_count times."""
+        return [
+            phrase.lower() for phrase, count in self.summary.pain_point_counts.top(self.top_pain_points)
+            if count >= self.min_pain_point_count
+        ]
+
+    def _check(self) -> bool:
+        self.checks += 1
+        ranking = self._ranking_now()
+        rate = self.relevance_rate
+        # Pain points already ranked kept their order; recurring ones may only join below them
+        kept_order = bool(self._ranking) and ranking[:len(self._ranking)] == self._ranking
+        if kept_order and abs(rate - self._rate) < self.rate_tolerance:
+            self.stable += 1
+        else:
+            self.stable = 0
+        self._ranking, self._rate = ranking, rate
+        return (
+            self.summary.relevant >= self.min_relevant
+            and self.relevance_margin <= self.rate_tolerance
+            and self.sentiment_margin <= self.sentiment_tolerance
+            and self.stable >= self.stable_checks
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Return where the stage stopped (or that it did not) and what it saved."""
+        return {
+            "platform": self.platform,
+            "stopped_early": self.converged,
+            "posts": self.total,
+            "posts_analyzed": self.posts_done,
+            "analyses_saved": max(0, self.total - self.posts_done) if self.converged else 0,
+            "relevant": self.summary.relevant,
+            "relevance_rate": round(self.relevance_rate, 3),
+            "relevance_margin": round(self.relevance_margin, 3),
+            "sentiment_margin": round(self.sentiment_margin, 3),
+            "top_pain_points": [
+                (phrase, count) for phrase, count in self.summary.pain_point_counts.top(self.top_pain_points)
+                if count >= self.min_pain_point_count
+            ],
+            "checks": self.checks,
+            "stable_checks": self.stable
+        }
@@ -0,0 +1,481 @@
+"""
+Shared Gemini client helpers used by the analyzers.
+"""
+
+import re
+import json
+import time
+import logging
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.fields import ModelField, SHAPE_SINGLETON
+
+from business_validator.config import (
+    ANALYSIS_MODEL,
+    GOOGLE_API_KEYS,
+    GOOGLE_KEY_CONCURRENCY,
+    GOOGLE_KEY_RPM,
+    KEY_QUOTA_COOLDOWN_SECONDS,
+    ANALYSIS_CACHE_SIZE,
+    ANALYSIS_CACHE_TTL_SECONDS
+)
+from business_validator.utils.cache import BoundedCache
+from business_validator.utils.key_pool import KeyPool
+from business_validator.utils.context import current_config
+from business_validator.utils.metrics import metrics
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+_models = {}
+_clients = {}
+_models_lock = threading.Lock()
+
+# google-generativeai releases whose GenerativeModel reads its client from
+# the _client attribute (see _bind_model)
+_PER_KEY_CLIENT_VERSIONS = ("0.8.",)
+_unpinned_warning = threading.Event()
+
+# Structured responses keyed by model and full prompt, shared by concurrent runs
+_structured_cache = BoundedCache(ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_TTL_SECONDS)
+
+google_pool = KeyPool(
+    "gemini",
+    [key for key in GOOGLE_API_KEYS if key != "your_google_api_key_here"],
+    concurrency=GOOGLE_KEY_CONCURRENCY,
+    rpm=GOOGLE_KEY_RPM,
+    cooldown_seconds=KEY_QUOTA_COOLDOWN_SECONDS
+)
+
+def get_google_api_key() -> Optional[str]:
+    """Return the first configured Google API key, or None if none is usable."""
+    return google_pool.keys[0] if google_pool.keys else None
+
+def _client_for_key(api_key: str):
+    """Return a Gemini generative service client bound to one API key."""
+    from google.ai import generativelanguage as glm
+
+    with _models_lock:
+        if api_key not in _clients:
+            _clients[api_key] = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+        return _clients[api_key]
+
+def _bind_model(model, api_key: str):
+    """Make a GenerativeModel send its requests with the given key.
+
+    genai.configure() is process-global and GenerativeModel takes no client,
+    so pooled keys (and concurrent runs) can only be used side by side by
+    setting the model's client. That is done only on google-generativeai
+    versions it was checked against; on others every call uses the
+    process-wide configuration with the first key.
+    """
+    import google.generativeai as genai
+
+    if genai.__version__.startswith(_PER_KEY_CLIENT_VERSIONS) and getattr(model, "_client", None) is None:
+        model._client = _client_for_key(api_key)
+        return model
+    if not _unpinned_warning.is_set():
+        _unpinned_warning.set()
+        logging.warning(f"google-generativeai {genai.__version__} is not known to support per-key clients; "
+                        f"all Gemini calls use the first configured key")
+        genai.configure(api_key=get_google_api_key())
+    return model
+
+def get_model(model_name: str = ANALYSIS_MODEL, api_key: Optional[str] = None):
+    """Return a cached Gemini model instance for the given model name and key."""
+    import google.generativeai as genai
+
+    api_key = api_key or get_google_api_key()
+    with _models_lock:
+        cached = _models.get((model_name, api_key))
+    if cached is None:
+        cached = _bind_model(genai.GenerativeModel(model_name), api_key)
+        with _models_lock:
+            cached = _models.setdefault((model_name, api_key), cached)
+    return cached
+
+def _record_usage(response, tier: str):
+    """Record the prompt tokens a response was billed for, and how many the provider served from its cache."""
+    try:
+        usage = response.usage_metadata
+        prompt_tokens = usage.prompt_token_count
+        cached_tokens = usage.cached_content_token_count
+    except Exception:
+        return
+    metrics.increment(f"llm.{tier}.prompt_tokens", prompt_tokens)
+    metrics.increment(f"llm.{tier}.cached_tokens", cached_tokens)
+
+def _is_quota_error(error: Exception) -> bool:
+    """True for Gemini rate-limit / quota errors (HTTP 429, RESOURCE_EXHAUSTED)."""
+    try:
+        from google.api_core import exceptions as api_exceptions
+        if isinstance(error, (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests)):
+            return True
+    except ImportError:
+        pass
+    message = str(error).lower()
+    return "429" in message or "quota" in message or "resource_exhausted" in message
+
+@contextmanager
+def _pooled_call(
+    prompt: str,
+    model_name: str,
+    tier: str,
+    **kwargs
+) -> Iterator[Any]:
+    """Call Gemini with the least-loaded pooled key, holding the key until the with-block exits.
+
+    A streamed response is read inside the block, so the key's concurrency
+    slot stays taken until the stream is drained. A key that returns a quota
+    error is ejected from the pool and the call is retried with another key.
+
+    Yields:
+        The Gemini response object
+    """
+    attempts = max(1, len(google_pool))
+    for attempt in range(attempts):
+        with google_pool.acquire() as api_key:
+            model = get_model(model_name, api_key)
+            metrics.increment(f"llm.{tier}.calls")
+            start = time.perf_counter()
+            try:
+                response = model.generate_content(prompt, **kwargs)
+            except Exception as e:
+                if not _is_quota_error(e):
+                    raise
+                metrics.increment(f"llm.{tier}.quota_errors")
+                google_pool.report_quota_error(api_key)
+                if attempt == attempts - 1:
+                    raise
+                logging.warning(f"Gemini quota error, retrying with another key: {e}")
+                continue
+            finally:
+                metrics.record_value(f"llm.{tier}.latency", time.perf_counter() - start)
+            yield response
+            return
+
+def generate(
+    prompt: str,
+    model_name: str = ANALYSIS_MODEL,
+    tier: str = "analysis",
+    **kwargs
+):
+    """Call Gemini with the least-loaded pooled key and record call count, latency and tokens.
+
+    A key that returns a quota error is ejected from the pool and the call is
+    retried with another key.
+
+    Args:
+        prompt: The prompt to send
+        model_name: The Gemini model to use
+        tier: Metrics label for the call (e.g. "triage", "analysis")
+        **kwargs: Extra arguments passed to generate_content (streaming goes through _stream_response)
+
+    Returns:
+        The Gemini response object
+    """
+    with _pooled_call(prompt, model_name, tier, **kwargs) as response:
+        _record_usage(response, tier)
+        return response
+
+def extract_json_text(text: str) -> str:
+    """Strip a surrounding markdown code fence from a JSON response, if present."""
+    text = text.strip()
+    match = _FENCE_RE.match(text)
+    return match.group(1) if match else text
+
+def response_schema(model_cls: Type[BaseModel], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Convert a pydantic model into the OpenAPI subset Gemini accepts as a response schema.
+
+    Args:
+        model_cls: The pydantic model describing the expected response
+        fields: Optional subset of top-level fields to include
+
+    Returns:
+        Schema dictionary for generation_config["response_schema"]
+    """
+    schema = model_cls.schema()
+    definitions = schema.get("definitions", {})
+
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            node = definitions[node["$ref"].split("/")[-1]]
+        converted = {"type": node.get("type", "string").upper()}
+        if "enum" in node:
+            converted["enum"] = node["enum"]
+        if "items" in node:
+            converted["items"] = convert(node["items"])
+        if "properties" in node:
+            converted["properties"] = {name: convert(prop) for name, prop in node["properties"].items()}
+            if node.get("required"):
+                converted["required"] = list(node["required"])
+        return converted
+
+    converted = convert(schema)
+    if fields is not None:
+        converted["properties"] = {name: converted["properties"][name] for name in fields}
+        converted["required"] = list(fields)
+    return converted
+
+def _validate_fields(data: Any, model_cls: Type[BaseModel], field_names: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Validate each field independently so one bad value does not discard the rest."""
+    valid = {}
+    invalid = []
+    if not isinstance(data, dict):
+        return valid, list(field_names)
+    for name in field_names:
+        field = model_cls.__fields__[name]
+        if name not in data:
+            invalid.append(name)
+            continue
+        value, errors = field.validate(data[name], {}, loc=name)
+        if errors:
+            invalid.append(name)
+        else:
+            valid[name] = value
+    return valid, invalid
+
+def _default_for(field: ModelField) -> Any:
+    """Neutral value used for a field that stayed malformed after repair."""
+    if field.shape != SHAPE_SINGLETON:
+        return []
+    if field.type_ is bool:
+        return False
+    if field.type_ is int:
+        return 0
+    return ""
+
+class IncrementalJSONParser:
+    """Parse a streamed JSON object, reporting each top-level field once its value closes.
+
+    Text is fed in arbitrary chunks; only the newly added characters are scanned,
+    tracking string/escape state and nesting depth. Anything before the opening
+    brace (such as a code fence) is skipped.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "start"
+        self._key_start = 0
+        self._value_start = 0
+        self._key = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk of text and return the (field, value) pairs it completed."""
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        self._key = json.loads(text[self._key_start:i + 1])
+                        self._state = "colon"
+                continue
+
+            if self._state == "start":
+                if char == "{":
+                    self._depth = 1
+                    self._state = "key"
+                continue
+            if self._state == "done":
+                break
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._key_start = i
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_value(text, i, completed)
+                    self._state = "done"
+            elif char == ":" and self._depth == 1 and self._state == "colon":
+                self._state = "value"
+                self._value_start = i + 1
+            elif char == "," and self._depth == 1:
+                self._complete_value(text, i, completed)
+                self._state = "key"
+        self._pos = len(text)
+        return completed
+
+    def _complete_value(self, text: str, end: int, completed: List[Tuple[str, Any]]):
+        """Decode the value that ends at position end, if a key is pending."""
+        if self._state != "value" or self._key is None:
+            return
+        try:
+            completed.append((self._key, json.loads(text[self._value_start:end])))
+        except ValueError:
+            pass
+        self._key = None
+
+def _jsonable(value: Any) -> Any:
+    """Convert validated field values (possibly pydantic models) to plain data."""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+def _stream_response(
+    request: str,
+    model_cls: Type[BaseModel],
+    wanted: List[str],
+    on_field: Callable[[str, Any], None],
+    model_name: str,
+    tier: str,
+    **kwargs
+) -> str:
+    """Stream a Gemini response, emitting each valid field as soon as it closes."""
+    parser = IncrementalJSONParser()
+    start = time.perf_counter()
+    emitted_first = False
+    # The pooled key stays reserved until the whole stream has been read
+    with _pooled_call(request, model_name, tier, stream=True, **kwargs) as response:
+        for chunk in response:
+            for name, value in parser.feed(chunk.text):
+                if name not in wanted:
+                    continue
+                valid, invalid = _validate_fields({name: value}, model_cls, [name])
+                if invalid:
+                    continue
+                if not emitted_first:
+                    emitted_first = True
+                    metrics.record_value(f"llm.{tier}.time_to_first_field", time.perf_counter() - start)
+                try:
+                    on_field(name, _jsonable(valid[name]))
+                except Exception as e:
+                    logging.warning(f"Streaming callback failed for field '{name}': {e}")
+        metrics.record_value(f"llm.{tier}.stream_duration", time.perf_counter() - start)
+        _record_usage(response, tier)
+    return parser.text
+
+def generate_structured(
+    prompt: str,
+    model_cls: Type[BaseModel],
+    model_name: str = ANALYSIS_MODEL,
+    tier: str = "analysis",
+    defaults: Optional[Dict[str, Any]] = None,
+    allow_partial: bool = True,
+    on_field: Optional[Callable[[str, Any], None]] = None,
+    reuse: bool = False
+) -> BaseModel:
+    """Call Gemini for a JSON response matching a pydantic model.
+
+    With STRUCTURED_OUTPUT enabled the model is constrained with a JSON MIME
+    type and response schema. Fields that still come back missing or malformed
+    are re-requested on their own (up to STRUCTURED_OUTPUT_MAX_REPAIRS times)
+    instead of throwing the whole paid-for response away; anything left after
+    that gets a neutral default. Parse-failure and repair rates are recorded in
+    the run metrics. Passing on_field switches to a streaming call so callers
+    can surface fields before the whole response has arrived.
+
+    Args:
+        prompt: The prompt to send
+        model_cls: The pydantic model describing the expected response
+        model_name: The Gemini model to use
+        tier: Metrics label for the call
+        defaults: Values for fields that could not be repaired
+        allow_partial: If False, raise instead of defaulting unrepaired fields
+        on_field: Optional callback; when given the response is streamed and
+            called with (field name, value) as soon as each field is complete
+        reuse: Reuse a complete earlier response to the exact same prompt and
+            model (shared by concurrent runs, e.g. duplicate ideas in a batch)
+
+    Returns:
+        An instance of model_cls
+
+    Raises:
+        ValueError: If fields remain malformed and allow_partial is False
+    """
+    args = (prompt, model_cls, model_name, tier, defaults, allow_partial, on_field)
+    if not reuse or on_field is not None:
+        return _generate_structured(*args)[0]
+
+    key = hashlib.sha256(json.dumps([model_name, model_cls.__name__, prompt]).encode("utf-8")).hexdigest()
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return _generate_structured(*args)
+
+    result, _ = _structured_cache.get_or_compute(key, compute, should_cache=lambda value: not value[1])
+    if not computed:
+        metrics.increment(f"llm.{tier}.reused")
+    return result.copy()
+
+def _generate_structured(
+    prompt: str,
+    model_cls: Type[BaseModel],
+    model_name: str,
+    tier: str,
+    defaults: Optional[Dict[str, Any]],
+    allow_partial: bool,
+    on_field: Optional[Callable[[str, Any], None]]
+) -> Tuple[BaseModel, List[str]]:
+    """Run generate_structured's call-and-repair loop; returns (instance, unrepaired fields)."""
+    field_names = list(model_cls.__fields__)
+    data: Dict[str, Any] = {}
+    missing = field_names
+    request = prompt
+
+    config = current_config()
+    for attempt in range(config.STRUCTURED_OUTPUT_MAX_REPAIRS + 1):
+        kwargs = {}
+        if config.STRUCTURED_OUTPUT:
+            kwargs["generation_config"] = {
+                "response_mime_type": "application/json",
+                "response_schema": response_schema(model_cls, None if attempt == 0 else missing)
+            }
+        if attempt > 0:
+            metrics.increment(f"llm.{tier}.repair_calls")
+        if on_field is not None:
+            text = _stream_response(
+                request, model_cls, missing, on_field, model_name, tier, **kwargs
+            )
+        else:
+            text = generate(request, model_name=model_name, tier=tier, **kwargs).text
+
+        try:
+            parsed = json.loads(extract_json_text(text))
+        except (json.JSONDecodeError, ValueError) as e:
+            logging.warning(f"JSON parsing failed: {e}")
+            parsed = None
+        valid, missing = _validate_fields(parsed, model_cls, missing)
+        data.update(valid)
+
+        if attempt == 0:
+            metrics.record_value(f"llm.{tier}.parse_failure", 1 if missing else 0)
+        if missing:
+            logging.warning(f"Malformed fields in {model_cls.__name__} response: {missing}")
+        if not missing or attempt == config.STRUCTURED_OUTPUT_MAX_REPAIRS:
+            break
+
+        expected = json.dumps(response_schema(model_cls, missing)["properties"])
+        request = f"""{prompt}
+
+Your previous answer was missing or had malformed values for these fields: {', '.join(missing)}.
+Return only a JSON object with exactly these fields, matching this schema:
+{expected}"""
+
+    metrics.record_value(f"llm.{tier}.unrepaired", 1 if missing else 0)
+    if missing and not allow_partial:
+        raise ValueError(f"Unrepaired fields in {model_cls.__name__} response: {missing}")
+    for name in missing:
+        data[name] = (defaults or {}).get(name, _default_for(model_cls.__fields__[name]))
+    return model_cls(**data), missing
@@ -0,0 +1,225 @@
+"""
+Token-budgeted prompt construction for the per-post analyzers.
+
+Post content is cleaned (URLs, markdown and duplicated quote text removed) and
+comments are packed by upvotes until the configured per-post token budget is
+used up, instead of taking fixed character slices.
+"""
+
+import re
+import logging
+from typing import List, Optional, Set
+from urllib.parse import urlparse
+
+from business_validator.utils.context import current_config
+from business_validator.utils.metrics import metrics
+
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+")
+_HEADER_RE = re.compile(r"^\s{0,3}#{1,6}\s*", re.MULTILINE)
+_EMPHASIS_RE = re.compile(r"(\*{1,3}|~~|`{1,3})(?=\S)(.+?)(?<=\S)\1")
+# Underscores only mark emphasis at word boundaries, so snake_case names survive
+_UNDERSCORE_EMPHASIS_RE = re.compile(r"(?<!\w)(_{1,3})(?=\S)(.+?)(?<=\S)\1(?!\w)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Comments the scrapers emit when a page could not be parsed carry no evidence
+_PLACEHOLDER_PREFIX = "Unable to parse comments"
+
+_encoding = None
+_encoding_loaded = False
+
+def _get_encoding():
+    """Load a tiktoken encoding once; fall back to a length heuristic if unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logging.info(f"tiktoken unavailable, estimating tokens from length: {e}")
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    """Count (or estimate) the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, len(text) // 4)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim text to at most max_tokens tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens]).rstrip() + "..."
+    max_chars = max_tokens * 4
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "..."
+
+def _normalize(text: str) -> str:
+    """Lower-cased, whitespace-collapsed form used to spot duplicated text."""
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+def clean_text(text: str, seen: Optional[Set[str]] = None) -> str:
+    """Strip URLs, markdown and duplicated quote text from scraped content.
+
+    Args:
+        text: Raw post or comment text
+        seen: Normalized sentences already included in the prompt; quoted
+            lines repeating any of them are dropped
+
+    Returns:
+        Cleaned single-line text
+    """
+    if not text:
+        return ""
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(">"):
+            quoted = _normalize(stripped.lstrip("> "))
+            if not quoted or (seen is not None and any(quoted in s for s in seen)):
+                continue
+            stripped = stripped.lstrip("> ")
+        lines.append(stripped)
+    text = "\n".join(lines)
+    text = _IMAGE_RE.sub("", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _URL_RE.sub("", text)
+    text = _HEADER_RE.sub("", text)
+    text = _EMPHASIS_RE.sub(r"\2", text)
+    text = _UNDERSCORE_EMPHASIS_RE.sub(r"\2", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+def pack_comments(comments: List[dict], budget: int, seen: Set[str]) -> List[str]:
+    """Pack the highest-voted distinct comments that fit in a token budget.
+
+    Args:
+        comments: Comment dictionaries with 'text' (or 'body') and 'upvotes'
+        budget: Maximum tokens for all comments together
+        seen: Normalized text already in the prompt (updated in place)
+
+    Returns:
+        List of cleaned comment strings
+    """
+    packed = []
+    remaining = budget
+    ranked = sorted(comments or [], key=lambda c: c.get('upvotes', 0) or 0, reverse=True)
+    for comment in ranked:
+        raw = comment.get('text') or comment.get('body') or ""
+        if raw.startswith(_PLACEHOLDER_PREFIX):
+            continue
+        text = clean_text(raw, seen)
+        normalized = _normalize(text)
+        if len(normalized) < 5 or normalized in seen:
+            continue
+        # "- " prefix and newline
+        cost = count_tokens(text) + 2
+        if cost > remaining:
+            # Use what is left for a truncated final comment if it is worth it
+            if remaining >= 24:
+                packed.append(truncate_to_tokens(text, remaining - 2))
+            break
+        packed.append(text)
+        seen.add(normalized)
+        remaining -= cost
+    return packed
+
+def _domain(url: str) -> str:
+    """Return the host of a URL without the www. prefix."""
+    host = urlparse(url or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+_ANALYSIS_INSTRUCTIONS = """Assess each {platform} post you are given for business validation signals and return JSON with:
+relevant (bool: does it help validate the idea?), pain_points, solutions_mentioned,
+market_signals (demand, competition, trends) as string lists, sentiment
+(positive/negative/neutral) and engagement_score (0-10 from {engagement})."""
+
+def build_hn_prompt_prefix(business_idea: str) -> str:
+    """Build the part of the HN analysis prompt shared by every post in a run."""
+    return "\n".join([
+        f'Business Idea: "{business_idea}"',
+        "",
+        _ANALYSIS_INSTRUCTIONS.format(platform="HackerNews", engagement="points and comments")
+    ])
+
+def build_reddit_prompt_prefix(business_idea: str) -> str:
+    """Build the part of the Reddit analysis prompt shared by every post in a run."""
+    return "\n".join([
+        f'Business Idea: "{business_idea}"',
+        "",
+        _ANALYSIS_INSTRUCTIONS.format(platform="Reddit", engagement="upvotes and comments"),
+        "Also return subreddit_context: what the subreddit tells us about the target audience."
+    ])
+
+def build_hn_post_prompt(post: dict) -> str:
+    """Build the post-specific part of the HN analysis prompt within the token budget."""
+    seen: Set[str] = set()
+    title = clean_text(post.get('title', ''))
+    seen.add(_normalize(title))
+    lines = [
+        "HackerNews Post:",
+        f"Title: {title}",
+        f"Points: {post.get('points', 0)} | Comments: {post.get('comments', 0)}"
+    ]
+    domain = _domain(post.get('url', ''))
+    if domain:
+        lines.append(f"Link: {domain}")
+
+    config = current_config()
+    budget = config.PROMPT_TOKEN_BUDGET_PER_POST
+    article = clean_text(post.get('article_summary', ''))
+    if article:
+        article = truncate_to_tokens(article, min(config.ARTICLE_TOKEN_BUDGET, budget))
+        seen.add(_normalize(article))
+        budget -= count_tokens(article)
+        lines.append(f"Linked Page: {article}")
+
+    comment_lines = pack_comments(post.get('comments_data', []), budget, seen)
+    if comment_lines:
+        lines += ["", "Top Comments:"] + [f"- {c}" for c in comment_lines]
+    return "\n".join(lines)
+
+def build_reddit_post_prompt(post: dict, comments: List[dict]) -> str:
+    """Build the post-specific part of the Reddit analysis prompt within the token budget."""
+    seen: Set[str] = set()
+    title = clean_text(post.get('title', ''))
+    seen.add(_normalize(title))
+    lines = [
+        "Reddit Post:",
+        f"Title: {title}",
+        f"Subreddit: r/{post.get('subreddit') or 'unknown'}",
+        f"Upvotes: {post.get('upvotes', post.get('score', 0))} | "
+        f"Comments: {post.get('comments', post.get('num_comments', 0))}"
+    ]
+
+    config = current_config()
+    budget = config.PROMPT_TOKEN_BUDGET_PER_POST
+    selftext = clean_text(post.get('selftext', ''))
+    if selftext:
+        selftext = truncate_to_tokens(selftext, min(config.SELFTEXT_TOKEN_BUDGET, budget))
+        seen.add(_normalize(selftext))
+        budget -= count_tokens(selftext)
+        lines.append(f"Content: {selftext}")
+
+    comment_lines = pack_comments(comments, budget, seen)
+    if comment_lines:
+        lines += ["", "Top Comments:"] + [f"- {c}" for c in comment_lines]
+    return "\n".join(lines)
+
+def build_hn_prompt(post: dict, business_idea: str) -> str:
+    """Build the analysis prompt for a HackerNews post, with the part shared by the run first."""
+    prompt = f"{build_hn_prompt_prefix(business_idea)}\n\n{build_hn_post_prompt(post)}"
+    metrics.record_value("prompt.hn.tokens", count_tokens(prompt))
+    return prompt
+
+def build_reddit_prompt(post: dict, comments: List[dict], business_idea: str) -> str:
+    """Build the analysis prompt for a Reddit post, with the part shared by the run first."""
+    prompt = f"{build_reddit_prompt_prefix(business_idea)}\n\n{build_reddit_post_prompt(post, comments)}"
+    metrics.record_value("prompt.reddit.tokens", count_tokens(prompt))
+    return prompt
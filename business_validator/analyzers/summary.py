@@ -0,0 +1,230 @@
+"""
+Running aggregates of post analyses for the final report.
+
+The final report only needs counts, a sentiment breakdown and the most
+common findings per platform, so analyses are folded into an
+AnalysisSummary one at a time, as each one completes, instead of being kept
+in a list and walked again at the end. Every update costs O(1) per phrase,
+and the summary can be read at any time during a run (run.summaries), e.g.
+by a live dashboard.
+
+    summary = AnalysisSummary("Reddit")
+    summary.add(analysis)
+    summary.pain_points          # the most common pain points so far
+    summary.snapshot()           # counts, sentiment, engagement, top phrases
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from business_validator.config import SUMMARY_PHRASE_SLOTS
+from business_validator.models import HNPostAnalysis, RedditPostAnalysis
+
+# Sentiment label -> polarity for the engagement-weighted sentiment score
+SENTIMENT_POLARITY = {"positive": 1, "neutral": 0, "negative": -1}
+
+class PhraseCounter:
+    """Counts of the most frequent phrases in a stream (Space-Saving).
+
+    At most `slots` phrases are counted. When a new phrase arrives and all
+    slots are taken, it replaces one of the least counted phrases and
+    inherits its count, so counts are upper bounds: a phrase's true count is
+    at least its count minus its error. Any phrase seen more than
+    total / slots times is guaranteed to be counted. Phrases are compared
+    case- and whitespace-insensitively and reported with their first spelling.
+    """
+
+    def __init__(self, slots: int = SUMMARY_PHRASE_SLOTS):
+        """
+        Args:
+            slots: Distinct phrases counted at once
+        """
+        self.slots = max(1, slots)
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._labels: Dict[str, str] = {}
+        # count -> phrases with that count (dicts as insertion-ordered sets)
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._min = 0
+
+    def add(self, phrase: Any):
+        """Count one occurrence of a phrase (empty phrases are ignored)."""
+        label = " ".join(str(phrase).split())
+        if not label:
+            return
+        key = label.lower()
+        self.total += 1
+        count = self._counts.get(key)
+        if count is not None:
+            self._move(key, count, count + 1)
+        elif len(self._counts) < self.slots:
+            self._counts[key], self._errors[key], self._labels[key] = 1, 0, label
+            self._buckets.setdefault(1, {})[key] = None
+            self._min = 1
+        else:
+            # Replace the oldest of the least counted phrases
+            floor = self._min
+            evicted = next(iter(self._buckets[floor]))
+            self._move(evicted, floor, floor + 1)
+            del self._counts[evicted], self._errors[evicted], self._labels[evicted]
+            bucket = self._buckets[floor + 1]
+            del bucket[evicted]
+            bucket[key] = None
+            self._counts[key], self._errors[key], self._labels[key] = floor + 1, floor, label
+
+    def _move(self, key: str, count: int, new_count: int):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min == count:
+                self._min = new_count
+        self._buckets.setdefault(new_count, {})[key] = None
+        self._counts[key] = new_count
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return the `n` most counted phrases as (phrase, count), most counted first."""
+        ranked = sorted(self._counts.items(), key=lambda item: -item[1])
+        return [(self._labels[key], count) for key, count in ranked[:n]]
+
+    def error(self, phrase: str) -> int:
+        """Return how much a counted phrase's count may overstate it (0 if exact)."""
+        return self._errors.get(" ".join(str(phrase).split()).lower(), 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+class AnalysisSummary:
+    """Running summary of one platform's post analyses.
+
+    Safe to update from several threads and to read while it is updated.
+    """
+
+    def __init__(self, platform: str, samples: int = 5, subreddit_samples: int = 3, slots: int = SUMMARY_PHRASE_SLOTS):
+        """
+        Args:
+            platform: "HackerNews" or "Reddit"
+            samples: Pain points, solutions and market signals reported (the most common ones)
+            subreddit_samples: Subreddit contexts reported
+            slots: Distinct phrases counted per field (see PhraseCounter)
+        """
+        self.platform = platform
+        self.samples = samples
+        self.subreddit_samples = subreddit_samples
+        self.analyzed = 0
+        self.relevant = 0
+        # Over relevant analyses
+        self.sentiment: Dict[str, int] = {}
+        self.engagement_total = 0
+        self.engagement_squares = 0
+        self.weighted_polarity = 0
+        self.pain_point_counts = PhraseCounter(slots)
+        self.solution_counts = PhraseCounter(slots)
+        self.signal_counts = PhraseCounter(slots)
+        self.subreddit_counts = PhraseCounter(slots)
+        self._lock = threading.Lock()
+
+    def add(self, analysis: Union[HNPostAnalysis, RedditPostAnalysis, dict]) -> "AnalysisSummary":
+        """Fold one analysis (a model or its dict) into the summary."""
+        if hasattr(analysis, "dict"):
+            analysis = analysis.dict()
+        with self._lock:
+            self.analyzed += 1
+            if not analysis.get("relevant"):
+                return self
+            self.relevant += 1
+            sentiment = str(analysis.get("sentiment") or "unknown").strip().lower()
+            self.sentiment[sentiment] = self.sentiment.get(sentiment, 0) + 1
+            try:
+                engagement = max(0, int(analysis.get("engagement_score") or 0))
+            except (TypeError, ValueError):
+                engagement = 0
+            self.engagement_total += engagement
+            self.engagement_squares += engagement * engagement
+            self.weighted_polarity += engagement * SENTIMENT_POLARITY.get(sentiment, 0)
+            for counter, field in (
+                (self.pain_point_counts, "pain_points"),
+                (self.solution_counts, "solutions_mentioned"),
+                (self.signal_counts, "market_signals")
+            ):
+                for phrase in analysis.get(field) or ():
+                    counter.add(phrase)
+            if analysis.get("subreddit_context"):
+                self.subreddit_counts.add(analysis["subreddit_context"])
+        return self
+
+    @property
+    def pain_points(self) -> List[str]:
+        """The most common pain points."""
+        return self._top(self.pain_point_counts, self.samples)
+
+    @property
+    def solutions(self) -> List[str]:
+        """The most commonly mentioned existing solutions."""
+        return self._top(self.solution_counts, self.samples)
+
+    @property
+    def signals(self) -> List[str]:
+        """The most common market signals."""
+        return self._top(self.signal_counts, self.samples)
+
+    @property
+    def subreddits(self) -> List[str]:
+        """The most common subreddit contexts."""
+        return self._top(self.subreddit_counts, self.subreddit_samples)
+
+    def _top(self, counter: PhraseCounter, n: int) -> List[str]:
+        with self._lock:
+            return [phrase for phrase, _ in counter.top(n)]
+
+    @property
+    def average_engagement(self) -> float:
+        """Mean engagement score of relevant posts."""
+        return self.engagement_total / self.relevant if self.relevant else 0.0
+
+    @property
+    def engagement_stdev(self) -> float:
+        """Standard deviation of the engagement scores of relevant posts."""
+        if not self.relevant:
+            return 0.0
+        mean = self.engagement_total / self.relevant
+        return math.sqrt(max(0.0, self.engagement_squares / self.relevant - mean * mean))
+
+    @property
+    def sentiment_score(self) -> float:
+        """Engagement-weighted sentiment of relevant posts, from -1 (negative) to 1 (positive)."""
+        return self.weighted_polarity / self.engagement_total if self.engagement_total else 0.0
+
+    def snapshot(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """Return the summary as a JSON-serializable dict.
+
+        Args:
+            top: Phrases listed per field (default: `samples`), with their counts
+        """
+        top = top or self.samples
+        with self._lock:
+            return {
+                "platform": self.platform,
+                "analyzed": self.analyzed,
+                "relevant": self.relevant,
+                "sentiment": dict(self.sentiment),
+                "sentiment_score": round(self.sentiment_score, 3),
+                "average_engagement": round(self.average_engagement, 2),
+                "engagement_stdev": round(self.engagement_stdev, 2),
+                "pain_points": self.pain_point_counts.top(top),
+                "solutions": self.solution_counts.top(top),
+                "market_signals": self.signal_counts.top(top),
+                "subreddits": self.subreddit_counts.top(top)
+            }
+
+    @classmethod
+    def of(cls, analyses: Union["AnalysisSummary", Iterable[Any], None], platform: str) -> "AnalysisSummary":
+        """Summarize analyses in one pass; a summary is returned as it is."""
+        if isinstance(analyses, cls):
+            return analyses
+        summary = cls(platform)
+        for analysis in analyses or ():
+            summary.add(analysis)
+        return summary
@@ -0,0 +1,130 @@
+"""
+Cheap relevance triage for the two-tier analysis cascade.
+
+A fast model looks at many posts per call and only answers "is this relevant?".
+The full structured extraction then runs only on the posts that survive.
+"""
+
+import logging
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+from business_validator.models import HNPostAnalysis, RedditPostAnalysis, TriageBatch
+from business_validator.analyzers.llm_client import get_google_api_key, generate_structured
+from business_validator.utils.context import current_config
+from business_validator.utils.metrics import metrics
+
+def _describe_post(index: int, post: dict, platform: str) -> str:
+    """Render one post as a single numbered line for the triage prompt."""
+    if platform == "Reddit":
+        context = f"r/{post.get('subreddit', 'unknown')}, {post.get('upvotes', 0)} upvotes"
+        excerpt = post.get('selftext', '')[:150]
+    else:
+        context = f"{post.get('points', 0)} points, {post.get('comments', 0)} comments"
+        excerpt = ""
+    line = f"{index}. {post.get('title', '')} ({context})"
+    return f"{line} - {excerpt}" if excerpt else line
+
+def _triage_batch(posts: List[dict], business_idea: str, platform: str) -> List[Tuple[bool, float]]:
+    """Ask the triage model for a relevance verdict on a batch of posts.
+
+    Posts without a verdict pass as relevant. A response whose verdicts stay
+    malformed after repair (e.g. "relevant": "maybe") raises ValueError.
+    """
+    post_lines = "\n".join(_describe_post(i + 1, post, platform) for i, post in enumerate(posts))
+    prompt = f"""Business Idea: "{business_idea}"
+
+For each {platform} post below, decide whether it is relevant to validating the business idea
+(it discusses the problem, the target audience, competing solutions or demand).
+
+Posts:
+{post_lines}
+
+Return only a JSON object with one verdict per post:
+{{"verdicts": [{{"id": 1, "relevant": true/false, "confidence": 0.0-1.0}}, ...]}}"""
+
+    batch = generate_structured(
+        prompt, TriageBatch, model_name=current_config().TRIAGE_MODEL, tier="triage", allow_partial=False
+    )
+
+    results = [(True, 0.0)] * len(posts)
+    for verdict in batch.verdicts:
+        index = verdict.id - 1
+        if 0 <= index < len(posts):
+            results[index] = (verdict.relevant, verdict.confidence)
+    return results
+
+def iter_triage(posts: Iterable[dict], business_idea: str, platform: str) -> Iterator[Tuple[dict, bool]]:
+    """Triage posts batch by batch, yielding each post with whether it was rejected.
+    
+    A post is rejected only when the triage model says it is irrelevant with at
+    least TRIAGE_CONFIDENCE_THRESHOLD confidence. Batches that fail for any
+    reason are passed through untouched so the cascade never loses posts.
+    Only one batch is held in memory, so posts can be streamed from a spill file.
+    
+    Args:
+        posts: Posts to triage (a list or any iterable)
+        business_idea: The business idea being validated
+        platform: "HackerNews" or "Reddit"
+        
+    Yields:
+        Tuples of (post, rejected) in input order
+    """
+    if not get_google_api_key():
+        for post in posts:
+            yield post, False
+        return
+
+    config = current_config()
+    survivors = rejected = 0
+    posts = iter(posts)
+    while True:
+        batch = list(islice(posts, config.TRIAGE_BATCH_SIZE))
+        if not batch:
+            break
+        try:
+            verdicts = _triage_batch(batch, business_idea, platform)
+        except Exception as e:
+            logging.warning(f"Triage batch failed, passing {len(batch)} posts through: {e}")
+            metrics.increment("llm.triage.failures")
+            survivors += len(batch)
+            for post in batch:
+                yield post, False
+            continue
+
+        for post, (relevant, confidence) in zip(batch, verdicts):
+            post['triage'] = {"relevant": relevant, "confidence": confidence}
+            is_rejected = not relevant and confidence >= config.TRIAGE_CONFIDENCE_THRESHOLD
+            if is_rejected:
+                rejected += 1
+            else:
+                survivors += 1
+            yield post, is_rejected
+
+    key = "hn" if platform == "HackerNews" else "reddit"
+    metrics.increment(f"cascade.{key}.survivors", survivors)
+    metrics.increment(f"cascade.{key}.rejected", rejected)
+    logging.info(f"   [CASCADE] {platform}: {survivors}/{survivors + rejected} posts passed triage")
+
+def rejected_hn_analysis() -> HNPostAnalysis:
+    """Analysis recorded for an HN post the triage tier rejected."""
+    return HNPostAnalysis(
+        relevant=False,
+        pain_points=[],
+        solutions_mentioned=[],
+        market_signals=[],
+        sentiment="neutral",
+        engagement_score=0
+    )
+
+def rejected_reddit_analysis() -> RedditPostAnalysis:
+    """Analysis recorded for a Reddit post the triage tier rejected."""
+    return RedditPostAnalysis(
+        relevant=False,
+        pain_points=[],
+        solutions_mentioned=[],
+        market_signals=[],
+        sentiment="neutral",
+        engagement_score=0,
+        subreddit_context=""
+    )
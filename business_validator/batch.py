@@ -0,0 +1,232 @@
+"""
+Batch validation of many business ideas in one process.
+
+    python -m business_validator.batch ideas.jsonl [--output results.jsonl] [--concurrency 4] [--resume]
+
+Each input line is a JSON object holding the idea in "idea", "business_idea"
+or "text", or in "title" and "body" as in requests.jsonl; "id" or
+"request_id" names its result line.
+
+Keywords for every idea are generated first, and the searches are planned
+across the whole batch: keywords are normalized and deduplicated, and the
+plan (which ideas share which searches) is saved next to the results. Ideas
+then run concurrently, each in its own RunContext. Search pages, comment
+threads and linked articles are cached process-wide and fetched once even
+when several ideas ask for them at the same time, and an analysis prompt
+seen before (e.g. a duplicate idea) is answered from the cache. The key pools
+bound the total ScraperAPI and Gemini load across all ideas.
+
+One JSON line per idea is appended to the output as soon as it finishes, so
+an interrupted batch can be continued with --resume.
+"""
+
+import os
+import json
+import time
+import logging
+import datetime
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from business_validator.config import BATCH_CONCURRENCY, DATA_DIR, validate_api_keys
+from business_validator.run_context import RunContext, RunConfig
+from business_validator.validator import validate_business_idea
+from business_validator.analyzers.keyword_generator_simple import generate_keywords
+from business_validator.utils.environment import save_checkpoint, LOG_FORMAT
+from business_validator.utils.relevance import search_key
+
+# Run metrics summed over the batch to show what sharing saved
+_SUMMARY_COUNTERS = (
+    "hn.searches", "hn.search_fetches",
+    "reddit.searches", "reddit.search_fetches",
+    "hn.comment_cache_hits", "reddit.comment_cache_hits",
+    "llm.analysis.reused"
+)
+
+def load_ideas(path: str) -> List[Dict[str, str]]:
+    """Read ideas from a JSONL file.
+
+    Args:
+        path: JSONL file, one idea object per line
+
+    Returns:
+        List of {'id', 'business_idea'} dictionaries
+    """
+    ideas = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.get("idea") or record.get("business_idea") or record.get("text")
+            if not text:
+                text = ". ".join(part.strip() for part in (record.get("title", ""), record.get("body", "")) if part.strip())
+            if not text:
+                logging.warning(f"Skipping line {line_number} of {path}: no idea text")
+                continue
+            idea_id = record.get("id") or record.get("request_id") or f"line-{line_number}"
+            ideas.append({"id": str(idea_id), "business_idea": text})
+    return ideas
+
+def plan_searches(ideas: List[Dict[str, str]], concurrency: int = BATCH_CONCURRENCY) -> Dict[str, Any]:
+    """Generate keywords for every idea and deduplicate the searches across the batch.
+
+    Args:
+        ideas: Ideas as returned by load_ideas
+        concurrency: Keyword generation calls made at once
+
+    Returns:
+        The plan: keywords per idea, ideas per normalized search, and totals
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        keyword_lists = list(executor.map(lambda idea: generate_keywords(idea["business_idea"]), ideas))
+
+    keywords = {}
+    searches = defaultdict(list)
+    for idea, idea_keywords in zip(ideas, keyword_lists):
+        keywords[idea["id"]] = idea_keywords
+        for keyword in idea_keywords:
+            searches[search_key(keyword)].append(idea["id"])
+
+    total = sum(len(idea_keywords) for idea_keywords in keyword_lists)
+    return {
+        "ideas": len(ideas),
+        "keyword_searches": total,
+        "unique_searches": len(searches),
+        "shared_searches": sum(1 for idea_ids in searches.values() if len(idea_ids) > 1),
+        "keywords": keywords,
+        "searches": dict(searches)
+    }
+
+def _read_done(output_path: str) -> set:
+    """Ids that already have a successful result line in the output."""
+    done = set()
+    if os.path.exists(output_path):
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if result.get("status") == "ok":
+                    done.add(result.get("id"))
+    return done
+
+def _validate_one(idea: Dict[str, str], keywords: List[str], config_overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Validate one idea in its own RunContext and build its result line."""
+    run = RunContext(idea["business_idea"], config_overrides)
+    start = time.perf_counter()
+    result = {"id": idea["id"], "business_idea": idea["business_idea"], "run_id": run.run_id, "data_dir": run.data_dir}
+    try:
+        analysis = validate_business_idea(idea["business_idea"], run=run, keywords=keywords)
+        result.update(status="ok", overall_score=analysis.overall_score, analysis=analysis.dict())
+    except Exception as e:
+        logging.error(f"Batch idea {idea['id']} failed: {e}")
+        result.update(status="error", error=str(e))
+    result["elapsed_seconds"] = round(time.perf_counter() - start, 1)
+    result["metrics"] = {name: run.metrics.counters.get(name, 0) for name in _SUMMARY_COUNTERS}
+    return result
+
+def validate_batch(
+    ideas: List[Dict[str, str]],
+    output_path: str,
+    concurrency: int = BATCH_CONCURRENCY,
+    config_overrides: Optional[Dict[str, Any]] = None,
+    resume: bool = False
+) -> Dict[str, Any]:
+    """Validate many ideas concurrently, writing one result line per idea.
+
+    Args:
+        ideas: Ideas as returned by load_ideas
+        output_path: JSONL file that receives one result line per idea
+        concurrency: Ideas validated at once
+        config_overrides: Config settings applied to every idea's run
+        resume: Skip ideas that already have a successful line in output_path
+
+    Returns:
+        Batch summary (counts, timings and what the shared caches saved)
+    """
+    validate_api_keys()
+    RunConfig(config_overrides)  # Fail on unknown settings before any work is done
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    done = _read_done(output_path) if resume else set()
+    pending = [idea for idea in ideas if idea["id"] not in done]
+    if not resume and os.path.exists(output_path):
+        os.remove(output_path)
+    logging.info(f"[BATCH] {len(pending)} idea(s) to validate ({len(done)} already done)")
+
+    start = time.perf_counter()
+    plan = plan_searches(pending, concurrency)
+    save_checkpoint(plan, os.path.basename(os.path.splitext(output_path)[0]) + "_plan.json",
+                    os.path.dirname(os.path.abspath(output_path)))
+    logging.info(f"[BATCH] Planned {plan['unique_searches']} unique searches for "
+                 f"{plan['keyword_searches']} keyword searches ({plan['shared_searches']} shared by several ideas)")
+
+    write_lock = threading.Lock()
+    totals = defaultdict(float)
+    statuses = defaultdict(int)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            executor.submit(_validate_one, idea, plan["keywords"][idea["id"]], config_overrides)
+            for idea in pending
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            with write_lock:
+                with open(output_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            statuses[result["status"]] += 1
+            for name, value in result["metrics"].items():
+                totals[name] += value
+            logging.info(f"[BATCH] {sum(statuses.values())}/{len(pending)} done: {result['id']} "
+                         f"({result['status']}, {result['elapsed_seconds']}s)")
+
+    searches = totals["hn.searches"] + totals["reddit.searches"]
+    fetches = totals["hn.search_fetches"] + totals["reddit.search_fetches"]
+    return {
+        "ideas": len(ideas),
+        "skipped_done": len(done),
+        "validated": len(pending),
+        "statuses": dict(statuses),
+        "elapsed_seconds": round(time.perf_counter() - start, 1),
+        "unique_searches_planned": plan["unique_searches"],
+        "search_requests": int(searches),
+        "search_fetches": int(fetches),
+        "search_fetches_saved": int(searches - fetches),
+        "comment_cache_hits": int(totals["hn.comment_cache_hits"] + totals["reddit.comment_cache_hits"]),
+        "analyses_reused": int(totals["llm.analysis.reused"]),
+        "output": output_path
+    }
+
+def _parse_override(setting: str):
+    """Parse a KEY=VALUE override; values are read as JSON when possible."""
+    name, _, value = setting.partition("=")
+    try:
+        return name.strip(), json.loads(value)
+    except json.JSONDecodeError:
+        return name.strip(), value
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a JSONL file of business ideas")
+    parser.add_argument("input", help="JSONL file with one idea per line")
+    parser.add_argument("--output", help="Result JSONL file (default: validation_data/batch_<timestamp>.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Ideas validated at once")
+    parser.add_argument("--resume", action="store_true", help="Skip ideas already completed in the output file")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Config override for every run, e.g. --set MAX_PAGES_PER_KEYWORD_HN=2")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = args.output or os.path.join(DATA_DIR, f"batch_{timestamp}.jsonl")
+    overrides = dict(_parse_override(setting) for setting in args.set)
+
+    summary = validate_batch(load_ideas(args.input), output, args.concurrency, overrides, args.resume)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -15,24 +15,144 @@ except ImportError:
 SCRAPERAPI_KEY = os.getenv("SCRAPERAPI_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
+def _key_list(list_var: str, single_key: str) -> list:
+    """Read a comma-separated key list, falling back to the single-key variable."""
+    keys = [key.strip() for key in os.getenv(list_var, "").split(",") if key.strip()]
+    if not keys and single_key:
+        keys = [single_key]
+    return keys
+
+# Key pools: set SCRAPERAPI_KEYS / GOOGLE_API_KEYS to comma-separated lists to spread load over several keys
+SCRAPERAPI_KEYS = _key_list("SCRAPERAPI_KEYS", SCRAPERAPI_KEY)
+GOOGLE_API_KEYS = _key_list("GOOGLE_API_KEYS", GOOGLE_API_KEY)
+SCRAPERAPI_KEY_CONCURRENCY = 5  # Concurrent requests allowed per ScraperAPI key (free plan limit)
+SCRAPERAPI_KEY_RPM = 0  # Requests per minute per ScraperAPI key (0 = no limit beyond concurrency)
+GOOGLE_KEY_CONCURRENCY = 4  # Concurrent Gemini calls per key
+GOOGLE_KEY_RPM = 15  # Gemini requests per minute per key (free tier limit)
+KEY_QUOTA_COOLDOWN_SECONDS = 60  # How long a key that returned a quota error is ejected from its pool
+
+# ScraperAPI Account Probe (endpoints can point at a local stub for testing)
+SCRAPERAPI_ENDPOINT = os.getenv("SCRAPERAPI_ENDPOINT", "https://api.scraperapi.com/")
+SCRAPERAPI_ACCOUNT_URL = os.getenv("SCRAPERAPI_ACCOUNT_URL", "https://api.scraperapi.com/account")
+ACCOUNT_PROBE_ENABLED = True  # Size scraper concurrency from each key's plan limits and remaining credits
+ACCOUNT_REFRESH_SECONDS = 300  # Re-read account limits this often during long jobs
+
+# Request Timeout and Hedging Configuration
+REQUEST_TIMEOUT_SECONDS = 30  # Timeout used until an endpoint has enough latency samples
+ADAPTIVE_TIMEOUTS = True  # Derive per-endpoint timeouts from observed p95 latency
+ADAPTIVE_TIMEOUT_MULTIPLIER = 1.5  # Timeout = p95 latency x this
+ADAPTIVE_TIMEOUT_MIN_SECONDS = 10
+ADAPTIVE_TIMEOUT_MAX_SECONDS = 90
+LATENCY_MIN_SAMPLES = 10  # Samples per endpoint before percentiles are used
+LATENCY_WINDOW = 200  # Most recent latencies kept per endpoint
+HEDGE_REQUESTS = True  # Send a duplicate request when the first is slower than the endpoint's p90
+HEDGE_RATIO = 0.1  # At most this fraction of requests may be hedged (bounds extra credit use)
+FETCH_TIER_RETRY_SECONDS = 600  # After escalating on a domain, retry cheaper fetch tiers after this long
+
 def validate_api_keys():
     """Validate that required API keys are set."""
-    if not SCRAPERAPI_KEY:
-        raise ValueError("SCRAPERAPI_KEY environment variable not set")
-    if not GOOGLE_API_KEY:
-        raise ValueError("GOOGLE_API_KEY environment variable not set")
+    if not SCRAPERAPI_KEYS:
+        raise ValueError("SCRAPERAPI_KEY (or SCRAPERAPI_KEYS) environment variable not set")
+    if not GOOGLE_API_KEYS:
+        raise ValueError("GOOGLE_API_KEY (or GOOGLE_API_KEYS) environment variable not set")
 
 # HackerNews Configuration
+HN_API_BASE = os.getenv("HN_API_BASE", "https://hn.algolia.com/api/v1")  # Algolia API (can point at a local stand-in)
 MAX_PAGES_PER_KEYWORD_HN = 3  # Number of pages to scrape per keyword on HN
 HN_DELAY = 1  # Seconds to wait between HN requests
+HN_COMMENT_POSTS = 30  # Sampled HN stories to fetch comment threads for (ranked by relevance x engagement)
+HN_COMMENT_CONCURRENCY = 8  # Concurrent Algolia item requests when fetching HN comment threads
+
+# Linked-Article Enrichment (HN stories that link to external pages)
+ENRICH_ARTICLES = True  # Download linked pages and attach a trimmed summary to the post before analysis
+ARTICLE_ENRICHMENT_BUDGET = 15  # Maximum pages downloaded per run (cached pages do not count)
+ARTICLE_CONCURRENCY = 8  # Concurrent article downloads
+ARTICLE_PER_DOMAIN_CONCURRENCY = 2  # Concurrent downloads per domain
+ARTICLE_MAX_BYTES = 512 * 1024  # Hard cap on bytes read per page
+ARTICLE_TIMEOUT_SECONDS = 15  # Read timeout per page
+ARTICLE_SUMMARY_CHARS = 1200  # Length of the summary attached to the post
+ARTICLE_TOKEN_BUDGET = 250  # Share of the per-post prompt budget the article summary may use
 
 # Reddit Configuration  
 MAX_PAGES_PER_KEYWORD_REDDIT = 3  # Number of pages to scrape per keyword on Reddit
-MAX_POSTS_TO_ANALYZE = 20  # Maximum posts to scrape comments for per keyword
-MAX_COMMENTS_PER_POST = 10  # Maximum top comments to analyze per post
+REDDIT_TRIAGE_MIN_RELEVANCE = 0.15  # Minimum title/selftext relevance for a sampled post to get its comments fetched
+MAX_COMMENTS_PER_POST = 10  # Maximum top comments to analyze per post (HN and Reddit)
+COMMENT_CACHE_SIZE = 500  # Comment threads kept in memory across runs in the same process
+COMMENT_CACHE_TTL_SECONDS = 3600  # How long a cached comment thread stays fresh
+SEARCH_CACHE_SIZE = 2000  # Search result pages (HN and Reddit) kept in memory and shared by concurrent runs
+SEARCH_CACHE_TTL_SECONDS = 6 * 3600  # How long a cached search page stays fresh (covers an overnight batch)
 REDDIT_DELAY = 2  # Seconds to wait between Reddit requests (longer due to more complexity)
 
+# Analysis Sampling Configuration (step 4)
+# ANALYSIS_BUDGET replaces MAX_POSTS_TO_ANALYZE. It is split between the platforms by posts collected (about 40 each
+# by default), and early stopping (below) can only skip the unanalyzed rest of a platform's share
+ANALYSIS_BUDGET = 80  # Posts sent to LLM analysis per run, a stratified sample over platform, keyword, subreddit and engagement band
+SAMPLE_ENGAGEMENT_BANDS = [10, 100]  # Upvote/point thresholds between the engagement bands used for sampling
+
+# Adaptive Paging Configuration (steps 2-3)
+ADAPTIVE_PAGING = True  # Stop paging a keyword early when pages stop yielding new relevant posts
+MIN_PAGES_PER_KEYWORD = 1  # Always fetch at least this many pages per keyword
+ADAPTIVE_MIN_NEW_POSTS = 3  # Stop when a page adds fewer unique posts than this
+ADAPTIVE_MIN_PAGE_YIELD = 1.0  # Stop when a page's relevance-weighted new posts fall below this
+
+# LLM Configuration
+ANALYSIS_MODEL = "gemini-1.5-flash"  # Model used for full structured post analysis
+TRIAGE_MODEL = "gemini-1.5-flash-8b"  # Cheaper model used for batched relevance triage
+CASCADE_MODE = True  # Triage posts with TRIAGE_MODEL before running the full analysis
+TRIAGE_BATCH_SIZE = 25  # Posts per triage call
+TRIAGE_CONFIDENCE_THRESHOLD = 0.7  # Skip full analysis only when triage is at least this sure a post is irrelevant
+
+# Early Stopping Configuration (steps 5-6)
+EARLY_STOPPING = True  # Stop analyzing a platform's share of ANALYSIS_BUDGET once its findings have converged
+EARLY_STOP_MIN_RELEVANT = 10  # Relevant analyses needed before a platform's analysis may stop
+EARLY_STOP_CHECK_EVERY = 5  # Analyses between convergence checks
+EARLY_STOP_STABLE_CHECKS = 2  # Consecutive checks with a steady relevance rate and top pain-point order needed to stop
+EARLY_STOP_TOP_PAIN_POINTS = 5  # Most common pain points whose ranking must be stable
+EARLY_STOP_MIN_PAIN_POINT_COUNT = 2  # Mentions a pain point needs to be ranked (one-off phrases never reorder)
+EARLY_STOP_RATE_TOLERANCE = 0.1  # Widest 95% confidence interval half-width of the sample's relevance rate to stop at
+EARLY_STOP_SENTIMENT_TOLERANCE = 0.15  # Widest 95% confidence interval half-width of each of the sample's sentiment shares to stop at
+
+STRUCTURED_OUTPUT = True  # Constrain Gemini responses with a JSON MIME type and response schema
+STRUCTURED_OUTPUT_MAX_REPAIRS = 1  # Follow-up calls that re-ask only for malformed fields
+STREAM_FINAL_ANALYSIS = True  # Stream the final report and surface each field as soon as it is complete
+SUMMARY_PHRASE_SLOTS = 200  # Distinct phrases counted per field (pain points, solutions, signals) in the running analysis summaries
+
+# Prompt Budget Configuration
+PROMPT_TOKEN_BUDGET_PER_POST = 1000  # Tokens of post content and comments packed into each analysis prompt
+SELFTEXT_TOKEN_BUDGET = 300  # Share of the per-post budget the Reddit selftext may use
+
 # Logging and Checkpoint Configuration
 DATA_DIR = "validation_data"
 LOG_DIR = "logs"
-CHECKPOINT_INTERVAL = 5  # Save checkpoints every N items when processing lists
+CHECKPOINT_INTERVAL = 5  # Flush a stage's spill file (its partial checkpoint) every N items
+KEEP_SPILL_FILES = False  # Keep a successful run's spill/*.jsonl files (failed or cancelled runs always keep them)
+EVENT_LOG_ENABLED = True  # Append each run's progress events to events.jsonl in its data directory
+STREAM_QUEUE_SIZE = 100  # Results iter_validation buffers before the run waits for the consumer
+
+# Batch Validation Configuration (`python -m business_validator.batch`)
+BATCH_CONCURRENCY = 4  # Ideas validated at once; key pools still bound total scraper and Gemini load
+ANALYSIS_CACHE_SIZE = 5000  # Post analyses reused when the exact same prompt comes up again (e.g. duplicate ideas)
+ANALYSIS_CACHE_TTL_SECONDS = 24 * 3600
+
+# Job Service Configuration (`python -m business_validator.jobs serve`)
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))  # Persistent job queue
+JOBS_DB_WAL = os.getenv("JOBS_DB_WAL", "1") != "0"  # WAL needs every process on one host; set 0 when hosts share the database over a network filesystem
+JOB_WORKERS = 2  # Validations the service runs at once, across all users
+JOBS_HOST = os.getenv("JOBS_HOST", "127.0.0.1")
+JOBS_PORT = int(os.getenv("JOBS_PORT", "8765"))
+JOBS_URL = os.getenv("JOBS_URL", f"http://{JOBS_HOST}:{JOBS_PORT}")  # Where the UI and CLI reach the service
+JOB_POLL_SECONDS = 1.0  # How often idle workers check the queue and clients check a job
+JOB_STALE_SECONDS = 60  # Running jobs without a heartbeat for this long are requeued when a service starts
+
+# Worker Scale-Out (`python -m business_validator.jobs worker`)
+SHARDED_VALIDATION = False  # Job service splits steps 2-6 into shards for worker processes instead of running them in-process
+SHARD_KEYWORDS_PER_TASK = 1  # Keywords per search shard
+SHARD_POSTS_PER_TASK = 10  # Posts per comment-thread or analysis shard
+TASK_MAX_ATTEMPTS = 3  # Shards that fail (or whose worker dies) are retried up to this many times
+WORKER_PROCESSES = os.cpu_count() or 1  # Processes started by `jobs worker` (one interpreter each, so parsing scales past the GIL)
+
+# Raw Response Archive (for offline re-parsing with `python -m business_validator.reparse`)
+RAW_ARCHIVE_ENABLED = True  # Store every fetched page compressed alongside the run
+RAW_ARCHIVE_DIR = os.getenv("RAW_ARCHIVE_DIR")  # Shared directory for archived pages (default: each run's raw/ folder)
+RAW_ARCHIVE_LEVEL = 6  # Compression level (zstd if installed, otherwise gzip)
+REPARSE_WORKERS = os.cpu_count() or 1  # Processes used to re-parse archived pages
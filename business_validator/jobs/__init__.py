@@ -0,0 +1,43 @@
+"""
+Background job service: a persistent validation queue, a worker pool and a
+local HTTP API. The Streamlit UI and the CLI submit and poll jobs through it.
+
+    python -m business_validator.jobs serve
+    python -m business_validator.jobs worker --processes 4
+"""
+
+from business_validator.jobs.store import (
+    JobStore,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    FAILED,
+    CANCELLED,
+    FINISHED_STATUSES
+)
+from business_validator.jobs.tasks import TaskQueue
+from business_validator.jobs.worker import ShardedStages, run_worker, start_workers, execute_task
+from business_validator.jobs.service import JobService
+from business_validator.jobs.server import make_server, serve, start_background_service
+from business_validator.jobs.client import JobClient, JobServiceError
+
+__all__ = [
+    'JobStore',
+    'QUEUED',
+    'RUNNING',
+    'SUCCEEDED',
+    'FAILED',
+    'CANCELLED',
+    'FINISHED_STATUSES',
+    'TaskQueue',
+    'ShardedStages',
+    'run_worker',
+    'start_workers',
+    'execute_task',
+    'JobService',
+    'make_server',
+    'serve',
+    'start_background_service',
+    'JobClient',
+    'JobServiceError'
+]
@@ -0,0 +1,126 @@
+"""
+Command line for the job service.
+
+    python -m business_validator.jobs serve [--workers 2] [--host 127.0.0.1] [--port 8765]
+    python -m business_validator.jobs worker [--processes 4] [--exit-when-idle 30]
+    python -m business_validator.jobs submit "AI bookkeeping for freelancers" [--wait] [--set KEY=VALUE]
+    python -m business_validator.jobs status <job_id>
+    python -m business_validator.jobs list [--status running]
+    python -m business_validator.jobs cancel <job_id>
+    python -m business_validator.jobs result <job_id>
+"""
+
+import sys
+import json
+import logging
+import argparse
+
+from business_validator.config import JOBS_HOST, JOBS_PORT, JOBS_URL, JOB_WORKERS, WORKER_PROCESSES
+from business_validator.models import CombinedAnalysis
+from business_validator.utils.environment import LOG_FORMAT
+from business_validator.utils.events import describe_progress
+from business_validator.utils.reporting import print_validation_report
+from business_validator.jobs.client import JobClient, JobServiceError
+from business_validator.jobs.server import serve
+from business_validator.jobs.store import SUCCEEDED, RUNNING
+from business_validator.jobs.worker import run_worker, start_workers
+
+def _parse_override(setting: str):
+    """Parse a KEY=VALUE override; values are read as JSON when possible."""
+    name, _, value = setting.partition("=")
+    try:
+        return name.strip(), json.loads(value)
+    except json.JSONDecodeError:
+        return name.strip(), value
+
+def _print_job(job: dict):
+    print(f"{job['id']}  {job['status']:<10} {job['business_idea'][:60]}"
+          + (f"  ({job['data_dir']})" if job.get("data_dir") else "")
+          + (f"  error: {job['error']}" if job.get("error") else ""))
+
+def _progress_printer():
+    """on_update callback for JobClient.wait that prints the job's progress when it changes."""
+    last = None
+
+    def show(job: dict):
+        nonlocal last
+        if job["status"] == RUNNING:
+            line = describe_progress(job["progress"])
+            if line != last:
+                print(f"  {line}")
+                last = line
+
+    return show
+
+def main():
+    parser = argparse.ArgumentParser(description="Business validator job service")
+    parser.add_argument("--url", default=JOBS_URL, help="Job service URL for client commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the worker pool and HTTP API")
+    serve_parser.add_argument("--host", default=JOBS_HOST)
+    serve_parser.add_argument("--port", type=int, default=JOBS_PORT)
+    serve_parser.add_argument("--workers", type=int, default=JOB_WORKERS, help="Validations run at once")
+
+    worker_parser = commands.add_parser("worker", help="Run stage shards of sharded validations")
+    worker_parser.add_argument("--processes", type=int, default=WORKER_PROCESSES, help="Worker processes to start")
+    worker_parser.add_argument("--exit-when-idle", type=float, metavar="SECONDS", help="Exit after this long without work")
+
+    submit_parser = commands.add_parser("submit", help="Queue a validation")
+    submit_parser.add_argument("business_idea")
+    submit_parser.add_argument("--wait", action="store_true", help="Wait for the job and print its report")
+    submit_parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="Config override for this run")
+
+    for name, help_text in (("status", "Show a job"), ("cancel", "Cancel a job"), ("result", "Print a job's report")):
+        commands.add_parser(name, help=help_text).add_argument("job_id")
+
+    list_parser = commands.add_parser("list", help="List recent jobs")
+    list_parser.add_argument("--status")
+    list_parser.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.workers)
+        return
+
+    if args.command == "worker":
+        if args.processes <= 1:
+            run_worker(idle_exit=args.exit_when_idle)
+            return
+        workers = start_workers(args.processes, args.exit_when_idle)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+        return
+
+    client = JobClient(args.url)
+    try:
+        if args.command == "submit":
+            job = client.submit(args.business_idea, dict(_parse_override(setting) for setting in args.set))
+            _print_job(job)
+            if args.wait:
+                job = client.wait(job["id"], on_update=_progress_printer())
+                _print_job(job)
+                if job["status"] == SUCCEEDED:
+                    print_validation_report(CombinedAnalysis(**client.result(job["id"])), job["business_idea"])
+        elif args.command == "status":
+            print(json.dumps(client.get(args.job_id), indent=2))
+        elif args.command == "list":
+            for job in client.list(args.status, args.limit):
+                _print_job(job)
+        elif args.command == "cancel":
+            _print_job(client.cancel(args.job_id))
+        elif args.command == "result":
+            job = client.get(args.job_id)
+            print_validation_report(CombinedAnalysis(**client.result(args.job_id)), job["business_idea"])
+    except JobServiceError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Client for the job service HTTP API, used by the UI and the CLI.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from business_validator.config import JOBS_URL, JOB_POLL_SECONDS
+from business_validator.jobs.store import FINISHED_STATUSES
+
+class JobServiceError(Exception):
+    """The job service is unreachable or rejected a request."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class JobClient:
+    """Submit, poll, cancel and fetch validation jobs over HTTP."""
+
+    def __init__(self, base_url: str = JOBS_URL, timeout: float = 10):
+        """
+        Args:
+            base_url: Job service URL (default: JOBS_URL)
+            timeout: Seconds to wait for each API call
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            raise JobServiceError(f"Job service not reachable at {self.base_url}: {e}")
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"error": response.text}
+        if response.status_code >= 400:
+            raise JobServiceError(body.get("error", f"HTTP {response.status_code}"), response.status_code)
+        return body
+
+    def available(self) -> bool:
+        """Return True if the service answers its health check."""
+        try:
+            self.health()
+            return True
+        except JobServiceError:
+            return False
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+    def submit(self, business_idea: str, config_overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a validation and return the job."""
+        return self._request("POST", "/jobs", json={"business_idea": business_idea, "config_overrides": config_overrides or {}})
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Return a job's status, run directory, progress and streamed report fields."""
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return recent jobs, newest first."""
+        params = {"limit": limit}
+        if status:
+            params["status"] = status
+        return self._request("GET", "/jobs", params=params)["jobs"]
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued or running job."""
+        return self._request("POST", f"/jobs/{job_id}/cancel")
+
+    def result(self, job_id: str) -> Dict[str, Any]:
+        """Return the final analysis (as a dict) of a succeeded job."""
+        return self._request("GET", f"/jobs/{job_id}/result")["result"]
+
+    def wait(
+        self,
+        job_id: str,
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+        poll_seconds: float = JOB_POLL_SECONDS
+    ) -> Dict[str, Any]:
+        """Poll a job until it finishes.
+
+        Args:
+            job_id: Job to wait for
+            on_update: Optional callback called with the job after every poll
+            poll_seconds: Delay between polls
+
+        Returns:
+            The finished job
+        """
+        while True:
+            job = self.get(job_id)
+            if on_update:
+                on_update(job)
+            if job["status"] in FINISHED_STATUSES:
+                return job
+            time.sleep(poll_seconds)
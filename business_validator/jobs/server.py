@@ -0,0 +1,151 @@
+"""
+Local HTTP API for the job service (JSON over the standard library's HTTP server).
+
+    POST   /jobs                 {"business_idea": "...", "config_overrides": {...}} -> 202 job
+    GET    /jobs?status=&limit=  recent jobs
+    GET    /jobs/<id>            job status, run directory, progress and streamed report fields
+    GET    /jobs/<id>/result     final analysis of a succeeded job (409 until then)
+    POST   /jobs/<id>/cancel     cancel a queued or running job (DELETE /jobs/<id> also works)
+    GET    /health               workers and queue counts
+"""
+
+import json
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from business_validator.config import JOBS_HOST, JOBS_PORT, JOB_WORKERS
+from business_validator.jobs.service import JobService
+from business_validator.jobs.store import SUCCEEDED
+
+def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+    """A job without its (large) result; fetch that from /jobs/<id>/result."""
+    return {key: value for key, value in job.items() if key != "result"}
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes API requests to the JobService attached to the server."""
+
+    server_version = "BusinessValidatorJobs/1.0"
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logging.debug(f"[JOBS API] {self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: Any):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _route(self) -> Tuple[list, Dict[str, list]]:
+        url = urlparse(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def _job_or_404(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.service.store.get(job_id)
+        if job is None:
+            self._send(404, {"error": f"Unknown job {job_id}"})
+        return job
+
+    def do_GET(self):
+        parts, query = self._route()
+        if parts == ["health"]:
+            self._send(200, self.service.health())
+        elif parts == ["jobs"]:
+            status = query.get("status", [None])[0]
+            try:
+                limit = int(query.get("limit", ["50"])[0])
+                if limit < 1:
+                    raise ValueError
+            except ValueError:
+                self._send(400, {"error": "limit must be a positive integer"})
+                return
+            self._send(200, {"jobs": [_public(job) for job in self.service.store.list(status, limit)]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job_or_404(parts[1])
+            if job:
+                self._send(200, _public(job))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            job = self._job_or_404(parts[1])
+            if job and job["status"] == SUCCEEDED:
+                self._send(200, {"id": job["id"], "business_idea": job["business_idea"], "result": job["result"]})
+            elif job:
+                self._send(409, {"error": f"Job is {job['status']}", "status": job["status"], "detail": job["error"]})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts == ["jobs"]:
+            try:
+                body = self._read_json()
+                business_idea = body.get("business_idea") or ""
+                if not isinstance(business_idea, str) or not business_idea.strip():
+                    raise ValueError("business_idea is required")
+                business_idea = business_idea.strip()
+                job = self.service.submit(business_idea, body.get("config_overrides"))
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+                return
+            self._send(202, _public(job))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            self._cancel(parts[1])
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) == 2 and parts[0] == "jobs":
+            self._cancel(parts[1])
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def _cancel(self, job_id: str):
+        job = self.service.cancel(job_id)
+        if job is None:
+            self._send(404, {"error": f"Unknown job {job_id}"})
+        else:
+            self._send(200, _public(job))
+
+def make_server(service: JobService, host: str = JOBS_HOST, port: int = JOBS_PORT) -> ThreadingHTTPServer:
+    """Create (but do not start) the HTTP server for a job service."""
+    server = ThreadingHTTPServer((host, port), _JobRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def start_background_service(host: str = JOBS_HOST, port: int = JOBS_PORT, workers: int = JOB_WORKERS) -> Tuple[JobService, ThreadingHTTPServer]:
+    """Start a job service and its API on daemon threads of this process (e.g. inside the UI)."""
+    service = JobService(workers=workers).start()
+    server = make_server(service, host, port)
+    threading.Thread(target=server.serve_forever, name="job-api", daemon=True).start()
+    logging.info(f"[JOBS] API listening on http://{host}:{server.server_port}")
+    return service, server
+
+def serve(host: str = JOBS_HOST, port: int = JOBS_PORT, workers: int = JOB_WORKERS):
+    """Run the job service and its API until interrupted."""
+    service = JobService(workers=workers).start()
+    server = make_server(service, host, port)
+    logging.info(f"[JOBS] API listening on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info("[JOBS] Stopping; running jobs will be requeued")
+        service.stop(timeout=30)
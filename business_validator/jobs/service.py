@@ -0,0 +1,155 @@
+"""
+Worker pool that runs queued validations.
+
+A JobService claims jobs from the JobStore and runs up to JOB_WORKERS
+validations at once, each in its own RunContext, however many users submit.
+A watcher thread heartbeats the running jobs and forwards cancellations
+requested through the store (from any process) to their runs. With
+SHARDED_VALIDATION on, a job's steps 2-6 are split into shards for worker
+processes (jobs/worker.py) and the service only coordinates the run.
+"""
+
+import os
+import socket
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from business_validator.config import JOB_WORKERS, JOB_POLL_SECONDS, JOB_STALE_SECONDS
+from business_validator.run_context import RunContext, RunConfig, RunCancelled
+from business_validator.validator import validate_business_idea
+from business_validator.jobs.store import JobStore, SUCCEEDED, FAILED, CANCELLED
+from business_validator.jobs.tasks import TaskQueue
+from business_validator.jobs.worker import ShardedStages
+
+class JobService:
+    """Runs jobs from a JobStore in a pool of worker threads."""
+
+    def __init__(self, store: Optional[JobStore] = None, workers: int = JOB_WORKERS):
+        """
+        Args:
+            store: Job queue to serve (default: the database at JOBS_DB_PATH)
+            workers: Validations run at once
+        """
+        self.store = store or JobStore()
+        self.workers = max(1, workers)
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[str, RunContext] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads = []
+
+    def start(self) -> "JobService":
+        """Recover jobs orphaned by a stopped service and start the workers."""
+        recovered = self.store.recover_stale(JOB_STALE_SECONDS)
+        if recovered:
+            logging.warning(f"[JOBS] Recovered {recovered} job(s) left running by a stopped service")
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        watcher = threading.Thread(target=self._watch_loop, name="job-watcher", daemon=True)
+        watcher.start()
+        self._threads.append(watcher)
+        logging.info(f"[JOBS] Service {self.name} started with {self.workers} worker(s) on {self.store.path}")
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the workers. Running validations are interrupted and requeued."""
+        self._stop.set()
+        self._wakeup.set()
+        with self._lock:
+            for run in self._running.values():
+                run.cancel()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, business_idea: str, config_overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a validation; unknown config overrides raise ValueError."""
+        RunConfig(config_overrides)
+        job = self.store.submit(business_idea, config_overrides)
+        self._wakeup.set()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a job; a running one stops at its next cancellation check."""
+        job = self.store.request_cancel(job_id)
+        with self._lock:
+            run = self._running.get(job_id)
+        if run is not None:
+            run.cancel()
+        return job
+
+    def health(self) -> Dict[str, Any]:
+        """Return worker usage and queue counts."""
+        with self._lock:
+            running = len(self._running)
+        return {"service": self.name, "workers": self.workers, "running_here": running, "jobs": self.store.counts()}
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim(self.name)
+            except Exception as e:
+                logging.error(f"[JOBS] Could not claim a job: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(JOB_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        try:
+            run = RunContext(job["business_idea"], job["config_overrides"])
+        except Exception as e:
+            logging.error(f"[JOBS] Job {job_id} could not start: {e}")
+            self.store.finish(job_id, FAILED, error=str(e))
+            return
+
+        self.store.set_run(job_id, run.run_id, run.data_dir)
+        with self._lock:
+            self._running[job_id] = run
+        logging.info(f"[JOBS] Job {job_id} started as run {run.run_id}")
+
+        try:
+            # Sharded runs fan steps 2-6 out to worker processes sharing this database
+            stages = ShardedStages(TaskQueue(self.store.path)) if run.config.SHARDED_VALIDATION else None
+            analysis = validate_business_idea(
+                job["business_idea"],
+                on_partial_result=lambda field, value: self.store.set_partial(job_id, field, value),
+                run=run,
+                stages=stages,
+                on_progress=lambda event: self.store.set_progress(job_id, run.events.snapshot())
+            )
+            self.store.finish(job_id, SUCCEEDED, result=analysis.dict())
+            logging.info(f"[JOBS] Job {job_id} succeeded")
+        except RunCancelled:
+            if self._stop.is_set() and not self.store.get(job_id)["cancel_requested"]:
+                self.store.requeue(job_id)
+                logging.info(f"[JOBS] Job {job_id} interrupted by shutdown and requeued")
+            else:
+                self.store.finish(job_id, CANCELLED)
+                logging.info(f"[JOBS] Job {job_id} cancelled")
+        except Exception as e:
+            logging.error(f"[JOBS] Job {job_id} failed: {e}")
+            self.store.finish(job_id, FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+
+    def _watch_loop(self):
+        while not self._stop.wait(JOB_POLL_SECONDS):
+            with self._lock:
+                running = dict(self._running)
+            if not running:
+                continue
+            try:
+                self.store.heartbeat(list(running))
+                for job_id in self.store.cancel_requested(list(running)):
+                    running[job_id].cancel()
+            except Exception as e:
+                logging.warning(f"[JOBS] Heartbeat failed: {e}")
@@ -0,0 +1,238 @@
+"""
+Persistent job queue backed by SQLite.
+
+Jobs outlive the UI session and the service process that runs them: the
+queue is a table in JOBS_DB_PATH, workers claim jobs in a transaction, and
+a job left "running" by a service that stopped heartbeating is put back in
+the queue when a service starts.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from business_validator.config import JOBS_DB_PATH, JOBS_DB_WAL
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    business_idea TEXT NOT NULL,
+    config_overrides TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    run_id TEXT,
+    data_dir TEXT,
+    partial TEXT NOT NULL DEFAULT '{}',
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+_JSON_COLUMNS = ("config_overrides", "partial", "progress", "result")
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    for column in _JSON_COLUMNS:
+        job[column] = json.loads(job[column]) if job[column] is not None else None
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    return job
+
+class SQLiteStore:
+    """Thread-safe access to a table in the shared jobs database (one connection per thread)."""
+
+    schema = ""
+    # (table, column, definition) for columns added after a table was first created
+    added_columns: Tuple[Tuple[str, str, str], ...] = ()
+
+    def __init__(self, path: str = JOBS_DB_PATH):
+        """
+        Args:
+            path: SQLite database file; created with its directory if missing
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(self.schema)
+        for table, column, definition in self.added_columns:
+            existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; claims and cancels open their own write transactions
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA journal_mode={'WAL' if JOBS_DB_WAL else 'DELETE'}")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, fn):
+        """Run fn(conn) in a write transaction so concurrent workers never claim the same row."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+class JobStore(SQLiteStore):
+    """The queue of validation jobs."""
+
+    schema = _SCHEMA
+    added_columns = (("jobs", "progress", "TEXT NOT NULL DEFAULT '{}'"),)
+
+    def submit(self, business_idea: str, config_overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a validation and return the new job."""
+        job_id = uuid.uuid4().hex[:12]
+        self._connect().execute(
+            "INSERT INTO jobs (id, business_idea, config_overrides, status, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, business_idea, json.dumps(config_overrides or {}), QUEUED, time.time())
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job, or None if it does not exist."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return the most recent jobs, optionally only those with one status."""
+        if status:
+            rows = self._connect().execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+            ).fetchall()
+        else:
+            rows = self._connect().execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Move the oldest queued job to running for a worker; None if the queue is empty."""
+        def claim_oldest(conn):
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker, now, now, row["id"])
+            )
+            return row["id"]
+
+        job_id = self._transaction(claim_oldest)
+        return self.get(job_id) if job_id else None
+
+    def set_run(self, job_id: str, run_id: str, data_dir: str):
+        """Record the run directory a job writes to."""
+        self._connect().execute("UPDATE jobs SET run_id = ?, data_dir = ? WHERE id = ?", (run_id, data_dir, job_id))
+
+    def set_partial(self, job_id: str, field: str, value: Any):
+        """Store one streamed field of a job's final report."""
+        self._connect().execute(
+            "UPDATE jobs SET partial = json_set(partial, ?, json(?)) WHERE id = ?",
+            (f'$."{field}"', json.dumps(value, default=str), job_id)
+        )
+
+    def set_progress(self, job_id: str, progress: Dict[str, Any]):
+        """Store a job's latest progress snapshot (see utils/events.py)."""
+        self._connect().execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress), job_id))
+
+    def heartbeat(self, job_ids: List[str]):
+        """Mark running jobs as still owned by a live service."""
+        now = time.time()
+        self._connect().executemany("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", [(now, job_id) for job_id in job_ids])
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Record a job's outcome."""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+        )
+
+    def requeue(self, job_id: str):
+        """Put an interrupted job back at its place in the queue."""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, worker = NULL, run_id = NULL, data_dir = NULL, partial = '{}', progress = '{}', "
+            "started_at = NULL, heartbeat_at = NULL WHERE id = ?",
+            (QUEUED, job_id)
+        )
+
+    def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued job now, or flag a running one for its worker to stop.
+
+        Returns:
+            The updated job, or None if it does not exist
+        """
+        def cancel(conn):
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return False
+            if row["status"] == QUEUED:
+                conn.execute("UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE id = ?",
+                             (CANCELLED, time.time(), job_id))
+            elif row["status"] == RUNNING:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return True
+
+        return self.get(job_id) if self._transaction(cancel) else None
+
+    def cancel_requested(self, job_ids: List[str]) -> List[str]:
+        """Return which of the given jobs have a pending cancellation."""
+        if not job_ids:
+            return []
+        placeholders = ",".join("?" * len(job_ids))
+        rows = self._connect().execute(
+            f"SELECT id FROM jobs WHERE cancel_requested = 1 AND id IN ({placeholders})", job_ids
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def recover_stale(self, stale_after: float) -> int:
+        """Requeue running jobs whose service stopped heartbeating (cancel them if that was requested).
+
+        Returns:
+            Number of jobs recovered
+        """
+        def recover(conn):
+            cutoff = time.time() - stale_after
+            cancelled = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE status = ? AND heartbeat_at < ? AND cancel_requested = 1",
+                (CANCELLED, time.time(), RUNNING, cutoff)
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, run_id = NULL, data_dir = NULL, partial = '{}', progress = '{}', "
+                "started_at = NULL, heartbeat_at = NULL WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+            return cancelled + requeued
+
+        return self._transaction(recover)
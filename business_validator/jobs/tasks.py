@@ -0,0 +1,174 @@
+"""
+Shared queue of stage shards for worker processes.
+
+A sharded validation splits steps 2-6 into shards (keywords or posts) and
+queues them here, in the same SQLite database as the jobs. Worker processes
+on this host, or on any host that shares the database and the run store,
+claim shards in a transaction, write each result into the run's shards/
+folder and mark the shard done. Shards whose worker stops heartbeating are
+requeued, up to TASK_MAX_ATTEMPTS attempts.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from business_validator.config import JOBS_DB_PATH, TASK_MAX_ATTEMPTS
+from business_validator.jobs.store import SQLiteStore, QUEUED, RUNNING, SUCCEEDED, FAILED
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_dir TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    claimed_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_id ON tasks (status, id);
+CREATE INDEX IF NOT EXISTS tasks_run_stage ON tasks (run_dir, stage);
+"""
+
+# Everything but the payload, for polling a stage's progress cheaply
+_STATUS_COLUMNS = "id, run_dir, stage, shard, status, attempts, worker, result_path, error, created_at, claimed_at, finished_at"
+
+class TaskQueue(SQLiteStore):
+    """The queue of stage shards."""
+
+    schema = _SCHEMA
+
+    def __init__(self, path: str = JOBS_DB_PATH, max_attempts: int = TASK_MAX_ATTEMPTS):
+        """
+        Args:
+            path: SQLite database file (shared with the job queue)
+            max_attempts: Attempts before a failing shard fails its stage
+        """
+        super().__init__(path)
+        self.max_attempts = max_attempts
+
+    def enqueue(self, run_dir: str, stage: str, shards: List[Dict[str, Any]], first_shard: int = 0) -> List[int]:
+        """Queue the shards of one stage of a run.
+
+        Args:
+            run_dir: The run store the shards write into
+            stage: Registered stage name (see business_validator/stages.py)
+            shards: One payload per shard
+            first_shard: Number of the first shard (when a stage is queued in batches)
+
+        Returns:
+            Task ids in shard order
+        """
+        def insert(conn):
+            now = time.time()
+            return [
+                conn.execute(
+                    "INSERT INTO tasks (run_dir, stage, shard, payload, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_dir, stage, shard, json.dumps(payload), QUEUED, now)
+                ).lastrowid
+                for shard, payload in enumerate(shards, first_shard)
+            ]
+
+        return self._transaction(insert)
+
+    def claim(self, worker: str, run_dir: Optional[str] = None, stage: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Move the oldest queued shard (optionally of one run and stage) to running.
+
+        Returns:
+            The task with its payload, or None if nothing is queued
+        """
+        def claim_oldest(conn):
+            query, params = "SELECT * FROM tasks WHERE status = ?", [QUEUED]
+            if run_dir is not None:
+                query, params = query + " AND run_dir = ?", params + [run_dir]
+            if stage is not None:
+                query, params = query + " AND stage = ?", params + [stage]
+            row = conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker = ?, attempts = attempts + 1, claimed_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker, now, now, row["id"])
+            )
+            task = dict(row)
+            task["payload"] = json.loads(task["payload"])
+            task["attempts"] += 1
+            return task
+
+        return self._transaction(claim_oldest)
+
+    def complete(self, task_id: int, result_path: str):
+        """Record where a finished shard wrote its result."""
+        self._connect().execute(
+            "UPDATE tasks SET status = ?, result_path = ?, finished_at = ? WHERE id = ?",
+            (SUCCEEDED, result_path, time.time(), task_id)
+        )
+
+    def fail(self, task_id: int, error: str) -> str:
+        """Requeue a failed shard, or fail it for good once it is out of attempts.
+
+        Returns:
+            The shard's new status
+        """
+        def record(conn):
+            row = conn.execute("SELECT attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return FAILED
+            status = FAILED if row["attempts"] >= self.max_attempts else QUEUED
+            conn.execute("UPDATE tasks SET status = ?, error = ?, worker = NULL, finished_at = ? WHERE id = ?",
+                         (status, error, time.time() if status == FAILED else None, task_id))
+            return status
+
+        return self._transaction(record)
+
+    def heartbeat(self, task_ids: List[int]):
+        """Mark shards as still being worked on."""
+        now = time.time()
+        self._connect().executemany("UPDATE tasks SET heartbeat_at = ? WHERE id = ?", [(now, task_id) for task_id in task_ids])
+
+    def stage_tasks(self, run_dir: str, stage: str) -> List[Dict[str, Any]]:
+        """Return the status of a stage's shards in shard order (without payloads)."""
+        rows = self._connect().execute(
+            f"SELECT {_STATUS_COLUMNS} FROM tasks WHERE run_dir = ? AND stage = ? ORDER BY shard", (run_dir, stage)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of shards in each status."""
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def purge(self, run_dir: str, stage: Optional[str] = None) -> int:
+        """Delete a run's shards (all of them, or one stage's); workers still running one just finish it."""
+        if stage is None:
+            return self._connect().execute("DELETE FROM tasks WHERE run_dir = ?", (run_dir,)).rowcount
+        return self._connect().execute("DELETE FROM tasks WHERE run_dir = ? AND stage = ?", (run_dir, stage)).rowcount
+
+    def recover_stale(self, stale_after: float) -> int:
+        """Requeue running shards whose worker stopped heartbeating (or fail them when out of attempts).
+
+        Returns:
+            Number of shards recovered
+        """
+        def recover(conn):
+            cutoff = time.time() - stale_after
+            failed = conn.execute(
+                "UPDATE tasks SET status = ?, error = 'worker stopped', finished_at = ? "
+                "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, time.time(), RUNNING, cutoff, self.max_attempts)
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE tasks SET status = ?, worker = NULL WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+            return failed + requeued
+
+        return self._transaction(recover)
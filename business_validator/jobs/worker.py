@@ -0,0 +1,282 @@
+"""
+Worker processes for sharded validations.
+
+    python -m business_validator.jobs worker [--processes 4] [--exit-when-idle 30]
+
+Start it once or many times, on one host or on several hosts that share the
+jobs database and the run store (DATA_DIR). Each process claims stage shards
+from the TaskQueue, runs them in a RunContext attached to the shard's run
+directory and writes the result to that run's shards/ folder. The process
+coordinating the run (ShardedStages, used by the job service when
+SHARDED_VALIDATION is on) merges the shards and assembles the CombinedAnalysis.
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import threading
+import multiprocessing
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sized
+
+from business_validator.config import (
+    JOB_POLL_SECONDS,
+    JOB_STALE_SECONDS,
+    SHARD_KEYWORDS_PER_TASK,
+    SHARD_POSTS_PER_TASK,
+    WORKER_PROCESSES
+)
+from business_validator.run_context import RunContext, RunCancelled
+from business_validator.stages import STAGES, StageStopped
+from business_validator.scrapers.transport import probe_account
+from business_validator.utils.environment import LOG_FORMAT
+from business_validator.jobs.tasks import TaskQueue
+from business_validator.jobs.store import SUCCEEDED, FAILED
+
+# Shards inserted per enqueue call, so a stage's input is never held in memory at once
+_ENQUEUE_BATCH = 50
+
+def _worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _write_result(task: Dict[str, Any], result: Dict[str, Any]) -> str:
+    """Write a shard result into the run store (write then rename, so readers never see a partial file)."""
+    shard_dir = os.path.join(task["run_dir"], "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+    path = os.path.join(shard_dir, f"{task['stage']}_{task['shard']:04d}.json")
+    tmp_path = f"{path}.{_worker_name().replace(':', '_')}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+    return path
+
+def execute_task(task: Dict[str, Any], queue: TaskQueue, run: Optional[RunContext] = None):
+    """Run one claimed shard and record its outcome in the queue.
+
+    Args:
+        task: Task returned by TaskQueue.claim
+        queue: The queue it was claimed from
+        run: The run's own context when the coordinating process runs the
+            shard itself; otherwise a context attached to the run directory
+    """
+    payload = task["payload"]
+    items: List[Any] = []
+    try:
+        if run is None:
+            shard_run = RunContext(payload["payload"]["business_idea"], payload["payload"]["config_overrides"],
+                                   run_dir=task["run_dir"])
+            with shard_run:
+                result = STAGES[task["stage"]](payload["items"], payload["payload"], shard_run, lambda *_: None, items)
+            # Counters travel with the result and are merged into the run's metrics by the coordinator
+            result["metrics"] = shard_run.metrics.snapshot()["counters"]
+        else:
+            result = STAGES[task["stage"]](payload["items"], payload["payload"], run, lambda *_: None, items)
+            result["metrics"] = {}
+        result["items"] = items
+        queue.complete(task["id"], _write_result(task, result))
+    except RunCancelled:
+        raise
+    except Exception as e:
+        status = queue.fail(task["id"], str(e))
+        logging.error(f"[WORKER] {task['stage']} shard {task['shard']} of {task['run_dir']} failed ({status}): {e}")
+
+def run_worker(
+    queue: Optional[TaskQueue] = None,
+    idle_exit: Optional[float] = None,
+    stop_event: Optional[threading.Event] = None
+) -> int:
+    """Claim and run shards until stopped.
+
+    Args:
+        queue: Task queue (default: the database at JOBS_DB_PATH)
+        idle_exit: Exit after this many seconds without work (default: run forever)
+        stop_event: Optional event that stops the loop
+
+    Returns:
+        Number of shards run
+    """
+    queue = queue or TaskQueue()
+    name = _worker_name()
+    stop_event = stop_event or threading.Event()
+    current: List[int] = []
+
+    def heartbeat():
+        while not stop_event.wait(JOB_POLL_SECONDS):
+            if current:
+                try:
+                    queue.heartbeat(list(current))
+                except Exception as e:
+                    logging.warning(f"[WORKER] Heartbeat failed: {e}")
+
+    threading.Thread(target=heartbeat, name="worker-heartbeat", daemon=True).start()
+    queue.recover_stale(JOB_STALE_SECONDS)
+    # Size this process's key and connection pools from the plan, as a validation does at start-up
+    probe_account()
+    logging.info(f"[WORKER] {name} waiting for shards in {queue.path}")
+
+    done = 0
+    idle_since = time.monotonic()
+    try:
+        while not stop_event.is_set():
+            task = queue.claim(name)
+            if task is None:
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    break
+                stop_event.wait(min(JOB_POLL_SECONDS, 0.2))
+                continue
+            current.append(task["id"])
+            try:
+                execute_task(task, queue)
+            finally:
+                current.remove(task["id"])
+            done += 1
+            idle_since = time.monotonic()
+    finally:
+        stop_event.set()
+    logging.info(f"[WORKER] {name} stopping after {done} shard(s)")
+    return done
+
+def _worker_process(idle_exit: Optional[float], db_path: Optional[str]):
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    run_worker(TaskQueue(db_path) if db_path else None, idle_exit)
+
+def start_workers(processes: int = WORKER_PROCESSES, idle_exit: Optional[float] = None, db_path: Optional[str] = None) -> List[multiprocessing.Process]:
+    """Start worker processes (spawned, so each has its own interpreter and connection pools)."""
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_worker_process, args=(idle_exit, db_path), name=f"validator-worker-{i}")
+        for i in range(max(1, processes))
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+class ShardedStages:
+    """Run stages as shards on worker processes through the task queue.
+
+    While it waits, the coordinating process runs shards of its own run too,
+    so a sharded validation still completes when no worker is running.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[TaskQueue] = None,
+        keywords_per_shard: int = SHARD_KEYWORDS_PER_TASK,
+        posts_per_shard: int = SHARD_POSTS_PER_TASK,
+        coordinator_helps: bool = True
+    ):
+        """
+        Args:
+            queue: Task queue (default: the database at JOBS_DB_PATH)
+            keywords_per_shard: Keywords per search shard
+            posts_per_shard: Posts per comment-thread or analysis shard
+            coordinator_helps: Also run shards in the coordinating process
+        """
+        self.queue = queue or TaskQueue()
+        self.keywords_per_shard = max(1, keywords_per_shard)
+        self.posts_per_shard = max(1, posts_per_shard)
+        self.coordinator_helps = coordinator_helps
+
+    def map(self, run: RunContext, stage_name: str, items: Sized, payload: Dict[str, Any],
+            progress: Optional[Callable[[int, List[Any]], None]] = None,
+            output: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Run a stage over all items as shards.
+
+        Shards are queued in batches as the items are read, progress is
+        reported as whole shards finish, and the shards' output items are
+        appended to `output` in shard order. If `progress` raises
+        StageStopped, the shards finished so far keep their output and the
+        others are dropped.
+
+        Returns:
+            The shard results without their items, in shard order
+        """
+        if not len(items):
+            return []
+        size = self.keywords_per_shard if stage_name.endswith("_search") else self.posts_per_shard
+        shards = _shards(items, size, payload)
+        task_ids: List[int] = []
+        shard_sizes: Dict[int, int] = {}
+        while True:
+            batch = list(islice(shards, _ENQUEUE_BATCH))
+            if not batch:
+                break
+            for task_id, shard in zip(self.queue.enqueue(run.data_dir, stage_name, batch, len(task_ids)), batch):
+                task_ids.append(task_id)
+                shard_sizes[task_id] = len(shard["items"])
+        run.logger.info(f"   Queued {len(task_ids)} {stage_name} shard(s)")
+
+        # Finished shards are only known by their result file until their items are moved to the output
+        finished: Dict[int, str] = {}
+        results: List[Dict[str, Any]] = []
+        done = 0
+        try:
+            while len(results) < len(task_ids):
+                run.check_cancelled()
+                task = None
+                if self.coordinator_helps:
+                    task = self.queue.claim(f"{_worker_name()}/coordinator", run.data_dir, stage_name)
+                    if task is not None:
+                        execute_task(task, self.queue, run)
+
+                for status in self.queue.stage_tasks(run.data_dir, stage_name):
+                    if status["id"] in finished:
+                        continue
+                    if status["status"] == SUCCEEDED:
+                        result = _read_result(status["result_path"])
+                        for name, value in result.get("metrics", {}).items():
+                            run.metrics.increment(name, value)
+                        finished[status["id"]] = status["result_path"]
+                        done += shard_sizes[status["id"]]
+                        if progress:
+                            try:
+                                progress(done, result["items"])
+                            except StageStopped:
+                                self._move_finished(task_ids, finished, results, output)
+                                raise
+                    elif status["status"] == FAILED:
+                        raise RuntimeError(f"{stage_name} shard {status['shard']} failed: {status['error']}")
+
+                # Move the items of finished shards to the output, in shard order
+                while len(results) < len(task_ids) and task_ids[len(results)] in finished:
+                    results.append(self._take_result(finished[task_ids[len(results)]], output))
+
+                if task is None and len(results) < len(task_ids):
+                    time.sleep(min(JOB_POLL_SECONDS, 0.2))
+                    self.queue.recover_stale(JOB_STALE_SECONDS)
+        finally:
+            # Shard results stay in the run store; the queue rows are no longer needed
+            self.queue.purge(run.data_dir, stage_name)
+
+        run.metrics.increment(f"shards.{stage_name}", len(task_ids))
+        return results
+
+    def _take_result(self, path: str, output: Optional[Any]) -> Dict[str, Any]:
+        """Move a finished shard's items to the output; returns the rest of its result."""
+        result = _read_result(path)
+        result.pop("metrics", None)
+        shard_items = result.pop("items")
+        if output is not None:
+            output.extend(shard_items)
+        return result
+
+    def _move_finished(self, task_ids: List[int], finished: Dict[int, str], results: List[Dict[str, Any]], output: Optional[Any]):
+        """Move every finished shard not yet in the output to it (a stopped stage skips unfinished ones)."""
+        for task_id in task_ids[len(results):]:
+            if task_id in finished:
+                results.append(self._take_result(finished[task_id], output))
+
+def _shards(items: Sized, size: int, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Split items into shard payloads as they are read."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield {"items": chunk, "payload": payload}
+
+def _read_result(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
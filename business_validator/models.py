@@ -3,7 +3,7 @@ Pydantic models for the business validator package.
 """
 
 from typing import List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 class KeywordModel(BaseModel):
     """Model for keyword generation results."""
@@ -28,6 +28,24 @@ class RedditPostAnalysis(BaseModel):
     engagement_score: int  # 1-10 based on upvotes and comments
     subreddit_context: str  # What the subreddit tells us about the audience
 
+class TriageVerdict(BaseModel):
+    """Model for the triage verdict on one post of a batch."""
+    id: int  # 1-based position of the post in the batch
+    relevant: bool
+    confidence: float  # 0.0-1.0
+
+    @validator('relevant', pre=True)
+    def _strict_flag(cls, value):
+        # Only a real boolean or "true"/"false"; anything else is a malformed verdict, not a guess
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        raise ValueError(f"expected true or false, got {value!r}")
+
+class TriageBatch(BaseModel):
+    """Model for the triage verdicts on a batch of posts."""
+    verdicts: List[TriageVerdict]
 
 class PlatformInsight(BaseModel):
     """Model for platform-specific insights."""
@@ -0,0 +1,174 @@
+"""
+Offline re-parse of archived raw pages.
+
+Re-runs the current parsers over the pages a run archived (see
+utils/archive.py) and regenerates its 02_/03_/04_ artifacts without any
+network calls, e.g. after a parser fix:
+
+    python -m business_validator.reparse validation_data/<run_id> [--workers N]
+
+Parsing runs in a process pool. Paging and deduplication are replayed with
+the run's keywords; the posts that had comments fetched are taken from the
+run's existing 04_ files, and comments or article summaries that were served
+from the in-memory cache (so never archived) are carried over from them.
+"""
+
+import os
+import json
+import logging
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from business_validator.config import (
+    REPARSE_WORKERS,
+    MAX_PAGES_PER_KEYWORD_HN,
+    MAX_PAGES_PER_KEYWORD_REDDIT,
+    MAX_COMMENTS_PER_POST
+)
+from business_validator.scrapers.hackernews import parse_hn_search_json, parse_hn_markdown, parse_hn_item_json
+from business_validator.scrapers.page_policy import AdaptivePagePolicy, post_key
+from business_validator.scrapers.reddit import (
+    parse_reddit_search_json,
+    parse_reddit_search_markdown,
+    parse_reddit_comments_json,
+    _parsed_comments_only
+)
+from business_validator.utils.archive import read_index, load_body
+from business_validator.utils.environment import save_checkpoint, load_checkpoint
+from business_validator.utils.relevance import build_relevance_terms
+
+# Parser for each (endpoint, fetch tier) the scrapers archive
+PARSERS = {
+    ("hn_search", "api"): parse_hn_search_json,
+    ("hn_search", "rendered"): parse_hn_markdown,
+    ("hn_comments", "api"): parse_hn_item_json,
+    ("reddit_search", "json"): parse_reddit_search_json,
+    ("reddit_search", "markdown"): parse_reddit_search_markdown,
+    ("reddit_search", "rendered"): parse_reddit_search_markdown,
+    ("reddit_comments", "json"): parse_reddit_comments_json,
+    ("reddit_comments", "markdown"): _parsed_comments_only,
+    ("reddit_comments", "rendered"): _parsed_comments_only
+}
+
+def _parse_entry(job: Tuple[str, Dict]) -> Optional[List[dict]]:
+    """Parse one archived page (runs in a worker process); None if it fails."""
+    run_dir, entry = job
+    parse = PARSERS.get((entry["endpoint"], entry["tier"]))
+    if parse is None:
+        return None
+    try:
+        return parse(load_body(run_dir, entry))
+    except Exception as e:
+        logging.warning(f"Could not re-parse {entry['endpoint']} page {entry['url']}: {e}")
+        return None
+
+def _request_key(entry: Dict) -> str:
+    """Group the tiers fetched for the same page or comment thread."""
+    return json.dumps([entry["endpoint"], entry.get("context", {})], sort_keys=True)
+
+def _resolve(entries: List[Dict], parsed: List[Optional[List[dict]]]) -> "OrderedDict[str, Tuple[Dict, List[dict]]]":
+    """Pick, per request, the first tier that yields items (as fetch_tiered does)."""
+    results = OrderedDict()
+    for entry, items in zip(entries, parsed):
+        key = _request_key(entry)
+        if key not in results or (items and not results[key][1]):
+            results[key] = (entry, items or [])
+    return results
+
+def _replay_search(results, endpoint: str, platform: str, terms, max_pages: int) -> Tuple[List[dict], AdaptivePagePolicy]:
+    """Deduplicate the re-parsed search pages in fetch order."""
+    policy = AdaptivePagePolicy(platform, terms, max_pages)
+    posts = []
+    for entry, items in results.values():
+        if entry["endpoint"] == endpoint:
+            context = entry.get("context", {})
+            new_posts, _ = policy.evaluate_page(context.get("keyword", ""), context.get("page", 0), items)
+            posts.extend(new_posts)
+    return posts, policy
+
+def _rebuild_comments(results, endpoint: str, previous: List[dict], posts: List[dict]) -> List[dict]:
+    """Attach re-parsed comment threads to the posts that had comments fetched."""
+    threads = {
+        post_key({'url': entry.get("context", {}).get("post_url", "")}): items[:MAX_COMMENTS_PER_POST]
+        for entry, items in results.values() if entry["endpoint"] == endpoint
+    }
+    by_key = {post_key(post): post for post in posts}
+    if not previous:
+        previous = [by_key[key] for key in threads if key in by_key]
+
+    rebuilt = []
+    for old_post in previous:
+        key = post_key(old_post)
+        post = dict(by_key.get(key, old_post))
+        post['comments_data'] = threads.get(key, old_post.get('comments_data', []))
+        if old_post.get('article_summary'):
+            post['article_summary'] = old_post['article_summary']
+        rebuilt.append(post)
+    return rebuilt
+
+def reparse_run(run_dir: str, output_dir: Optional[str] = None, workers: int = REPARSE_WORKERS) -> Dict[str, int]:
+    """Regenerate a run's 02_/03_/04_ artifacts from its archived pages.
+
+    Args:
+        run_dir: The run's data directory (holds raw_index.jsonl)
+        output_dir: Where to write the artifacts (default: run_dir)
+        workers: Processes used for parsing
+
+    Returns:
+        Counts of archived pages and regenerated records
+    """
+    output_dir = output_dir or run_dir
+    os.makedirs(output_dir, exist_ok=True)
+    entries = list(read_index(run_dir))
+    if not entries:
+        raise FileNotFoundError(f"No archived pages found in {run_dir}")
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        parsed = list(executor.map(_parse_entry, [(run_dir, entry) for entry in entries], chunksize=16))
+    results = _resolve(entries, parsed)
+
+    keywords_data = load_checkpoint("01_keywords.json", run_dir) or {}
+    terms = build_relevance_terms(keywords_data.get("business_idea", ""), keywords_data.get("keywords", []))
+
+    hn_posts, hn_policy = _replay_search(results, "hn_search", "HackerNews", terms, MAX_PAGES_PER_KEYWORD_HN)
+    reddit_posts, reddit_policy = _replay_search(results, "reddit_search", "Reddit", terms, MAX_PAGES_PER_KEYWORD_REDDIT)
+    save_checkpoint({"hn_posts": hn_posts}, "02_hn_posts_complete.json", output_dir)
+    save_checkpoint(hn_policy.summary(), "02_hn_page_policy.json", output_dir)
+    save_checkpoint({"reddit_posts": reddit_posts}, "03_reddit_posts_complete.json", output_dir)
+    save_checkpoint(reddit_policy.summary(), "03_reddit_page_policy.json", output_dir)
+
+    previous_hn = (load_checkpoint("04_hn_comments_complete.json", run_dir) or {}).get("hn_posts_with_comments", [])
+    previous_reddit = (load_checkpoint("04_reddit_comments_complete.json", run_dir) or {}).get("reddit_posts_with_comments", [])
+    hn_with_comments = _rebuild_comments(results, "hn_comments", previous_hn, hn_posts)
+    reddit_with_comments = _rebuild_comments(results, "reddit_comments", previous_reddit, reddit_posts)
+    save_checkpoint({"hn_posts_with_comments": hn_with_comments}, "04_hn_comments_complete.json", output_dir)
+    save_checkpoint({"reddit_posts_with_comments": reddit_with_comments}, "04_reddit_comments_complete.json", output_dir)
+
+    return {
+        "archived_pages": len(entries),
+        "failed_pages": sum(1 for items in parsed if items is None),
+        "hn_posts": len(hn_posts),
+        "reddit_posts": len(reddit_posts),
+        "hn_posts_with_comments": len(hn_with_comments),
+        "reddit_posts_with_comments": len(reddit_with_comments)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse a run's archived pages and regenerate its 02_/03_/04_ artifacts")
+    parser.add_argument("run_dirs", nargs="+", help="Run data directories (validation_data/<run_id>)")
+    parser.add_argument("--output", help="Write artifacts here instead of the run directory (single run only)")
+    parser.add_argument("--workers", type=int, default=REPARSE_WORKERS, help="Parser processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.output and len(args.run_dirs) > 1:
+        parser.error("--output can only be used with a single run directory")
+
+    for run_dir in args.run_dirs:
+        stats = reparse_run(run_dir, args.output, args.workers)
+        print(f"{run_dir}: {json.dumps(stats)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Explicit per-run state, so several validations can run in one process.
+
+A RunContext carries everything that belongs to one validation: its config
+overrides, its logger and log file, its checkpoint store, metrics, progress
+events, running analysis summaries and raw response archive. Process-wide clients (key pools, the HTTP session, comment
+and article caches) are shared by every run and referenced from the context.
+
+    run = RunContext("AI bookkeeping for freelancers", {"MAX_PAGES_PER_KEYWORD_HN": 1})
+    analysis = validate_business_idea(run.business_idea, run=run)
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import business_validator.config as config
+from business_validator.utils.archive import ResponseArchive
+from business_validator.utils.context import get_current_run, set_current_run, reset_current_run
+from business_validator.utils.environment import setup_environment, setup_environment_logging, CheckpointStore, LOG_FORMAT
+from business_validator.utils.events import EventBus, EVENTS_FILE
+from business_validator.utils.metrics import Metrics
+from business_validator.scrapers.transport import scraperapi_pool, get_session
+from business_validator.analyzers.llm_client import google_pool
+from business_validator.analyzers.summary import AnalysisSummary
+
+class RunCancelled(Exception):
+    """Raised inside a run whose cancellation was requested."""
+
+class RunConfig:
+    """Config for one run: overrides on top of the defaults in config.py.
+
+    Overrides apply to settings read while the run executes (paging depth,
+    comment limits, models, cascade and enrichment switches, ...). Settings
+    consumed at import time, such as API keys and endpoints, are process-wide.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Any]] = None):
+        """
+        Raises:
+            ValueError: If overrides is not a dict or names an unknown setting
+        """
+        if overrides is not None and not isinstance(overrides, dict):
+            raise ValueError("Config overrides must be an object mapping setting names to values")
+        overrides = dict(overrides or {})
+        unknown = [str(name) for name in overrides
+                   if not isinstance(name, str) or not name.isupper() or not hasattr(config, name)]
+        if unknown:
+            raise ValueError(f"Unknown config setting(s): {', '.join(sorted(unknown))}")
+        self._overrides = overrides
+
+    def __getattr__(self, name: str) -> Any:
+        overrides = self.__dict__.get("_overrides", {})
+        if name in overrides:
+            return overrides[name]
+        return getattr(config, name)
+
+    def overrides(self) -> Dict[str, Any]:
+        """Return a copy of the overridden settings."""
+        return dict(self._overrides)
+
+class _RunLogFilter(logging.Filter):
+    """Pass records logged by this run (in its context or through its logger)."""
+
+    def __init__(self, run: "RunContext"):
+        super().__init__()
+        self.run = run
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return get_current_run() is self.run or record.name == self.run.logger.name
+
+class RunContext:
+    """State of one validation run.
+
+    Use it as a context manager around the run: entering opens the log file
+    and archive and makes the run current for this thread, so RunLocal handles
+    (metrics, the response archive) and current_config() resolve to it.
+    """
+
+    def __init__(
+        self,
+        business_idea: str,
+        config_overrides: Optional[Dict[str, Any]] = None,
+        run_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            business_idea: The business idea being validated
+            config_overrides: Config settings to change for this run only
+            run_dir: Attach to an existing run directory instead of creating
+                one (e.g. a worker process executing one shard of a run)
+        """
+        self.business_idea = business_idea
+        self.config = RunConfig(config_overrides)
+        self.attached = run_dir is not None
+
+        if self.attached:
+            setup_environment_logging()
+            self.run_id = os.path.basename(os.path.normpath(run_dir))
+            self.data_dir = run_dir
+            self.log_file = os.path.join(config.LOG_DIR, f"{self.run_id}.log")
+        else:
+            env = setup_environment(business_idea)
+            self.run_id = env["run_id"]
+            self.data_dir = env["data_dir"]
+            self.log_file = env["log_file"]
+
+        self.logger = logging.getLogger(f"business_validator.run.{self.run_id}")
+        # The run's progress is logged at INFO whatever level the host application gives the root logger
+        self.logger.setLevel(logging.INFO)
+        self.checkpoints = CheckpointStore(self.data_dir)
+        self.metrics = Metrics()
+        self.archive = ResponseArchive()
+        # Shards run by worker processes report progress through the coordinating run
+        event_file = os.path.join(self.data_dir, EVENTS_FILE) if self.config.EVENT_LOG_ENABLED and not self.attached else None
+        self.events = EventBus(self.run_id, event_file)
+        # Updated as each post analysis completes; readable at any time
+        self.summaries = {platform: AnalysisSummary(platform) for platform in ("HackerNews", "Reddit")}
+
+        # Shared by every run in the process
+        self.scraperapi_pool = scraperapi_pool
+        self.google_pool = google_pool
+        self.session = get_session()
+
+        self._cancelled = threading.Event()
+        self._handler: Optional[logging.Handler] = None
+        self._tokens = []
+
+    def cancel(self):
+        """Ask the run to stop; it does so at its next cancellation check."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        """Raise RunCancelled if cancellation was requested."""
+        if self._cancelled.is_set():
+            raise RunCancelled(f"Run {self.run_id} was cancelled")
+
+    def open(self) -> "RunContext":
+        """Start the run's log file and response archive (idempotent)."""
+        if self._handler is None:
+            self._handler = logging.FileHandler(self.log_file)
+            self._handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            self._handler.setLevel(logging.INFO)
+            self._handler.addFilter(_RunLogFilter(self))
+            logging.getLogger().addHandler(self._handler)
+            self.archive.start(self.data_dir)
+            if self.attached:
+                return self
+            self.logger.info(f"Starting validation for business idea: {self.business_idea}")
+            self.logger.info(f"Run ID: {self.run_id}")
+            if self.config.overrides():
+                self.logger.info(f"Config overrides: {self.config.overrides()}")
+        return self
+
+    def close(self):
+        """Stop archiving and detach the run's log file."""
+        self.archive.stop()
+        if self._handler is not None:
+            logging.getLogger().removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    def __enter__(self) -> "RunContext":
+        self.open()
+        self._tokens.append(set_current_run(self))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        reset_current_run(self._tokens.pop())
+        if not self._tokens:
+            self.close()
@@ -2,19 +2,43 @@
 Scraper modules for fetching data from various platforms.
 """
 
-from business_validator.scrapers.hackernews import scrape_hackernews, parse_hn_markdown
+from business_validator.scrapers.hackernews import (
+    scrape_hackernews,
+    parse_hn_markdown,
+    parse_hn_search_json,
+    scrape_hn_post_comments,
+    parse_hn_item_json,
+    flatten_hn_comments
+)
 from business_validator.scrapers.reddit import (
     scrape_reddit_search, 
     parse_reddit_search_markdown,
+    parse_reddit_search_json,
     scrape_reddit_post_comments,
-    parse_reddit_comments_markdown
+    parse_reddit_comments_markdown,
+    parse_reddit_comments_json
 )
+from business_validator.scrapers.page_policy import AdaptivePagePolicy
+from business_validator.scrapers.articles import enrich_posts, enrich_post_stream
+from business_validator.scrapers.transport import probe_account, FetchTier, fetch_tiered
 
 __all__ = [
     'scrape_hackernews',
     'parse_hn_markdown',
+    'parse_hn_search_json',
+    'scrape_hn_post_comments',
+    'parse_hn_item_json',
+    'flatten_hn_comments',
     'scrape_reddit_search',
     'parse_reddit_search_markdown',
+    'parse_reddit_search_json',
     'scrape_reddit_post_comments',
-    'parse_reddit_comments_markdown'
+    'parse_reddit_comments_markdown',
+    'parse_reddit_comments_json',
+    'AdaptivePagePolicy',
+    'enrich_posts',
+    'enrich_post_stream',
+    'probe_account',
+    'FetchTier',
+    'fetch_tiered'
 ]
@@ -0,0 +1,236 @@
+"""
+Linked-article enrichment for HackerNews stories.
+
+Stories often link to an external article or a Show HN landing page. This
+module downloads those pages concurrently (streamed and capped at
+ARTICLE_MAX_BYTES), extracts the main text with lxml and attaches a trimmed
+summary to the post as 'article_summary' before analysis.
+"""
+
+import re
+import html
+import logging
+import threading
+from collections import defaultdict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from business_validator.config import (
+    ARTICLE_CONCURRENCY,
+    ARTICLE_PER_DOMAIN_CONCURRENCY,
+    ARTICLE_MAX_BYTES,
+    ARTICLE_TIMEOUT_SECONDS,
+    ARTICLE_SUMMARY_CHARS,
+    ARTICLE_ENRICHMENT_BUDGET,
+    COMMENT_CACHE_SIZE,
+    COMMENT_CACHE_TTL_SECONDS
+)
+from business_validator.scrapers.transport import get_session
+from business_validator.utils.cache import BoundedCache
+from business_validator.utils.context import bind_context
+from business_validator.utils.metrics import metrics
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Links that are discussions rather than articles, or not worth downloading
+_SKIP_HOSTS = ("news.ycombinator.com", "reddit.com", "twitter.com", "x.com", "youtube.com", "youtu.be")
+_SKIP_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".gif", ".mp4", ".zip")
+_BOILERPLATE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SCRIPT_RE = re.compile(r"<(script|style|noscript)\b.*?</\1>", re.IGNORECASE | re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_article_cache = BoundedCache(COMMENT_CACHE_SIZE, COMMENT_CACHE_TTL_SECONDS)
+_domain_semaphores: Dict[str, threading.BoundedSemaphore] = defaultdict(
+    lambda: threading.BoundedSemaphore(ARTICLE_PER_DOMAIN_CONCURRENCY)
+)
+_semaphores_lock = threading.Lock()
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def is_article_url(url: str) -> bool:
+    """True if a post URL points at an external page worth reading."""
+    parsed = urlparse(url or "")
+    if parsed.scheme not in ("http", "https"):
+        return False
+    host = _host(url)
+    if any(host == skip or host.endswith("." + skip) for skip in _SKIP_HOSTS):
+        return False
+    return not parsed.path.lower().endswith(_SKIP_EXTENSIONS)
+
+def _domain_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _semaphores_lock:
+        return _domain_semaphores[host]
+
+def download_capped(url: str, max_bytes: int = ARTICLE_MAX_BYTES) -> Optional[bytes]:
+    """Stream an HTML page, stopping once max_bytes have been read.
+
+    Args:
+        url: The page URL
+        max_bytes: Hard cap on bytes read from the response body
+
+    Returns:
+        The (possibly truncated) body, or None if the page is not HTML
+    """
+    with _domain_semaphore(_host(url)):
+        response = get_session().get(
+            url,
+            stream=True,
+            timeout=(5, ARTICLE_TIMEOUT_SECONDS),
+            headers={"User-Agent": "Mozilla/5.0 (compatible; business-validator)"}
+        )
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if "html" not in content_type and "text" not in content_type:
+                return None
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=16384):
+                body.extend(chunk)
+                if len(body) >= max_bytes:
+                    metrics.increment("articles.truncated")
+                    break
+            metrics.record_value("articles.bytes", min(len(body), max_bytes))
+            return bytes(body[:max_bytes])
+        finally:
+            # Closing without reading the rest drops the connection instead of draining it
+            response.close()
+
+def extract_main_text(page: bytes) -> str:
+    """Extract the main readable text of an HTML page.
+
+    Uses the <article>/<main> element when present, otherwise the element
+    holding the most paragraph text. Falls back to tag stripping without lxml.
+    """
+    if not LXML_AVAILABLE:
+        text = _SCRIPT_RE.sub(" ", page.decode("utf-8", errors="ignore"))
+        return _WHITESPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+    try:
+        tree = lxml.html.fromstring(page)
+    except Exception:
+        return ""
+    for element in list(tree.iter(*_BOILERPLATE_TAGS)):
+        element.drop_tree()
+
+    containers = tree.xpath("//article") or tree.xpath("//main")
+    if not containers:
+        # Pick the parent whose paragraphs carry the most text
+        scores = defaultdict(int)
+        for paragraph in tree.iter("p"):
+            parent = paragraph.getparent()
+            if parent is not None:
+                scores[parent] += len(paragraph.text_content())
+        containers = [max(scores, key=scores.get)] if scores else [tree]
+
+    paragraphs = [p.text_content() for p in containers[0].iter("p", "h1", "h2", "h3", "li")]
+    if not paragraphs:
+        paragraphs = [containers[0].text_content()]
+    lines = (_WHITESPACE_RE.sub(" ", p).strip() for p in paragraphs)
+    return "\n".join(line for line in lines if len(line) > 20)
+
+def summarize_text(text: str, max_chars: int = ARTICLE_SUMMARY_CHARS) -> str:
+    """Trim extracted text to its leading paragraphs within max_chars."""
+    summary = []
+    used = 0
+    for paragraph in text.split("\n"):
+        if used + len(paragraph) > max_chars:
+            if not summary:
+                summary.append(paragraph[:max_chars].rstrip() + "...")
+            break
+        summary.append(paragraph)
+        used += len(paragraph) + 1
+    return " ".join(summary)
+
+def fetch_article_summary(url: str) -> Optional[str]:
+    """Download a linked page and return its trimmed main-text summary (cached)."""
+    cached = _article_cache.get(url)
+    if cached is not None:
+        metrics.increment("articles.cache_hits")
+        return cached or None
+
+    try:
+        page = download_capped(url)
+        summary = summarize_text(extract_main_text(page)) if page else ""
+    except Exception as e:
+        logging.info(f"Could not enrich {url}: {e}")
+        return None
+
+    # Cache non-HTML and empty pages too, so they are not downloaded again
+    _article_cache.set(url, summary)
+    return summary or None
+
+def enrich_posts(posts: List[dict], budget: int = ARTICLE_ENRICHMENT_BUDGET) -> Dict[str, int]:
+    """Attach 'article_summary' to posts that link to external articles.
+
+    Args:
+        posts: Posts in priority order (e.g. ranked by relevance)
+        budget: Maximum pages downloaded in this run; cache hits are free
+
+    Returns:
+        Enrichment statistics
+    """
+    candidates: List[Tuple[dict, str]] = [(p, p['url']) for p in posts if is_article_url(p.get('url', ''))]
+    cached = [(p, url) for p, url in candidates if _article_cache.get(url) is not None]
+    to_download = [(p, url) for p, url in candidates if _article_cache.get(url) is None][:max(0, budget)]
+    selected = cached + to_download
+
+    workers = max(1, min(len(selected), ARTICLE_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        summaries = executor.map(bind_context(lambda item: fetch_article_summary(item[1])), selected)
+        for (post, _), summary in zip(selected, summaries):
+            if summary:
+                post['article_summary'] = summary
+
+    stats = {
+        "candidates": len(candidates),
+        "downloaded": len(to_download),
+        "cache_hits": len(cached),
+        "skipped_over_budget": len(candidates) - len(selected),
+        "enriched": sum(1 for post, _ in selected if post.get('article_summary'))
+    }
+    metrics.increment("articles.downloads", len(to_download))
+    return stats
+
+def enrich_post_stream(
+    posts: Iterable[dict],
+    output: Any,
+    budget: int = ARTICLE_ENRICHMENT_BUDGET,
+    chunk_size: int = 100
+) -> Dict[str, int]:
+    """Enrich posts chunk by chunk and append them to `output` (e.g. a SpillFile).
+
+    Gives the same result as enrich_posts on the whole list (cache hits are
+    free, downloads go to the first posts until the budget is spent) while
+    holding only one chunk of posts in memory.
+
+    Args:
+        posts: Posts in priority order
+        output: Receives every post, enriched or not, in the same order
+        budget: Maximum pages downloaded in this run; cache hits are free
+        chunk_size: Posts enriched at once
+
+    Returns:
+        Enrichment statistics, summed over the chunks
+    """
+    totals = {"candidates": 0, "downloaded": 0, "cache_hits": 0, "skipped_over_budget": 0, "enriched": 0}
+    posts = iter(posts)
+    while True:
+        chunk = list(islice(posts, chunk_size))
+        if not chunk:
+            break
+        stats = enrich_posts(chunk, budget - totals["downloaded"])
+        for name, value in stats.items():
+            totals[name] += value
+        for post in chunk:
+            output.append(post)
+    return totals
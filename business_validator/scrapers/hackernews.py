@@ -2,57 +2,156 @@
 HackerNews scraping functionality.
 """
 
-import requests
+import re
+import json
+import html
 import time
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from urllib.parse import quote_plus
 
-from business_validator.config import SCRAPERAPI_KEY, HN_DELAY
+from business_validator.config import (
+    HN_API_BASE,
+    HN_DELAY,
+    COMMENT_CACHE_SIZE,
+    COMMENT_CACHE_TTL_SECONDS,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL_SECONDS
+)
+from business_validator.scrapers.markdown import clean_title
+from business_validator.scrapers.transport import FetchTier, fetch_tiered, direct_get, archive_cached_pages
+from business_validator.utils.archive import response_archive
+from business_validator.utils.cache import BoundedCache
+from business_validator.utils.context import current_config
+from business_validator.utils.metrics import metrics
+from business_validator.utils.relevance import search_key
+
+_ITEM_ID_RE = re.compile(r"news\.ycombinator\.com/item\?id=(\d+)")
+# Starts with a literal "\n" (the parser prepends one) so the scan can skip between lines
+_HN_RESULTS_RE = re.compile(r"\n[\d,]+ results? \(")
+# Every token starts with "[" so the scan can skip straight between candidates.
+# A story token is a title link at the start of a line (not an image and not a
+# "N points" meta link), optionally followed on the same line by the "(domain)"
+# link to the story's own URL, and usually by its meta line, which is consumed
+# in the same match; stray meta links are separate tokens
+_HN_TOKEN_RE = re.compile(
+    r"\[(?:"
+    r"(?<![^\n]\[)(?!!\[)(?!\d+ points?\])(?P<title>[^\]\n\\]*(?:\\.[^\]\n\\]*)*)\]\((?P<item_url>https?://[^\s)]+)\)"
+    r"(?:[ \t]*\[\([^\]\n]*\)\]\((?P<link>https?://[^\s)]+)\))?"
+    r"(?:\s*\[(?P<story_points>\d+) points?\](?:(?:[^\[\n]*+\[(?!\d+ comments?\]))*+[^\[\n]*+\[(?P<story_comments>\d+) comments?\])?)?(?P<story>)"
+    r"|(?P<points_n>\d+) points?\](?P<points>)"
+    r"|(?P<comments_n>\d+) comments?\](?P<comments>)"
+    r")"
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_PARAGRAPH_RE = re.compile(r"<p>", re.IGNORECASE)
+
+_comment_cache = BoundedCache(COMMENT_CACHE_SIZE, COMMENT_CACHE_TTL_SECONDS)
+_search_cache = BoundedCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS)
 
 def scrape_hackernews(keyword: str, page: int = 0) -> dict:
     """Scrape HackerNews search results for a keyword.
     
+    The public Algolia search API is tried first; the rendered search page
+    through ScraperAPI is only used if the API yields nothing. Pages are
+    cached per normalized keyword, so concurrent runs (e.g. a batch of ideas)
+    sharing a keyword fetch each page once.
+    Runs served from the cache still record the pages in their own archive.
+    
     Args:
         keyword: The search keyword
         page: The page number to scrape (0-indexed)
         
     Returns:
-        Dictionary containing the scraped posts
+        Dictionary containing the scraped posts and whether more pages exist
     """
+    metrics.increment("hn.searches")
+    fetched = []
+    
+    def fetch():
+        fetched.append(True)
+        return _fetch_hn_search(keyword, page)
+    
+    results = _search_cache.get_or_compute(
+        (search_key(keyword), page),
+        fetch,
+        should_cache=lambda results: bool(results['posts'])
+    )
+    if not fetched:
+        # Fetched by an earlier run; this run's archive still needs the pages
+        archive_cached_pages("hn_search", results.get('pages', []), {'keyword': keyword, 'page': page})
+    response = {name: value for name, value in results.items() if name != 'pages'}
+    # Callers annotate the posts, so each gets its own copies
+    response['posts'] = [dict(post) for post in results['posts']]
+    return response
+
+def _fetch_hn_search(keyword: str, page: int) -> dict:
+    """Fetch and parse one HN search page."""
+    metrics.increment("hn.search_fetches")
     # URL encode the keyword to handle spaces and special characters
     encoded_keyword = quote_plus(keyword)
     
     # Build the full HackerNews URL with all parameters
     hn_url = f"https://hn.algolia.com/?dateRange=all&page={page}&prefix=true&query={encoded_keyword}&sort=byPopularity&type=story"
+    api_url = f"{HN_API_BASE}/search?query={encoded_keyword}&tags=story&page={page}"
     
-    # ScraperAPI payload with proper parameters
-    payload = {
-        'api_key': SCRAPERAPI_KEY,
-        'url': hn_url,
-        'wait_for_selector': '.SearchResults_container',
-        'device_type': 'desktop',
-        'render': 'true',
-        'output_format': 'markdown'
-    }
+    # Set by the JSON parser; the rendered page does not tell us
+    paging = {'has_more': True}
+    
+    tiers = [
+        FetchTier('api', api_url, lambda text: parse_hn_search_json(text, paging), empty_is_final=True),
+        # ScraperAPI payload with proper parameters
+        FetchTier('rendered', hn_url, parse_hn_markdown, payload={
+            'wait_for_selector': '.SearchResults_container',
+            'device_type': 'desktop',
+            'render': 'true',
+            'output_format': 'markdown'
+        })
+    ]
     
     try:
-        response = requests.get('https://api.scraperapi.com/', params=payload, timeout=30)
-        response.raise_for_status()
-        
-        # Parse the markdown response
-        markdown_content = response.text
-        posts = parse_hn_markdown(markdown_content)
-        
-        return {'posts': posts}
+        pages = []
+        posts, tier = fetch_tiered("hn_search", tiers, context={'keyword': keyword, 'page': page}, pages=pages)
+        return {'posts': posts, 'has_more': paging['has_more'] if tier == 'api' else True, 'pages': pages}
         
     except Exception as e:
         logging.error(f"Error scraping HN for keyword '{keyword}' page {page}: {e}")
         return {'posts': []}
 
+def parse_hn_search_json(json_content: str, paging: Optional[dict] = None) -> List[dict]:
+    """Parse an Algolia HN search API response into posts.
+    
+    Args:
+        json_content: The JSON response body
+        paging: Optional dictionary that receives 'has_more'
+        
+    Returns:
+        List of dictionaries containing post information
+    """
+    data = json.loads(json_content)
+    posts = []
+    for hit in data.get('hits', []):
+        if not hit.get('title'):
+            continue
+        posts.append({
+            'title': hit['title'],
+            'url': hit.get('url') or f"https://news.ycombinator.com/item?id={hit['objectID']}",
+            'points': hit.get('points') or 0,
+            'comments': hit.get('num_comments') or 0,
+            'hn_id': hit['objectID']
+        })
+    if paging is not None:
+        paging['has_more'] = data.get('page', 0) + 1 < data.get('nbPages', 0)
+    return posts
+
 def parse_hn_markdown(markdown_content: str) -> List[dict]:
     """Parse HackerNews markdown content to extract posts.
     
+    A single pass over the results container: one precompiled pattern
+    tokenizes story titles together with their "N points" / "N comments"
+    meta line, and a small state machine assigns any stray meta link to the
+    current story.
+    
     Args:
         markdown_content: The markdown content from ScraperAPI
         
@@ -60,56 +159,114 @@ def parse_hn_markdown(markdown_content: str) -> List[dict]:
         List of dictionaries containing post information
     """
     posts = []
-    lines = markdown_content.split('\n')
+    current_post = None
     
-    current_post = {}
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines
-        if not line:
-            continue
-            
-        # Look for post titles (usually start with [title](url) format)
-        if line.startswith('[') and '](http' in line:
-            # Save previous post if exists
-            if current_post.get('title'):
-                posts.append(current_post.copy())
-                current_post = {}
-            
-            # Extract title and URL
-            title_end = line.find('](http')
-            if title_end > 1:
-                title = line[1:title_end]
-                url_start = line.find('](') + 2
-                url_end = line.find(')', url_start)
-                url = line[url_start:url_end] if url_end > url_start else ''
-                
-                current_post['title'] = title
-                current_post['url'] = url
-                current_post['points'] = 0
-                current_post['comments'] = 0
-        
-        # Look for points and comments (usually in format like "X points|user|time ago|Y comments")
-        elif 'points' in line and 'ago' in line:
-            parts = line.split('|')
-            for part in parts:
-                part = part.strip()
-                if 'points' in part:
-                    try:
-                        points = int(part.split()[0])
-                        current_post['points'] = points
-                    except:
-                        pass
-                elif 'comment' in part:
-                    try:
-                        comments = int(part.split()[0])
-                        current_post['comments'] = comments
-                    except:
-                        pass
+    # Jump straight to the results container (after the "N results" line)
+    markdown_content = "\n" + markdown_content
+    container = _HN_RESULTS_RE.search(markdown_content)
+    start = container.end() if container else 0
+    
+    for token in _HN_TOKEN_RE.finditer(markdown_content, start):
+        kind = token.lastgroup
+        if kind == 'story':
+            if current_post:
+                posts.append(current_post)
+            item_url = token.group('item_url')
+            current_post = {
+                'title': clean_title(token.group('title')),
+                'url': token.group('link') or item_url,
+                'points': int(token.group('story_points') or 0),
+                'comments': int(token.group('story_comments') or 0)
+            }
+            item_id = _ITEM_ID_RE.search(item_url)
+            if item_id:
+                current_post['hn_id'] = item_id.group(1)
+        elif current_post is not None:
+            current_post[kind] = int(token.group(kind + '_n'))
     
     # Don't forget the last post
-    if current_post.get('title'):
+    if current_post:
         posts.append(current_post)
     
-    return posts
+    return [post for post in posts if post['title']]
+
+def hn_item_id(post: dict) -> Optional[str]:
+    """Return the HN story id of a post, from the search API or an item URL."""
+    if post.get('hn_id'):
+        return str(post['hn_id'])
+    match = _ITEM_ID_RE.search(post.get('url', ''))
+    return match.group(1) if match else None
+
+def _comment_text(comment_html: str) -> str:
+    """Convert Algolia comment HTML to plain text."""
+    text = _PARAGRAPH_RE.sub("\n", comment_html or "")
+    return html.unescape(_TAG_RE.sub("", text)).strip()
+
+def flatten_hn_comments(item: dict, limit: Optional[int] = None) -> List[dict]:
+    """Flatten an Algolia item tree and keep the top comments by depth and position.
+    
+    Top-level comments come first in thread order, then their replies, so the
+    most prominent parts of the discussion are kept.
+    
+    Args:
+        item: The story item with nested 'children'
+        limit: Maximum number of comments to keep (default: the run's MAX_COMMENTS_PER_POST)
+        
+    Returns:
+        List of dictionaries containing comment information
+    """
+    flattened = []
+    # Depth-first walk, so position follows thread order
+    stack = [(child, 1) for child in reversed(item.get('children') or [])]
+    while stack:
+        node, depth = stack.pop()
+        text = _comment_text(node.get('text'))
+        if node.get('type') == 'comment' and text:
+            flattened.append({
+                'text': text,
+                'author': node.get('author') or "",
+                'depth': depth,
+                'position': len(flattened),
+                'upvotes': node.get('points') or 0
+            })
+        stack.extend((child, depth + 1) for child in reversed(node.get('children') or []))
+    
+    flattened.sort(key=lambda c: (c['depth'], c['position']))
+    return flattened[:current_config().MAX_COMMENTS_PER_POST if limit is None else limit]
+
+def parse_hn_item_json(json_content: str) -> List[dict]:
+    """Parse an Algolia items API response into the story's top comments."""
+    return flatten_hn_comments(json.loads(json_content))
+
+def scrape_hn_post_comments(post: dict) -> List[dict]:
+    """Fetch a story's entire comment tree in one Algolia items request.
+    
+    Args:
+        post: The HN post (needs 'hn_id' or an item URL)
+        
+    Returns:
+        List of dictionaries containing comment information
+    """
+    item_id = hn_item_id(post)
+    if not item_id:
+        return []
+    
+    # Runs can keep different numbers of comments, so the limit is part of the key
+    limit = current_config().MAX_COMMENTS_PER_POST
+    cached = _comment_cache.get((item_id, limit))
+    if cached is not None:
+        metrics.increment("hn.comment_cache_hits")
+        # Callers attach the list to their post; the cached one is shared across runs
+        return list(cached)
+    
+    try:
+        item_url = f"{HN_API_BASE}/items/{item_id}"
+        response = direct_get(item_url, endpoint="hn_comments")
+        response_archive.store("hn_comments", "api", item_url, response.text, {'post_url': post.get('url', '')})
+        comments = parse_hn_item_json(response.text)
+        _comment_cache.set((item_id, limit), list(comments))
+        return comments
+        
+    except Exception as e:
+        logging.error(f"Error fetching HN comments for item {item_id}: {e}")
+        return []
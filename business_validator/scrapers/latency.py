@@ -0,0 +1,55 @@
+"""
+Per-endpoint latency tracking for adaptive timeouts and request hedging.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Optional
+
+from business_validator.config import (
+    REQUEST_TIMEOUT_SECONDS,
+    ADAPTIVE_TIMEOUT_MULTIPLIER,
+    ADAPTIVE_TIMEOUT_MIN_SECONDS,
+    ADAPTIVE_TIMEOUT_MAX_SECONDS,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW
+)
+
+class LatencyTracker:
+    """Rolling window of request latencies for one endpoint."""
+
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = LATENCY_MIN_SAMPLES):
+        """
+        Args:
+            window: Number of most recent latencies kept
+            min_samples: Samples needed before percentiles are trusted
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Add an observed latency (timeouts are recorded at the timeout value)."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return the p-th percentile (0-100), or None until min_samples are seen."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def timeout(self, default: float = REQUEST_TIMEOUT_SECONDS) -> float:
+        """Timeout derived from the observed p95, clamped to the configured range."""
+        p95 = self.percentile(95)
+        if p95 is None:
+            return default
+        return min(ADAPTIVE_TIMEOUT_MAX_SECONDS, max(ADAPTIVE_TIMEOUT_MIN_SECONDS, p95 * ADAPTIVE_TIMEOUT_MULTIPLIER))
@@ -0,0 +1,29 @@
+"""
+Shared helpers for the single-pass markdown parsers.
+"""
+
+import re
+
+# Algolia wraps matched query terms in <em>, which the markdown output renders as _term_
+# (the underscore comes first, so the scan can skip straight between candidates)
+_HIGHLIGHT_RE = re.compile(r"_(?<![\w\\]_)([^_\n]+)_(?!\w)")
+_ESCAPE_RE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!|>~])")
+
+def clean_title(title: str) -> str:
+    """Remove highlight markers and markdown escapes from a scraped title."""
+    # Most titles have neither, and the substitutions dominate parse time
+    if "_" in title:
+        title = _HIGHLIGHT_RE.sub(r"\1", title)
+    if "\\" in title:
+        title = _ESCAPE_RE.sub(r"\1", title)
+    return " ".join(title.split())
+
+def parse_count(text: str) -> int:
+    """Parse counts such as "28", "1,204" or "1.2k"."""
+    text = text.strip().lower().replace(",", "")
+    try:
+        if text.endswith("k"):
+            return int(float(text[:-1]) * 1000)
+        return int(float(text))
+    except ValueError:
+        return 0
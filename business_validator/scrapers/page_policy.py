@@ -0,0 +1,124 @@
+"""
+Adaptive page-depth policy for keyword searches.
+
+Deeper search pages tend to return duplicates and low-relevance noise, so instead
+of always fetching a fixed number of pages the policy looks at what each page
+actually yielded and decides whether the next page is worth paying for.
+"""
+
+import logging
+from typing import Dict, List, Set, Tuple
+
+from business_validator.config import (
+    ADAPTIVE_PAGING,
+    MIN_PAGES_PER_KEYWORD,
+    ADAPTIVE_MIN_NEW_POSTS,
+    ADAPTIVE_MIN_PAGE_YIELD
+)
+from business_validator.utils.relevance import score_relevance, post_text
+
+def post_key(post: dict) -> str:
+    """Return the key used to deduplicate posts across pages and keywords."""
+    url = post.get('url', '') or post.get('title', '')
+    return url.strip().rstrip('/').lower()
+
+class AdaptivePagePolicy:
+    """Decide per keyword whether fetching the next search page is worthwhile.
+
+    The policy deduplicates posts across every page it sees and scores the new
+    ones with the lexical pre-filter. A page's marginal yield is the sum of the
+    relevance scores of its new unique posts, i.e. the expected number of
+    relevant posts it contributed.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        relevance_terms: Set[str],
+        max_pages: int,
+        min_pages: int = MIN_PAGES_PER_KEYWORD,
+        min_new_posts: int = ADAPTIVE_MIN_NEW_POSTS,
+        min_page_yield: float = ADAPTIVE_MIN_PAGE_YIELD,
+        adaptive: bool = ADAPTIVE_PAGING
+    ):
+        self.platform = platform
+        self.relevance_terms = relevance_terms
+        self.max_pages = max_pages
+        self.min_pages = max(1, min(min_pages, max_pages))
+        self.min_new_posts = min_new_posts
+        self.min_page_yield = min_page_yield
+        self.adaptive = adaptive
+        self.seen: Set[str] = set()
+        self.decisions: List[Dict] = []
+
+    def evaluate_page(self, keyword: str, page: int, posts: List[dict]) -> Tuple[List[dict], bool]:
+        """Record a fetched page and decide whether to fetch the next one.
+
+        Args:
+            keyword: The keyword being searched
+            page: The page number that was fetched (0-indexed)
+            posts: Posts parsed from the page
+
+        Returns:
+            Tuple of (new unique posts, whether to fetch the next page)
+        """
+        new_posts = []
+        for post in posts:
+            key = post_key(post)
+            if not key or key in self.seen:
+                continue
+            self.seen.add(key)
+            post['keyword'] = keyword
+            post['relevance'] = round(score_relevance(post_text(post), self.relevance_terms), 3)
+            new_posts.append(post)
+
+        page_yield = sum(post['relevance'] for post in new_posts)
+        fetch_next, reason = self._decide(page, posts, new_posts, page_yield)
+
+        decision = {
+            "keyword": keyword,
+            "page": page,
+            "parsed_posts": len(posts),
+            "new_posts": len(new_posts),
+            "page_yield": round(page_yield, 3),
+            "fetch_next": fetch_next,
+            "reason": reason
+        }
+        self.decisions.append(decision)
+        logging.info(
+            f"      [PAGING] {self.platform} '{keyword}' page {page}: "
+            f"{len(new_posts)}/{len(posts)} new, yield {page_yield:.2f} -> "
+            f"{'next page' if fetch_next else 'stop'} ({reason})"
+        )
+        return new_posts, fetch_next
+
+    def _decide(self, page: int, posts: List[dict], new_posts: List[dict], page_yield: float) -> Tuple[bool, str]:
+        """Apply the stopping rules in order of precedence."""
+        pages_fetched = page + 1
+        if not posts:
+            return False, "empty page"
+        if pages_fetched >= self.max_pages:
+            return False, "max pages reached"
+        if pages_fetched < self.min_pages:
+            return True, "below min pages"
+        if not self.adaptive:
+            return True, "adaptive paging disabled"
+        if len(new_posts) < self.min_new_posts:
+            return False, f"fewer than {self.min_new_posts} new posts"
+        if page_yield < self.min_page_yield:
+            return False, f"yield below {self.min_page_yield}"
+        return True, "yield above threshold"
+
+    def summary(self) -> Dict:
+        """Summarize the decisions taken so far for logging and checkpoints."""
+        return {
+            "platform": self.platform,
+            "adaptive": self.adaptive,
+            "min_pages": self.min_pages,
+            "max_pages": self.max_pages,
+            "min_new_posts": self.min_new_posts,
+            "min_page_yield": self.min_page_yield,
+            "pages_fetched": len(self.decisions),
+            "unique_posts": len(self.seen),
+            "decisions": self.decisions
+        }
@@ -2,64 +2,166 @@
 Reddit scraping functionality.
 """
 
-import requests
 import re
+import json
 import logging
-from typing import List, Dict
-from urllib.parse import quote_plus
+from typing import List, Dict, Optional
+from urllib.parse import quote_plus, urlparse, unquote
 
 from business_validator.config import (
-    SCRAPERAPI_KEY, 
     REDDIT_DELAY, 
-    MAX_COMMENTS_PER_POST
+    COMMENT_CACHE_SIZE,
+    COMMENT_CACHE_TTL_SECONDS,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL_SECONDS
 )
+from business_validator.scrapers.markdown import clean_title, parse_count
+from business_validator.scrapers.transport import FetchTier, fetch_tiered, archive_cached_pages
+from business_validator.utils.cache import BoundedCache
+from business_validator.utils.context import current_config
+from business_validator.utils.metrics import metrics
+from business_validator.utils.relevance import search_key
 
-def scrape_reddit_search(keyword: str, page: int = 0) -> dict:
+_comment_cache = BoundedCache(COMMENT_CACHE_SIZE, COMMENT_CACHE_TTL_SECONDS)
+_search_cache = BoundedCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS)
+
+_COUNT = r"\d[\d.,]*[kK]?"
+# Line-anchored patterns start with a literal "\n" so the scan can skip between lines;
+# the parsers prepend one so the first line is anchored too
+_SEARCH_RESULT_RE = re.compile(r"\n## \[")
+# Result title, explicit "r/subreddit" line or section separator at the start of
+# a line, or a "N votes · M comments" run anywhere
+_SEARCH_TOKEN_RE = re.compile(
+    r"\n(?:## \[(?P<title>[^\]\n\\]*(?:\\.[^\]\n\\]*)*)\]\((?P<path>/r/(?P<path_sub>[^/)\s]+)[^)\s]*)\)(?P<post>)"
+    r"|r/(?P<sub_name>[\w%]+)(?P<sub>)"
+    r"|---(?P<separator>))"
+    r"|(?P<votes>" + _COUNT + r")\s+votes?\b[^\n]*?(?P<ncomments>" + _COUNT + r")\s+comments?\b(?P<stats>)"
+)
+_COMMENT_SECTION_RE = re.compile(r"^(?=[^\n]*comments)(?=[^\n]*(?:sort by|best))[^\n]*$", re.MULTILINE | re.IGNORECASE)
+# One classification per line: author, bare vote count, or comment text
+_COMMENT_TOKEN_RE = re.compile(
+    r"^[ \t]*\[?u/[\w-]+[^\n]*?(?P<author>)$"
+    r"|^[ \t]*(?:upvote\s+)?(?P<vote_n>" + _COUNT + r")(?:\s+(?:upvotes?|points?|votes?))?(?:\s+downvote)?[ \t]*(?P<vote>)$"
+    r"|^[ \t]*(?P<text_line>(?![\[*])[^\n]{6,})(?P<text>)$",
+    re.MULTILINE | re.IGNORECASE
+)
+
+def scrape_reddit_search(keyword: str, page: int = 0, after: Optional[str] = None) -> dict:
     """Scrape Reddit search results for a keyword.
     
+    Tries the old.reddit JSON listing first, then the non-rendered search page,
+    and only then the search page with a selector wait. Pages are cached per
+    normalized keyword and cursor, so concurrent runs sharing a keyword fetch
+    each page once.
+    Runs served from the cache still record the pages in their own archive.
+    
     Args:
         keyword: The search keyword
         page: The page number to scrape (0-indexed)
+        after: Listing cursor returned with the previous page, if any
         
     Returns:
-        Dictionary containing the scraped posts
+        Dictionary containing the scraped posts, the next cursor and whether
+        more pages exist
     """
+    metrics.increment("reddit.searches")
+    fetched = []
+    
+    def fetch():
+        fetched.append(True)
+        return _fetch_reddit_search(keyword, page, after)
+    
+    results = _search_cache.get_or_compute(
+        (search_key(keyword), page, after),
+        fetch,
+        should_cache=lambda results: bool(results['posts'])
+    )
+    if not fetched:
+        # Fetched by an earlier run; this run's archive still needs the pages
+        archive_cached_pages("reddit_search", results.get('pages', []), {'keyword': keyword, 'page': page})
+    response = {name: value for name, value in results.items() if name != 'pages'}
+    # Callers annotate the posts, so each gets its own copies
+    response['posts'] = [dict(post) for post in results['posts']]
+    return response
+
+def _fetch_reddit_search(keyword: str, page: int, after: Optional[str]) -> dict:
+    """Fetch and parse one Reddit search page."""
+    metrics.increment("reddit.search_fetches")
     # URL encode the keyword to handle spaces and special characters
     encoded_keyword = quote_plus(keyword)
     
     # Reddit search URL (page is handled differently in Reddit)
     reddit_url = f"https://www.reddit.com/search/?q={encoded_keyword}&sort=relevance&t=all"
+    json_url = f"https://old.reddit.com/search.json?q={encoded_keyword}&sort=relevance&t=all&limit=25&raw_json=1"
     
     # Add page parameter if needed (Reddit uses different pagination)
     if page > 0:
-        reddit_url += f"&count={page * 25}&after={page}"
+        reddit_url += f"&count={page * 25}&after={after or page}"
+        json_url += f"&count={page * 25}" + (f"&after={after}" if after else "")
     
-    # ScraperAPI payload for Reddit - updated based on working example
-    payload = {
-        'api_key': SCRAPERAPI_KEY,
-        'url': reddit_url,
-        'wait_for_selector': '.SearchResults_container',
-        'device_type': 'desktop',
-        'output_format': 'markdown'
-    }
+    # Set by the JSON parser; the markdown pages do not expose a cursor
+    listing = {'after': None, 'has_more': True}
+    
+    tiers = [
+        FetchTier('json', json_url, lambda text: parse_reddit_search_json(text, listing),
+                  payload={}, empty_is_final=True),
+        FetchTier('markdown', reddit_url, parse_reddit_search_markdown,
+                  payload={'device_type': 'desktop', 'output_format': 'markdown'}),
+        # ScraperAPI payload for Reddit - updated based on working example
+        FetchTier('rendered', reddit_url, parse_reddit_search_markdown, payload={
+            'wait_for_selector': '.SearchResults_container',
+            'device_type': 'desktop',
+            'output_format': 'markdown'
+        })
+    ]
     
     try:
-        response = requests.get('https://api.scraperapi.com/', params=payload, timeout=30)
-        response.raise_for_status()
-        
-        # Parse the markdown response
-        markdown_content = response.text
-        posts = parse_reddit_search_markdown(markdown_content)
-        
-        return {'posts': posts}
+        pages = []
+        posts, tier = fetch_tiered("reddit_search", tiers, context={'keyword': keyword, 'page': page}, pages=pages)
+        if tier != 'json':
+            listing = {'after': None, 'has_more': True}
+        return {'posts': posts, **listing, 'pages': pages}
         
     except Exception as e:
         logging.error(f"Error scraping Reddit for keyword '{keyword}' page {page}: {e}")
         return {'posts': []}
 
+def parse_reddit_search_json(json_content: str, listing: Optional[dict] = None) -> List[dict]:
+    """Parse a Reddit search JSON listing into posts.
+    
+    Args:
+        json_content: The JSON listing body
+        listing: Optional dictionary that receives 'after' and 'has_more'
+        
+    Returns:
+        List of dictionaries containing post information
+    """
+    data = json.loads(json_content)['data']
+    posts = []
+    for child in data.get('children', []):
+        post = child.get('data', {})
+        if child.get('kind') != 't3' or not post.get('title'):
+            continue
+        posts.append({
+            'title': post['title'],
+            'url': "https://www.reddit.com" + post.get('permalink', ''),
+            'upvotes': post.get('score') or 0,
+            'comments': post.get('num_comments') or 0,
+            'subreddit': post.get('subreddit') or "",
+            'selftext': post.get('selftext') or ""
+        })
+    if listing is not None:
+        listing['after'] = data.get('after')
+        listing['has_more'] = bool(data.get('after'))
+    return posts
+
 def parse_reddit_search_markdown(markdown_content: str) -> List[dict]:
     """Parse Reddit search markdown to extract post information.
     
+    A single pass from the first result onwards: one precompiled pattern
+    tokenizes post titles, subreddit lines, vote/comment counts and section
+    separators, and a small state machine assigns them to the current post.
+    
     Args:
         markdown_content: The markdown content from ScraperAPI
         
@@ -67,114 +169,131 @@ def parse_reddit_search_markdown(markdown_content: str) -> List[dict]:
         List of dictionaries containing post information
     """
     posts = []
-    lines = markdown_content.split('\n')
-    
-    current_post = {}
+    current_post = None
     in_post_section = False
     
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        if not line:
+    # Jump straight to the first result
+    markdown_content = "\n" + markdown_content
+    first = _SEARCH_RESULT_RE.search(markdown_content)
+    if not first:
+        return posts
+    
+    for token in _SEARCH_TOKEN_RE.finditer(markdown_content, first.start()):
+        kind = token.lastgroup
+        if kind == 'post':
+            if current_post:
+                posts.append(current_post)
+            current_post = {
+                'title': clean_title(token.group('title')),
+                'url': "https://www.reddit.com" + token.group('path'),
+                'upvotes': 0,
+                'comments': 0,
+                'subreddit': unquote(token.group('path_sub'))
+            }
+            in_post_section = True
+        elif not in_post_section:
             continue
-        
-        # Look for post titles which are typically in the format: [ Title ](/r/subreddit/...)
-        if line.startswith('## [ ') and ' ](/r/' in line:
-            # Save previous post if exists
-            if current_post.get('title'):
-                posts.append(current_post.copy())
-                current_post = {}
-            
-            # Extract title
-            title_end = line.find(' ](/r/')
-            if title_end > 4:  # "## [ " is 5 chars
-                title = line[4:title_end]  # Skip the "## [ " prefix
-                
-                # Extract URL and subreddit
-                url_start = line.find('](/') + 2
-                url_end = line.find(')', url_start)
-                url = "https://www.reddit.com" + line[url_start:url_end] if url_end > url_start else ''
-                
-                # Extract subreddit from URL
-                subreddit = ""
-                if '/r/' in url:
-                    subreddit_start = url.find('/r/') + 3
-                    subreddit_end = url.find('/', subreddit_start)
-                    if subreddit_end > subreddit_start:
-                        subreddit = url[subreddit_start:subreddit_end]
-                
-                current_post['title'] = title
-                current_post['url'] = url
-                current_post['upvotes'] = 0
-                current_post['comments'] = 0
-                current_post['subreddit'] = subreddit if subreddit else ""
-                in_post_section = True
-        
-        # Look for explicit subreddit info (r/subreddit format)
-        elif in_post_section and line.startswith('r/'):
-            current_post['subreddit'] = line.split()[0].replace('r/', '')
-        
-        # Look for votes and comments info
-        elif in_post_section and 'votes' in line and 'comments' in line:
-            # This line might contain vote and comment counts
-            parts = line.split('·')
-            for part in parts:
-                part = part.strip()
-                if 'votes' in part:
-                    numbers = re.findall(r'\d+', part)
-                    if numbers:
-                        current_post['upvotes'] = int(numbers[0])
-                elif 'comments' in part:
-                    numbers = re.findall(r'\d+', part)
-                    if numbers:
-                        current_post['comments'] = int(numbers[0])
-        
-        # Check if we're starting a new section (which means end of current post)
-        elif in_post_section and line.startswith('---'):
+        elif kind == 'sub':
+            current_post['subreddit'] = unquote(token.group('sub_name'))
+        elif kind == 'stats':
+            current_post['upvotes'] = parse_count(token.group('votes'))
+            current_post['comments'] = parse_count(token.group('ncomments'))
+        elif kind == 'separator':
             in_post_section = False
     
     # Don't forget the last post
-    if current_post.get('title'):
+    if current_post:
         posts.append(current_post)
     
-    return posts
+    return [post for post in posts if post['title']]
+
+def _comments_json_url(post_url: str, limit: int) -> str:
+    """Build the old.reddit JSON URL for a post's `limit` top-level comments."""
+    parsed = urlparse(post_url)
+    path = parsed.path.rstrip('/')
+    return f"https://old.reddit.com{path}.json?sort=top&depth=1&limit={limit}&raw_json=1"
 
 def scrape_reddit_post_comments(post_url: str) -> List[dict]:
     """Scrape comments from a specific Reddit post.
     
+    Tries the post's JSON listing first and falls back to the markdown page,
+    non-rendered and then with a selector wait.
+    
     Args:
         post_url: The URL of the Reddit post
         
     Returns:
         List of dictionaries containing comment information
     """
-    # ScraperAPI payload for individual Reddit post - updated based on working example
-    payload = {
-        'api_key': SCRAPERAPI_KEY,
-        'url': post_url,
-        'wait_for_selector': '.Comment',
-        'device_type': 'desktop',
-        'output_format': 'markdown'
-    }
+    # Runs can keep different numbers of comments, so the limit is part of the key
+    limit = current_config().MAX_COMMENTS_PER_POST
+    cached = _comment_cache.get((post_url, limit))
+    if cached is not None:
+        metrics.increment("reddit.comment_cache_hits")
+        # Callers attach the list to their post; the cached one is shared across runs
+        return list(cached)
+    
+    tiers = [
+        FetchTier('json', _comments_json_url(post_url, limit), parse_reddit_comments_json,
+                  payload={}, empty_is_final=True),
+        FetchTier('markdown', post_url, _parsed_comments_only,
+                  payload={'device_type': 'desktop', 'output_format': 'markdown'}),
+        # ScraperAPI payload for individual Reddit post - updated based on working example
+        FetchTier('rendered', post_url, _parsed_comments_only, payload={
+            'wait_for_selector': '.Comment',
+            'device_type': 'desktop',
+            'output_format': 'markdown'
+        })
+    ]
     
     try:
-        response = requests.get('https://api.scraperapi.com/', params=payload, timeout=30)
-        response.raise_for_status()
-        
-        # Parse comments from markdown
-        markdown_content = response.text
-        comments = parse_reddit_comments_markdown(markdown_content)
+        comments, tier = fetch_tiered("reddit_comments", tiers, context={'post_url': post_url})
         
         # Return only top N comments
-        return comments[:MAX_COMMENTS_PER_POST]
+        comments = comments[:limit]
+        if tier is not None:
+            _comment_cache.set((post_url, limit), list(comments))
+        return comments
         
     except Exception as e:
         logging.error(f"Error scraping comments for {post_url}: {e}")
         return []
 
+def parse_reddit_comments_json(json_content: str) -> List[dict]:
+    """Parse a Reddit post's JSON listing into top-level comments.
+    
+    Args:
+        json_content: The JSON body ([post listing, comment listing])
+        
+    Returns:
+        List of dictionaries containing comment information
+    """
+    data = json.loads(json_content)
+    comments = []
+    for child in data[1]['data'].get('children', []):
+        comment = child.get('data', {})
+        body = comment.get('body') or ""
+        if child.get('kind') != 't1' or body in ("[deleted]", "[removed]") or not body:
+            continue
+        comments.append({
+            'text': body,
+            'upvotes': comment.get('score') or 0,
+            'author': comment.get('author') or ""
+        })
+    return comments
+
+def _parsed_comments_only(markdown_content: str) -> List[dict]:
+    """Parse markdown comments, treating the parse-failure placeholder as no result."""
+    return [c for c in parse_reddit_comments_markdown(markdown_content)
+            if not c['text'].startswith("Unable to parse comments")]
+
 def parse_reddit_comments_markdown(markdown_content: str) -> List[dict]:
     """Parse Reddit comments from markdown.
     
+    A single pass over the comments section: each line is classified by one
+    precompiled pattern (author line, vote line or text line) and a small
+    state machine builds one comment per author.
+    
     Args:
         markdown_content: The markdown content from ScraperAPI
         
@@ -182,47 +301,27 @@ def parse_reddit_comments_markdown(markdown_content: str) -> List[dict]:
         List of dictionaries containing comment information
     """
     comments = []
-    lines = markdown_content.split('\n')
+    current_comment = None
     
-    current_comment = {}
-    in_comment_section = False
+    # Jump straight to the comments section (after the sort control)
+    section = _COMMENT_SECTION_RE.search(markdown_content)
+    start = section.end() if section else len(markdown_content)
     
-    for line in lines:
-        line = line.strip()
-        
-        # Detect if we're in the comments section
-        if 'comments' in line.lower() and ('sort by' in line.lower() or 'best' in line.lower()):
-            in_comment_section = True
-            continue
-        
-        if not in_comment_section:
+    for token in _COMMENT_TOKEN_RE.finditer(markdown_content, start):
+        kind = token.lastgroup
+        if kind == 'author':
+            if current_comment and current_comment.get('text'):
+                comments.append(current_comment)
+            current_comment = {'upvotes': 0}
+        elif current_comment is None:
             continue
-        
-        # Look for comment content
-        # Reddit comments in markdown often appear with username first, then the comment text
-        if line.startswith('[u/') or line.startswith('u/'):
-            # This is likely a username line, the next line might be the comment
-            if current_comment.get('text'):
-                # Save previous comment
-                comments.append(current_comment.copy())
-                current_comment = {}
-            
-            current_comment['upvotes'] = 0
-            # Try to find the comment text in the next few lines
-            continue
-        
-        # If we have a current comment being built and this line looks like content
-        if current_comment and not current_comment.get('text') and line and len(line) > 5 and not line.startswith('[') and not line.startswith('*'):
-            current_comment['text'] = line
-        
-        # Look for upvotes in comments
-        elif 'upvote' in line.lower() or 'point' in line.lower() or 'vote' in line.lower():
-            numbers = re.findall(r'\d+', line)
-            if numbers and current_comment:
-                current_comment['upvotes'] = int(numbers[0])
+        elif kind == 'vote':
+            current_comment['upvotes'] = parse_count(token.group('vote_n'))
+        elif kind == 'text' and 'text' not in current_comment:
+            current_comment['text'] = token.group('text_line').strip()
     
     # Don't forget the last comment
-    if current_comment.get('text'):
+    if current_comment and current_comment.get('text'):
         comments.append(current_comment)
     
     # If we couldn't parse any comments properly, create a fallback comment
@@ -0,0 +1,415 @@
+"""
+Shared HTTP transport for the scrapers.
+
+All ScraperAPI requests go through one connection-pooled session and the
+ScraperAPI key pool, so load is spread over every configured key and keys that
+run out of credits or hit their concurrency limit are ejected for a while.
+
+At startup (and periodically during long jobs) the account endpoint is probed
+for each key's concurrency limit and remaining credits; the key pool and the
+session's connection pool are sized to match. If the endpoint cannot be read,
+the static limits from config are used.
+
+Each endpoint (HN search, Reddit search, Reddit comments) keeps its own latency
+window. Timeouts follow the observed p95, and a request slower than the p90 can
+be hedged with a duplicate, keeping whichever answers first; hedges are capped
+at HEDGE_RATIO of all requests so credit use stays bounded.
+
+Scrapers describe each page as a ladder of fetch tiers, cheapest first (a
+public JSON API, a non-rendered fetch, then a rendered fetch with selector
+waits). fetch_tiered() escalates only when a tier's parser yields nothing and
+remembers per endpoint and domain which tier worked, so later requests skip
+failing tiers.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from business_validator.config import (
+    SCRAPERAPI_KEYS,
+    SCRAPERAPI_KEY_CONCURRENCY,
+    SCRAPERAPI_KEY_RPM,
+    KEY_QUOTA_COOLDOWN_SECONDS,
+    SCRAPERAPI_ENDPOINT,
+    SCRAPERAPI_ACCOUNT_URL,
+    ACCOUNT_PROBE_ENABLED,
+    ACCOUNT_REFRESH_SECONDS,
+    ADAPTIVE_TIMEOUTS,
+    REQUEST_TIMEOUT_SECONDS,
+    HEDGE_REQUESTS,
+    HEDGE_RATIO,
+    FETCH_TIER_RETRY_SECONDS
+)
+from business_validator.scrapers.latency import LatencyTracker
+from business_validator.utils.archive import response_archive
+from business_validator.utils.context import bind_context
+from business_validator.utils.key_pool import KeyPool
+from business_validator.utils.metrics import metrics
+
+# 403: the key's credits are used up; 429: too many concurrent requests on the key
+_QUOTA_STATUS_CODES = {403, 429}
+
+scraperapi_pool = KeyPool(
+    "scraperapi",
+    SCRAPERAPI_KEYS,
+    concurrency=SCRAPERAPI_KEY_CONCURRENCY,
+    rpm=SCRAPERAPI_KEY_RPM,
+    cooldown_seconds=KEY_QUOTA_COOLDOWN_SECONDS
+)
+
+_session = None
+_session_lock = threading.Lock()
+_pool_size = 0
+
+_probe_lock = threading.Lock()
+_last_probe = 0.0
+_account_limits: Dict[str, dict] = {}
+
+_latency: Dict[str, LatencyTracker] = {}
+_hedge_lock = threading.Lock()
+_request_count = 0
+_hedge_count = 0
+_hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="scraperapi-hedge")
+
+_tier_lock = threading.Lock()
+# (endpoint, domain) -> (tier that worked after an escalation, when)
+_tier_memory: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it sized to the pool's capacity."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+    if _pool_size == 0:
+        _resize_connection_pool(scraperapi_pool.capacity())
+    return _session
+
+def _resize_connection_pool(size: int):
+    """Mount adapters whose connection pools can hold `size` concurrent requests."""
+    global _pool_size
+    size = max(1, size)
+    with _session_lock:
+        if _session is None or size == _pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=size)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _pool_size = size
+
+def _read_account(key: str) -> dict:
+    """Read one key's plan limits from the account endpoint."""
+    response = requests.get(SCRAPERAPI_ACCOUNT_URL, params={'api_key': key}, timeout=10)
+    response.raise_for_status()
+    account = response.json()
+    return {
+        "concurrency_limit": int(account["concurrencyLimit"]),
+        "request_limit": int(account.get("requestLimit", 0)),
+        "request_count": int(account.get("requestCount", 0))
+    }
+
+def probe_account() -> Dict[str, dict]:
+    """Size the key pool and connection pool from the ScraperAPI account endpoint.
+
+    Keys whose limits cannot be read keep the static SCRAPERAPI_KEY_CONCURRENCY;
+    keys with no credits left are ejected until the next refresh.
+
+    Returns:
+        Limits per key (keys masked), as recorded in the run metrics
+    """
+    if not ACCOUNT_PROBE_ENABLED:
+        return {}
+    with _probe_lock:
+        return _probe_account_locked()
+
+def _probe_account_locked() -> Dict[str, dict]:
+    """probe_account's body; the caller holds _probe_lock."""
+    global _last_probe
+    _last_probe = time.monotonic()
+    summary = {}
+    for key in scraperapi_pool.keys:
+        masked = f"...{key[-4:]}"
+        try:
+            limits = _read_account(key)
+        except Exception as e:
+            logging.warning(f"ScraperAPI account probe failed for key {masked}, using static limits: {e}")
+            scraperapi_pool.set_key_concurrency(key, None)
+            _account_limits.pop(key, None)
+            summary[masked] = {"source": "static", "concurrency_limit": SCRAPERAPI_KEY_CONCURRENCY}
+            continue
+
+        _account_limits[key] = limits
+        scraperapi_pool.set_key_concurrency(key, limits["concurrency_limit"])
+        remaining = limits["request_limit"] - limits["request_count"]
+        if limits["request_limit"] and remaining <= 0:
+            scraperapi_pool.report_quota_error(key, ACCOUNT_REFRESH_SECONDS)
+        summary[masked] = {"source": "account", "remaining_credits": remaining, **limits}
+
+    _resize_connection_pool(scraperapi_pool.capacity())
+    metrics.increment("scraperapi.account_probes")
+    metrics.set_info("scraperapi_account", summary)
+    logging.info(f"ScraperAPI capacity: {scraperapi_pool.capacity()} concurrent requests "
+                 f"over {len(scraperapi_pool)} key(s)")
+    return summary
+
+def _maybe_refresh_account():
+    """Re-probe the account if the last probe is older than ACCOUNT_REFRESH_SECONDS."""
+    if not ACCOUNT_PROBE_ENABLED or time.monotonic() - _last_probe < ACCOUNT_REFRESH_SECONDS:
+        return
+    # Only one thread refreshes; the others carry on with the current limits
+    if not _probe_lock.acquire(blocking=False):
+        return
+    try:
+        # Another thread may have finished a probe since the check above
+        if time.monotonic() - _last_probe >= ACCOUNT_REFRESH_SECONDS:
+            _probe_account_locked()
+    finally:
+        _probe_lock.release()
+
+def scraper_capacity() -> int:
+    """Number of ScraperAPI requests worth running in parallel right now."""
+    return max(1, scraperapi_pool.capacity())
+
+def pacing_delay(static_delay: float) -> float:
+    """Delay to insert between sequential requests.
+
+    Once the account limits are known the key pool already keeps requests within
+    the plan, so no extra delay is needed; otherwise the static delay applies.
+    """
+    return 0.0 if _account_limits else static_delay
+
+def get_latency_tracker(endpoint: str) -> LatencyTracker:
+    """Return the latency window for an endpoint label, creating it on first use."""
+    with _hedge_lock:
+        if endpoint not in _latency:
+            _latency[endpoint] = LatencyTracker()
+        return _latency[endpoint]
+
+def _fetch_once(payload: dict, timeout: float, tracker: LatencyTracker, endpoint: str) -> requests.Response:
+    """Send one logical request, moving to another key after a quota error."""
+    response = None
+    # One attempt per key so a quota error on one key falls through to the next
+    for attempt in range(max(1, len(scraperapi_pool))):
+        with scraperapi_pool.acquire() as key:
+            start = time.perf_counter()
+            try:
+                response = get_session().get(
+                    SCRAPERAPI_ENDPOINT,
+                    params={**payload, 'api_key': key},
+                    timeout=timeout
+                )
+            except requests.Timeout:
+                # A timeout is a censored sample: the latency was at least the timeout
+                tracker.record(timeout)
+                metrics.increment(f"scraperapi.{endpoint}.timeouts")
+                raise
+            elapsed = time.perf_counter() - start
+        metrics.increment("scraperapi.requests")
+        metrics.record_value(f"scraperapi.{endpoint}.latency", elapsed)
+        if response.status_code not in _QUOTA_STATUS_CODES:
+            if response.ok:
+                tracker.record(elapsed)
+            break
+        metrics.increment("scraperapi.quota_errors")
+        # A concurrency 429 clears quickly; exhausted credits need the full cooldown
+        cooldown = 5 if response.status_code == 429 else None
+        scraperapi_pool.report_quota_error(key, cooldown)
+        logging.warning(f"ScraperAPI returned {response.status_code}, retrying with another key (attempt {attempt + 1})")
+
+    response.raise_for_status()
+    return response
+
+def _hedge_delay(tracker: LatencyTracker) -> Optional[float]:
+    """Seconds to wait before hedging, or None if this request may not be hedged."""
+    global _request_count
+    with _hedge_lock:
+        _request_count += 1
+        if not HEDGE_REQUESTS or _hedge_count + 1 > HEDGE_RATIO * _request_count:
+            return None
+    return tracker.percentile(90)
+
+def _claim_hedge() -> bool:
+    """Reserve one hedge within the HEDGE_RATIO budget."""
+    global _hedge_count
+    with _hedge_lock:
+        if _hedge_count + 1 > HEDGE_RATIO * _request_count:
+            return False
+        _hedge_count += 1
+        return True
+
+def scraperapi_get(payload: dict, endpoint: str = "default", timeout: Optional[float] = None) -> requests.Response:
+    """Fetch a page through ScraperAPI using the least-loaded pooled key.
+
+    Args:
+        payload: ScraperAPI parameters without 'api_key'
+        endpoint: Label whose latency history sets the timeout and hedge delay
+        timeout: Fixed timeout in seconds (default: adaptive per endpoint)
+
+    Returns:
+        The successful response
+
+    Raises:
+        requests.HTTPError: If every attempt fails with an error status
+    """
+    _maybe_refresh_account()
+    tracker = get_latency_tracker(endpoint)
+    if timeout is None:
+        timeout = tracker.timeout() if ADAPTIVE_TIMEOUTS else REQUEST_TIMEOUT_SECONDS
+
+    hedge_after = _hedge_delay(tracker)
+    if hedge_after is None:
+        return _fetch_once(payload, timeout, tracker, endpoint)
+
+    fetch = bind_context(_fetch_once)
+    primary = _hedge_executor.submit(fetch, payload, timeout, tracker, endpoint)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done or not _claim_hedge():
+        return primary.result()
+
+    logging.info(f"Hedging slow {endpoint} request after {hedge_after:.1f}s")
+    metrics.increment(f"scraperapi.{endpoint}.hedges")
+    pending = {primary, _hedge_executor.submit(fetch, payload, timeout, tracker, endpoint)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is not primary:
+                    metrics.increment(f"scraperapi.{endpoint}.hedge_wins")
+                # The slower request cannot be aborted; its result is discarded
+                return future.result()
+            error = error or future.exception()
+    raise error
+
+class FetchTier(NamedTuple):
+    """One way of fetching a page, from cheapest to most expensive."""
+    name: str
+    url: str
+    parse: Callable[[str], List[dict]]
+    # ScraperAPI parameters besides url/api_key; None fetches the URL directly
+    payload: Optional[dict] = None
+    # True when an empty parse is a real "no results" (e.g. a well-formed JSON
+    # listing) rather than a sign the representation did not work
+    empty_is_final: bool = False
+
+def direct_get(url: str, endpoint: str = "default") -> requests.Response:
+    """Fetch a public URL without ScraperAPI, using the endpoint's adaptive timeout."""
+    tracker = get_latency_tracker(endpoint)
+    timeout = tracker.timeout() if ADAPTIVE_TIMEOUTS else REQUEST_TIMEOUT_SECONDS
+    start = time.perf_counter()
+    try:
+        response = get_session().get(url, timeout=timeout)
+    except requests.Timeout:
+        tracker.record(timeout)
+        metrics.increment(f"direct.{endpoint}.timeouts")
+        raise
+    elapsed = time.perf_counter() - start
+    metrics.increment("direct.requests")
+    metrics.record_value(f"direct.{endpoint}.latency", elapsed)
+    response.raise_for_status()
+    tracker.record(elapsed)
+    return response
+
+def _domain(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    for prefix in ("www.", "old."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+def _start_tier(endpoint: str, domain: str, tiers: List[FetchTier]) -> int:
+    """Index of the tier to start from, skipping tiers that recently failed for this endpoint on this domain."""
+    with _tier_lock:
+        remembered = _tier_memory.get((endpoint, domain))
+    if remembered is None or time.monotonic() - remembered[1] > FETCH_TIER_RETRY_SECONDS:
+        return 0
+    names = [tier.name for tier in tiers]
+    return names.index(remembered[0]) if remembered[0] in names else 0
+
+def _remember_tier(endpoint: str, domain: str, index: int, start: int, tier_name: str):
+    """Record which tier worked for an endpoint on a domain.
+
+    Page types of one site fail differently (Reddit comment threads can need
+    rendering while its search JSON works), so each endpoint has its own
+    memory. Success on the cheapest tier clears the memory. An escalation within this
+    request remembers the working tier. A remembered tier that keeps working
+    keeps its original timestamp, so cheaper tiers get retried once
+    FETCH_TIER_RETRY_SECONDS have passed.
+    """
+    with _tier_lock:
+        if index == 0:
+            _tier_memory.pop((endpoint, domain), None)
+        elif index > start:
+            _tier_memory[(endpoint, domain)] = (tier_name, time.monotonic())
+
+def fetch_tiered(
+    endpoint: str,
+    tiers: List[FetchTier],
+    context: Optional[dict] = None,
+    pages: Optional[List[Tuple[str, str, str]]] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """Fetch and parse a page, escalating through tiers until one yields items.
+
+    Every fetched body is stored in the raw response archive before parsing.
+
+    Args:
+        endpoint: Latency/metrics label for the page type (e.g. "reddit_search")
+        tiers: Fetch tiers ordered from cheapest to most expensive
+        context: What the page is fetched for (e.g. keyword and page), kept
+            with the archived bodies so they can be re-parsed offline
+        pages: Optional list that receives (tier name, url, body) of every
+            fetched body, for results cached beyond this run
+
+    Returns:
+        (parsed items, name of the tier that produced them or None if all failed)
+    """
+    domain = _domain(tiers[0].url)
+    start = _start_tier(endpoint, domain, tiers)
+    for index in range(start, len(tiers)):
+        tier = tiers[index]
+        label = f"{endpoint}.{tier.name}"
+        try:
+            if tier.payload is None:
+                response = direct_get(tier.url, endpoint=label)
+            else:
+                response = scraperapi_get({'url': tier.url, **tier.payload}, endpoint=label)
+            response_archive.store(endpoint, tier.name, tier.url, response.text, context)
+            if pages is not None:
+                pages.append((tier.name, tier.url, response.text))
+            items = tier.parse(response.text)
+        except Exception as e:
+            logging.info(f"[FETCH] {endpoint} tier '{tier.name}' failed on {domain}: {e}")
+            items = None
+
+        if items or (items is not None and tier.empty_is_final):
+            _remember_tier(endpoint, domain, index, start, tier.name)
+            metrics.increment(f"fetch_tier.{label}")
+            return items, tier.name
+
+        if index + 1 < len(tiers):
+            metrics.increment(f"fetch_tier.{endpoint}.escalations")
+            logging.info(f"[FETCH] {endpoint} tier '{tier.name}' yielded nothing on {domain}, "
+                         f"escalating to '{tiers[index + 1].name}'")
+
+    return [], None
+
+def archive_cached_pages(endpoint: str, pages: List[Tuple[str, str, str]], context: Optional[dict] = None):
+    """Archive the pages behind a result served from a cache shared by runs.
+
+    The run that fetched them archived them in its own directory; storing them
+    again keeps this run's archive complete for re-parsing.
+
+    Args:
+        endpoint: Page type the result was fetched for
+        pages: (tier name, url, body) of each page, as collected by fetch_tiered
+        context: What this run requested the result for (e.g. keyword and page)
+    """
+    for tier_name, url, body in pages:
+        response_archive.store(endpoint, tier_name, url, body, context)
@@ -0,0 +1,211 @@
+"""
+Validation stages that can run as shards.
+
+Steps 2-6 of a validation work independently per keyword (searches) or per
+post (comment threads, analyses), so each is a stage function over a list of
+items. `validate_business_idea` runs every stage as a single shard in its own
+process (InProcessStages). In sharded mode the job service splits a stage into
+shards and hands them to worker processes through the task queue
+(jobs/tasks.py), on this host or on any host sharing the run store.
+
+A stage function takes (items, payload, run, progress, output). It reads its
+input items once, in order, and appends its output items to `output` as they
+are produced: a list for a worker's shard, the run's spill file when the
+stage runs in process, so no stage holds its whole output in memory.
+`progress(done, new_items)` is called after each input item with the number
+of items finished and the output items that item produced; it may raise
+StageStopped to end the stage early (e.g. once its analyses have converged).
+The stage returns a JSON-serializable dict with any other results (e.g. the
+paging decisions of a search).
+"""
+
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sized, Tuple
+
+from business_validator.utils.context import bind_context
+from business_validator.utils.relevance import build_relevance_terms
+from business_validator.analyzers.hackernews_analyzer import analyze_hn_post
+from business_validator.analyzers.reddit_analyzer import analyze_reddit_post
+from business_validator.scrapers.hackernews import scrape_hackernews, scrape_hn_post_comments
+from business_validator.scrapers.page_policy import AdaptivePagePolicy
+from business_validator.scrapers.transport import scraper_capacity, pacing_delay
+from business_validator.scrapers.reddit import scrape_reddit_search, scrape_reddit_post_comments
+
+# Stage name -> stage function
+STAGES: Dict[str, Callable] = {}
+
+class StageStopped(Exception):
+    """Raised by a stage's progress callback to end the stage early.
+
+    The output items appended so far are kept; the remaining input items
+    are not processed.
+    """
+
+def stage(name: str):
+    """Register a stage function under a name workers can look up."""
+    def register(fn):
+        STAGES[name] = fn
+        return fn
+    return register
+
+def _search(platform: str, scrape: Callable, max_pages: int, delay: float, keywords: List[str], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Page through the search results of each keyword until the page policy stops."""
+    terms = build_relevance_terms(payload["business_idea"], payload["keywords"])
+    policy = AdaptivePagePolicy(platform, terms, max_pages)
+    for i, keyword in enumerate(keywords):
+        posts = []
+        run.logger.info(f"   Searching {platform} for: '{keyword}'")
+        after = None
+        for page in range(max_pages):
+            run.check_cancelled()
+            run.logger.info(f"      Scraping page {page}...")
+            results = scrape(keyword, page, after)
+            after = results.get('after')
+
+            new_posts, fetch_next = policy.evaluate_page(keyword, page, results['posts'])
+            # Tagged copies: the search results are cached and shared with other runs
+            posts.extend(dict(post, keyword=keyword) for post in new_posts)
+
+            if not fetch_next or not results.get('has_more', True):
+                break
+
+            time.sleep(pacing_delay(delay))
+        output.extend(posts)
+        progress(i + 1, posts)
+    return {"policy": policy.summary()}
+
+@stage("hn_search")
+def search_hn(keywords: List[str], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Step 2: HN search pages for a shard of keywords."""
+    return _search("HackerNews", lambda keyword, page, after: scrape_hackernews(keyword, page),
+                   run.config.MAX_PAGES_PER_KEYWORD_HN, run.config.HN_DELAY, keywords, payload, run, progress, output)
+
+@stage("reddit_search")
+def search_reddit(keywords: List[str], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Step 3: Reddit search pages for a shard of keywords."""
+    return _search("Reddit", scrape_reddit_search,
+                   run.config.MAX_PAGES_PER_KEYWORD_REDDIT, run.config.REDDIT_DELAY, keywords, payload, run, progress, output)
+
+def _ordered_map(fn: Callable, items: Iterable[Any], workers: int) -> Iterator[Tuple[Any, Any]]:
+    """Yield (item, fn(item)) in input order, running fn on `workers` threads.
+
+    Unlike ThreadPoolExecutor.map, which submits every item up front, at most
+    twice `workers` items are in flight, so items can be streamed from disk.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(fn, item)))
+            if len(pending) >= 2 * workers:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+@stage("hn_comments")
+def fetch_hn_comments(posts: List[dict], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Step 4: HN comment threads (one Algolia items request per story)."""
+    run.check_cancelled()
+    workers = max(1, min(len(posts), run.config.HN_COMMENT_CONCURRENCY))
+    for i, (post, comments) in enumerate(_ordered_map(bind_context(scrape_hn_post_comments), posts, workers)):
+        post['comments_data'] = comments
+        run.metrics.increment("hn.comment_fetches")
+        output.append(post)
+        progress(i + 1, [post])
+    return {}
+
+@stage("reddit_comments")
+def fetch_reddit_comments(posts: List[dict], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Step 4: Reddit comment pages, as many at once as the account allows."""
+    workers = max(1, min(len(posts), scraper_capacity()))
+    run.logger.info(f"   Fetching comments with {workers} concurrent request(s)")
+    comment_results = _ordered_map(bind_context(lambda p: scrape_reddit_post_comments(p['url'])), posts, workers)
+    for i, (post, comments) in enumerate(comment_results):
+        run.check_cancelled()
+        run.logger.info(f"   Scraped comments {i+1}/{len(posts)}: {post['title'][:50]}...")
+        run.metrics.increment("reddit.comment_fetches")
+        post['comments_data'] = comments
+        output.append(post)
+        progress(i + 1, [post])
+    return {}
+
+def _analyze(platform: str, analyze: Callable, posts: List[dict], run, progress, output) -> Dict[str, Any]:
+    """Analyze each post, skipping (and logging) posts whose analysis fails."""
+    for i, post in enumerate(posts):
+        run.check_cancelled()
+        run.logger.info(f"   Analyzing {platform} post {i+1}/{len(posts)}: {post['title'][:50]}...")
+        new_items = []
+        try:
+            # post_url ties the analysis to its post for streaming consumers; the models ignore it
+            new_items.append(dict(analyze(post).dict(), post_url=post.get('url')))
+        except Exception as e:
+            run.logger.error(f"Error analyzing {platform} post {i+1}: {e}")
+            run.logger.error(traceback.format_exc())
+            # Continue with other posts
+        output.extend(new_items)
+        progress(i + 1, new_items)
+
+        time.sleep(0.5)
+    return {}
+
+@stage("hn_analysis")
+def analyze_hn_posts(posts: List[dict], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Step 5: full analysis of HN posts."""
+    business_idea = payload["business_idea"]
+    return _analyze("HN", lambda post: analyze_hn_post(post, business_idea), posts, run, progress, output)
+
+@stage("reddit_analysis")
+def analyze_reddit_posts(posts: List[dict], payload: Dict[str, Any], run, progress, output) -> Dict[str, Any]:
+    """Step 6: full analysis of Reddit posts with their comments."""
+    business_idea = payload["business_idea"]
+    return _analyze("Reddit", lambda post: analyze_reddit_post(post, post.get('comments_data', []), business_idea),
+                    posts, run, progress, output)
+
+def merge_policies(shard_results: List[Dict[str, Any]], platform: str, unique_posts: int) -> Dict[str, Any]:
+    """Combine the paging decisions of a search stage's shards.
+
+    Args:
+        shard_results: The search shards' results
+        platform: "HackerNews" or "Reddit"
+        unique_posts: Posts left after deduplicating across shards
+
+    Returns:
+        Page policy summary of the whole search
+    """
+    summaries = [result["policy"] for result in shard_results]
+    summary = dict(summaries[0]) if summaries else {"platform": platform}
+    summary.update(
+        shards=len(summaries),
+        pages_fetched=sum(s["pages_fetched"] for s in summaries),
+        unique_posts=unique_posts,
+        decisions=[decision for s in summaries for decision in s["decisions"]]
+    )
+    return summary
+
+class InProcessStages:
+    """Run each stage as one shard in this process (the default)."""
+
+    def map(self, run, stage_name: str, items: Sized, payload: Dict[str, Any],
+            progress: Optional[Callable[[int, List[Any]], None]] = None,
+            output: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Run a stage over all items.
+
+        Args:
+            run: The active RunContext
+            stage_name: Registered stage to run
+            items: Keywords or posts the stage works on (a list or a SpillFile)
+            payload: Run-wide inputs (business idea, keywords, config overrides)
+            progress: Called as progress(done, new_items) as items finish
+            output: Receives the stage's output items (e.g. a SpillFile)
+
+        Returns:
+            List of shard results without their items (here a single one)
+        """
+        if not len(items):
+            return []
+        output = output if output is not None else []
+        return [STAGES[stage_name](items, payload, run, progress or (lambda *_: None), output)]
@@ -0,0 +1,216 @@
+"""
+Consume a validation incrementally.
+
+    for event in iter_validation("AI bookkeeping for freelancers"):
+        if isinstance(event, PostAnalyzed):
+            print(event.platform, event.analysis.relevant)
+        elif isinstance(event, ValidationReport):
+            print(event.analysis.overall_score)
+
+    async for event in aiter_validation("AI bookkeeping for freelancers"):
+        ...
+
+The validation runs in a background thread and hands its results over
+through a bounded queue, so a slow consumer pauses the run instead of the
+whole run piling up in memory. Stopping the iteration early cancels the run.
+"""
+
+import queue
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from business_validator.config import STREAM_QUEUE_SIZE
+from business_validator.models import CombinedAnalysis, HNPostAnalysis, RedditPostAnalysis
+from business_validator.run_context import RunContext
+from business_validator.validator import validate_business_idea
+
+@dataclass(frozen=True)
+class KeywordsGenerated:
+    """Step 1 is done: the search keywords."""
+    keywords: List[str]
+
+@dataclass(frozen=True)
+class PostCollected:
+    """A post found by the searches (each post once, after deduplication)."""
+    platform: str  # "HackerNews" or "Reddit"
+    post: Dict[str, Any]
+
+@dataclass(frozen=True)
+class PostAnalyzed:
+    """The analysis of one post (cascade-rejected posts included)."""
+    platform: str
+    post_url: Optional[str]
+    analysis: Union[HNPostAnalysis, RedditPostAnalysis]
+
+@dataclass(frozen=True)
+class ScoreUpdate:
+    """Running aggregate over the analyses so far, sent after every PostAnalyzed."""
+    analyzed: int
+    relevant: int
+    score: int  # Share of relevant posts, 0-100 (the fallback report's score)
+    average_engagement: float  # Over relevant posts
+    sentiment: Dict[str, int]  # Relevant posts per sentiment
+    by_platform: Dict[str, Dict[str, int]]  # {"HackerNews": {"analyzed": n, "relevant": m}, ...}
+
+@dataclass(frozen=True)
+class ReportField:
+    """A field of the final report, as soon as it has been generated."""
+    name: str
+    value: Any
+
+@dataclass(frozen=True)
+class Progress:
+    """A progress event (see utils/events.py)."""
+    event: Dict[str, Any]
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """The final report; always the last event of a completed validation."""
+    analysis: CombinedAnalysis
+    run_id: str
+    data_dir: str
+
+ValidationEvent = Union[KeywordsGenerated, PostCollected, PostAnalyzed, ScoreUpdate, ReportField, Progress, ValidationReport]
+
+@dataclass
+class RunningScore:
+    """Aggregates post analyses into ScoreUpdate events."""
+    analyzed: int = 0
+    relevant: int = 0
+    engagement_total: int = 0
+    sentiment: Dict[str, int] = field(default_factory=dict)
+    by_platform: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def add(self, platform: str, analysis: Union[HNPostAnalysis, RedditPostAnalysis]) -> ScoreUpdate:
+        """Count one analysis and return the updated aggregate."""
+        platform_counts = self.by_platform.setdefault(platform, {"analyzed": 0, "relevant": 0})
+        self.analyzed += 1
+        platform_counts["analyzed"] += 1
+        if analysis.relevant:
+            self.relevant += 1
+            platform_counts["relevant"] += 1
+            self.engagement_total += analysis.engagement_score
+            self.sentiment[analysis.sentiment] = self.sentiment.get(analysis.sentiment, 0) + 1
+        return ScoreUpdate(
+            analyzed=self.analyzed,
+            relevant=self.relevant,
+            score=min(100, int(self.relevant / self.analyzed * 100)),
+            average_engagement=round(self.engagement_total / self.relevant, 2) if self.relevant else 0.0,
+            sentiment=dict(self.sentiment),
+            by_platform={name: dict(counts) for name, counts in self.by_platform.items()}
+        )
+
+# on_result kind -> (platform, analysis model) for the kinds that carry analyses
+_ANALYSIS_KINDS = {
+    "hn_analysis": ("HackerNews", HNPostAnalysis),
+    "reddit_analysis": ("Reddit", RedditPostAnalysis)
+}
+_POST_KINDS = {"hn_post": "HackerNews", "reddit_post": "Reddit"}
+
+class _Finished:
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+def iter_validation(
+    business_idea: str,
+    config_overrides: Optional[Dict[str, Any]] = None,
+    run: Optional[RunContext] = None,
+    keywords: Optional[List[str]] = None,
+    stages: Optional[Any] = None,
+    include_progress: bool = False,
+    max_pending: int = STREAM_QUEUE_SIZE
+) -> Iterator[ValidationEvent]:
+    """Validate a business idea and yield its results as they become available.
+
+    Args:
+        business_idea: The business idea to validate
+        config_overrides: Config settings to change for this run only (ignored if run is given)
+        run: Optional RunContext to run in
+        keywords: Optional pre-generated search keywords (skips step 1)
+        stages: Optional runner for steps 2-6 (see validate_business_idea)
+        include_progress: Also yield Progress events
+        max_pending: Events buffered before the run waits for the consumer
+
+    Yields:
+        KeywordsGenerated, PostCollected, PostAnalyzed, ScoreUpdate, ReportField
+        and Progress events, then a final ValidationReport
+
+    Raises:
+        Whatever the validation raises (e.g. RunCancelled if the run is cancelled elsewhere)
+    """
+    run = run or RunContext(business_idea, config_overrides)
+    pending: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+    stopped = threading.Event()
+    score = RunningScore()
+
+    def put(event):
+        # Wait for the consumer, unless it has stopped listening
+        while not stopped.is_set():
+            try:
+                pending.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def on_result(kind: str, value: Any):
+        if kind == "keywords":
+            put(KeywordsGenerated(list(value)))
+        elif kind in _POST_KINDS:
+            put(PostCollected(_POST_KINDS[kind], value))
+        elif kind in _ANALYSIS_KINDS:
+            platform, model = _ANALYSIS_KINDS[kind]
+            analysis = model(**value)
+            put(PostAnalyzed(platform, value.get("post_url"), analysis))
+            put(score.add(platform, analysis))
+
+    def validate():
+        try:
+            analysis = validate_business_idea(
+                business_idea,
+                on_partial_result=lambda name, value: put(ReportField(name, value)),
+                run=run,
+                keywords=keywords,
+                stages=stages,
+                on_progress=(lambda event: put(Progress(event))) if include_progress else None,
+                on_result=on_result
+            )
+            put(ValidationReport(analysis, run.run_id, run.data_dir))
+            put(_Finished())
+        except BaseException as e:
+            put(_Finished(e))
+
+    thread = threading.Thread(target=validate, name=f"validation-{run.run_id}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            event = pending.get()
+            if isinstance(event, _Finished):
+                if event.error is not None:
+                    raise event.error
+                return
+            yield event
+    finally:
+        stopped.set()
+        if thread.is_alive():
+            # The consumer stopped early; the run stops at its next cancellation check
+            run.cancel()
+
+async def aiter_validation(business_idea: str, **kwargs) -> AsyncIterator[ValidationEvent]:
+    """Async version of iter_validation (same arguments and events).
+
+    The validation and the hand-over run in worker threads, so the event loop
+    is never blocked.
+    """
+    loop = asyncio.get_running_loop()
+    events = iter_validation(business_idea, **kwargs)
+    done = object()
+    try:
+        while True:
+            event = await loop.run_in_executor(None, next, events, done)
+            if event is done:
+                return
+            yield event
+    finally:
+        await loop.run_in_executor(None, events.close)
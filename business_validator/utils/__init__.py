@@ -2,12 +2,40 @@
 Utility functions for the business validator package.
 """
 
-from business_validator.utils.environment import setup_environment, save_checkpoint, load_checkpoint
+from business_validator.utils.environment import setup_environment, save_checkpoint, load_checkpoint, CheckpointStore
 from business_validator.utils.reporting import print_validation_report
+from business_validator.utils.relevance import build_relevance_terms, score_relevance, rank_spilled_posts_for_comments
+from business_validator.utils.metrics import Metrics, metrics
+from business_validator.utils.key_pool import KeyPool
+from business_validator.utils.archive import ResponseArchive, response_archive
+from business_validator.utils.context import RunLocal, get_current_run, current_config, bind_context
+from business_validator.utils.events import EventBus, read_events, overall_progress, describe_progress
+from business_validator.utils.spill import SpillFile
+from business_validator.utils.sampling import draw_stratified_sample, StratifiedSample
 
 __all__ = [
     'setup_environment',
     'save_checkpoint',
     'load_checkpoint',
-    'print_validation_report'
+    'CheckpointStore',
+    'print_validation_report',
+    'build_relevance_terms',
+    'score_relevance',
+    'rank_spilled_posts_for_comments',
+    'Metrics',
+    'metrics',
+    'KeyPool',
+    'ResponseArchive',
+    'response_archive',
+    'RunLocal',
+    'get_current_run',
+    'current_config',
+    'bind_context',
+    'EventBus',
+    'read_events',
+    'overall_progress',
+    'describe_progress',
+    'SpillFile',
+    'draw_stratified_sample',
+    'StratifiedSample'
 ]
@@ -0,0 +1,141 @@
+"""
+Compressed archive of the raw pages fetched during a run.
+
+Every page the scrapers fetch (search pages, JSON listings, comment threads) is
+stored compressed (zstd when the zstandard package is installed, gzip
+otherwise) so the parsed artifacts can be regenerated offline with
+`python -m business_validator.reparse` after a parser fix, without buying the
+pages again.
+
+Bodies are content-addressed by their SHA-1, so a shared archive directory
+stores each distinct page once. Each run keeps its own index
+(raw_index.jsonl in the run directory) listing what was fetched, in order,
+and the context the scraper fetched it for.
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterator, Optional
+
+from business_validator.config import RAW_ARCHIVE_ENABLED, RAW_ARCHIVE_DIR, RAW_ARCHIVE_LEVEL
+from business_validator.utils.context import RunLocal
+from business_validator.utils.metrics import metrics
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+INDEX_FILENAME = "raw_index.jsonl"
+
+def _compress(body: bytes) -> tuple:
+    """Return (compressed bytes, file extension)."""
+    if ZSTD_AVAILABLE:
+        return zstandard.ZstdCompressor(level=RAW_ARCHIVE_LEVEL).compress(body), ".zst"
+    return gzip.compress(body, compresslevel=min(RAW_ARCHIVE_LEVEL, 9)), ".gz"
+
+def _decompress(data: bytes, path: str) -> bytes:
+    if path.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"{path} is zstd-compressed; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class ResponseArchive:
+    """Thread-safe writer for the raw responses of one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.run_dir: Optional[str] = None
+        self.blob_dir: Optional[str] = None
+
+    def start(self, run_dir: str, blob_dir: Optional[str] = RAW_ARCHIVE_DIR):
+        """Start archiving into a run directory.
+
+        Args:
+            run_dir: The run's data directory; receives the index
+            blob_dir: Shared directory for compressed bodies (default: run_dir/raw)
+        """
+        if not RAW_ARCHIVE_ENABLED:
+            return
+        with self._lock:
+            self.run_dir = run_dir
+            self.blob_dir = blob_dir or os.path.join(run_dir, "raw")
+            os.makedirs(self.blob_dir, exist_ok=True)
+
+    def stop(self):
+        """Stop archiving (later responses are not stored)."""
+        with self._lock:
+            self.run_dir = None
+            self.blob_dir = None
+
+    def store(self, endpoint: str, tier: str, url: str, body: str, context: Optional[dict] = None):
+        """Archive one fetched page. Errors are logged, never raised.
+
+        Args:
+            endpoint: Page type (e.g. "hn_search", "reddit_comments")
+            tier: Fetch tier that produced the body (e.g. "json", "rendered")
+            url: The fetched URL
+            body: The response text
+            context: What the page was fetched for (keyword/page, post URL, ...)
+        """
+        with self._lock:
+            run_dir, blob_dir = self.run_dir, self.blob_dir
+        if run_dir is None:
+            return
+
+        try:
+            raw = body.encode("utf-8")
+            digest = hashlib.sha1(raw).hexdigest()
+            existing = [os.path.join(blob_dir, digest + ext) for ext in (".zst", ".gz")]
+            blob_path = next((path for path in existing if os.path.exists(path)), None)
+            if blob_path is None:
+                compressed, ext = _compress(raw)
+                blob_path = os.path.join(blob_dir, digest + ext)
+                # Write then rename, so concurrent runs never see a partial blob
+                tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, blob_path)
+                metrics.increment("archive.bytes_raw", len(raw))
+                metrics.increment("archive.bytes_stored", len(compressed))
+
+            entry = {
+                "endpoint": endpoint,
+                "tier": tier,
+                "url": url,
+                "context": context or {},
+                "blob": os.path.relpath(blob_path, run_dir),
+                "fetched_at": time.time()
+            }
+            with self._lock:
+                with open(os.path.join(run_dir, INDEX_FILENAME), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            metrics.increment("archive.responses")
+        except Exception as e:
+            logging.warning(f"Could not archive {endpoint} response for {url}: {e}")
+
+def read_index(run_dir: str) -> Iterator[Dict]:
+    """Yield a run's archive index entries in fetch order."""
+    path = os.path.join(run_dir, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def load_body(run_dir: str, entry: Dict) -> str:
+    """Read and decompress the archived body of an index entry."""
+    path = os.path.join(run_dir, entry["blob"])
+    with open(path, "rb") as f:
+        return _decompress(f.read(), path).decode("utf-8")
+
+# Archive for the current validation run (each RunContext has its own)
+response_archive = RunLocal("archive", ResponseArchive())
@@ -0,0 +1,91 @@
+"""
+Small thread-safe in-memory cache for scraped data.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class BoundedCache:
+    """LRU cache with a size bound and a time-to-live per entry."""
+
+    def __init__(self, max_items: int, ttl_seconds: float):
+        """
+        Args:
+            max_items: Maximum entries kept; the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _get_locked(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            return self._get_locked(key)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda value: value is not None
+    ) -> Any:
+        """Return the cached value, computing and caching it if missing.
+
+        Concurrent callers for the same missing key wait for one computation
+        instead of repeating it. If that result is not cacheable, each waiter
+        computes its own.
+
+        Args:
+            key: The cache key
+            compute: Produces the value on a miss
+            should_cache: Decides whether a computed value is stored
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                return value
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending[key] = threading.Event()
+
+        if not owner:
+            event.wait()
+            value = self.get(key)
+            return value if value is not None else compute()
+
+        try:
+            value = compute()
+            if should_cache(value):
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,66 @@
+"""
+Per-run state lookup for concurrent validations in one process.
+
+The RunContext of the validation executing in the current thread (or asyncio
+task) is kept in a context variable. Module-level handles such as `metrics`
+are RunLocal proxies that resolve to the current run's instance, so code deep
+in the scrapers and analyzers records into the right run without passing the
+context through every call. Work handed to thread pools must be wrapped with
+bind_context() to carry the run along.
+"""
+
+import contextvars
+from typing import Any, Callable, Optional
+
+import business_validator.config as config
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar("business_validator_run", default=None)
+
+def get_current_run() -> Optional[Any]:
+    """Return the RunContext active in this context, or None outside a run."""
+    return _current_run.get()
+
+def set_current_run(run: Any) -> contextvars.Token:
+    """Make a run current; pass the returned token to reset_current_run()."""
+    return _current_run.set(run)
+
+def reset_current_run(token: contextvars.Token):
+    """Restore the run that was current before set_current_run()."""
+    _current_run.reset(token)
+
+def current_config() -> Any:
+    """Return the current run's config (with its overrides), or the config module."""
+    run = _current_run.get()
+    return run.config if run is not None else config
+
+def bind_context(fn: Callable) -> Callable:
+    """Wrap a function so it runs with the caller's current run when called from another thread."""
+    context = contextvars.copy_context()
+
+    def run_in_context(*args, **kwargs):
+        # A Context can only be entered by one thread at a time, so each call gets a copy
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run_in_context
+
+class RunLocal:
+    """Module-level handle that forwards to the current run's instance of a component.
+
+    Outside a run it forwards to a process-wide default instance.
+    """
+
+    def __init__(self, attribute: str, default: Any):
+        """
+        Args:
+            attribute: Name of the RunContext attribute holding the run's instance
+            default: Instance used when no run is active
+        """
+        self._attribute = attribute
+        self._default = default
+
+    def _target(self) -> Any:
+        run = _current_run.get()
+        return getattr(run, self._attribute) if run is not None else self._default
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
@@ -4,11 +4,28 @@ Environment setup, logging, and checkpoint management utilities.
 
 import os
 import json
+import shutil
 import logging
 import datetime
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
 
 from business_validator.config import DATA_DIR, LOG_DIR
+from business_validator.utils.spill import SpillFile, SPILL_DIR
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def setup_environment_logging():
+    """Configure console logging for the process.
+    
+    Console logging is process-wide and only configured once; each run's log
+    file is attached by its RunContext.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[logging.StreamHandler()]
+    )
 
 def setup_environment(business_idea: str) -> Dict[str, str]:
     """Setup logging and data directories for the current run.
@@ -25,30 +42,25 @@ def setup_environment(business_idea: str) -> Dict[str, str]:
     # Create a safe version of the business idea for filenames
     safe_idea = "".join(c if c.isalnum() else "_" for c in business_idea[:30]).strip("_")
     
-    # Create run ID
-    run_id = f"{safe_idea}_{timestamp}"
-    
     # Create directories
     os.makedirs(DATA_DIR, exist_ok=True)
     os.makedirs(LOG_DIR, exist_ok=True)
     
-    # Create run-specific directories
-    run_data_dir = os.path.join(DATA_DIR, run_id)
-    os.makedirs(run_data_dir, exist_ok=True)
+    # Create the run ID and its directory; concurrent runs of the same idea
+    # within one second get a numeric suffix
+    run_id = f"{safe_idea}_{timestamp}"
+    suffix = 1
+    while True:
+        run_data_dir = os.path.join(DATA_DIR, run_id)
+        try:
+            os.makedirs(run_data_dir)
+            break
+        except FileExistsError:
+            suffix += 1
+            run_id = f"{safe_idea}_{timestamp}_{suffix}"
     
-    # Setup logging
     log_file = os.path.join(LOG_DIR, f"{run_id}.log")
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
-    
-    logging.info(f"Starting validation for business idea: {business_idea}")
-    logging.info(f"Run ID: {run_id}")
+    setup_environment_logging()
     
     return {
         "run_id": run_id,
@@ -82,6 +94,43 @@ def save_checkpoint(data: Any, filename: str, data_dir: str) -> str:
         logging.error(f"Error saving checkpoint {filepath}: {e}")
         return ""
 
+def save_checkpoint_stream(items: Iterable[Any], filename: str, data_dir: str, key: Optional[str] = None) -> str:
+    """Save a list to a checkpoint file one item at a time.
+    
+    Writes the same JSON as save_checkpoint would for the full list (or for
+    {key: list}), without ever holding the list in memory.
+    
+    Args:
+        items: The items to save (e.g. a SpillFile)
+        filename: The name of the checkpoint file
+        data_dir: The directory to save the file in
+        key: Optional name to save the list under
+        
+    Returns:
+        The full path to the saved file, or empty string on error
+    """
+    filepath = os.path.join(data_dir, filename)
+    indent = "    " if key else "  "
+    
+    try:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(f'{{\n  {json.dumps(key)}: [' if key else '[')
+            count = 0
+            for item in items:
+                if hasattr(item, "dict"):
+                    item = item.dict()
+                text = json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n" + indent)
+                f.write(("," if count else "") + "\n" + indent + text)
+                count += 1
+            if count:
+                f.write("\n" + indent[:-2])
+            f.write("]\n}" if key else "]")
+        logging.info(f"Checkpoint saved: {filepath} ({count} items)")
+        return filepath
+    except Exception as e:
+        logging.error(f"Error saving checkpoint {filepath}: {e}")
+        return ""
+
 def load_checkpoint(filename: str, data_dir: str) -> Optional[Dict]:
     """Load data from a checkpoint file.
     
@@ -106,3 +155,43 @@ def load_checkpoint(filename: str, data_dir: str) -> Optional[Dict]:
     except Exception as e:
         logging.error(f"Error loading checkpoint {filepath}: {e}")
         return None
+
+class CheckpointStore:
+    """Checkpoint files of one run, kept in the run's data directory."""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self._spills: List[SpillFile] = []
+
+    def path(self, filename: str) -> str:
+        """Return the full path of a checkpoint file."""
+        return os.path.join(self.data_dir, filename)
+
+    def save(self, data: Any, filename: str) -> str:
+        """Save data to a checkpoint file (see save_checkpoint)."""
+        return save_checkpoint(data, filename, self.data_dir)
+
+    def load(self, filename: str) -> Optional[Dict]:
+        """Load a checkpoint file (see load_checkpoint)."""
+        return load_checkpoint(filename, self.data_dir)
+    
+    def save_stream(self, items: Iterable[Any], filename: str, key: Optional[str] = None) -> str:
+        """Save a list to a checkpoint file item by item (see save_checkpoint_stream)."""
+        return save_checkpoint_stream(items, filename, self.data_dir, key)
+    
+    def spill(self, name: str, key: Optional[Callable[[Any], Hashable]] = None, flush_every: int = 1) -> SpillFile:
+        """Open a new spill file in the run's spill/ folder (see utils/spill.py)."""
+        spill = SpillFile(os.path.join(self.data_dir, SPILL_DIR, f"{name}.jsonl"), key, flush_every)
+        self._spills.append(spill)
+        return spill
+    
+    def close_spills(self):
+        """Close the spill files opened for this run."""
+        for spill in self._spills:
+            spill.close()
+    
+    def remove_spills(self):
+        """Delete the run's spill files (the complete checkpoints hold the same items)."""
+        self.close_spills()
+        self._spills = []
+        shutil.rmtree(os.path.join(self.data_dir, SPILL_DIR), ignore_errors=True)
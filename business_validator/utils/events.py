@@ -0,0 +1,174 @@
+"""
+Progress events for validation runs.
+
+Every run has an EventBus (`RunContext.events`). The validator announces when
+a stage starts (with the number of items it will process), each time items
+finish (with exact done/total counts) and when the stage finishes.
+Subscribers are called in-process; with EVENT_LOG_ENABLED every event is also
+appended as a JSON line to the run's events.jsonl, so another process can
+follow a run by reading the lines added since its last read (read_events).
+"""
+
+import json
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+STAGE_STARTED = "stage_started"
+ITEM_DONE = "item_done"
+STAGE_FINISHED = "stage_finished"
+
+EVENTS_FILE = "events.jsonl"
+
+# Stage name -> (step, label, weight in the overall progress)
+STAGE_STEPS = {
+    "keywords": (1, "Generating keywords", 5),
+    "hn_search": (2, "Searching HackerNews", 20),
+    "reddit_search": (3, "Searching Reddit", 20),
+    "hn_comments": (4, "Fetching HN comment threads", 5),
+    "reddit_comments": (4, "Scraping Reddit comments", 10),
+    "hn_analysis": (5, "Analyzing HackerNews posts", 15),
+    "reddit_analysis": (6, "Analyzing Reddit posts", 15),
+    "final_analysis": (7, "Generating final report", 10)
+}
+TOTAL_STEPS = 7
+
+class EventBus:
+    """Thread-safe publisher of one run's progress events."""
+
+    def __init__(self, run_id: str, path: Optional[str] = None):
+        """
+        Args:
+            run_id: Run the events belong to
+            path: Optional append-only JSONL file that receives every event
+        """
+        self.run_id = run_id
+        self.path = path
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._seq = 0
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+        """Call `callback(event)` for every event from now on; returns the callback for unsubscribe()."""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def emit(self, kind: str, stage: str, **fields) -> Dict[str, Any]:
+        """Publish an event and update the progress snapshot.
+
+        Args:
+            kind: STAGE_STARTED, ITEM_DONE or STAGE_FINISHED
+            stage: Stage name (see STAGE_STEPS)
+            **fields: Event details such as done and total
+
+        Returns:
+            The published event
+        """
+        step, label, _ = STAGE_STEPS.get(stage, (None, stage, 0))
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "time": time.time(), "run_id": self.run_id, "kind": kind,
+                     "stage": stage, "step": step, "label": label, **fields}
+            state = self._stages.setdefault(stage, {"step": step, "label": label, "status": "pending", "done": 0, "total": None})
+            if kind == STAGE_STARTED:
+                state.update(status="running", done=0, total=fields.get("total"))
+                self._current = stage
+            elif kind == ITEM_DONE:
+                state.update(done=fields.get("done", state["done"]), total=fields.get("total", state["total"]))
+            elif kind == STAGE_FINISHED:
+                state["status"] = "finished"
+                if state["total"] is not None:
+                    state["done"] = state["total"]
+            subscribers = list(self._subscribers)
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(event, default=str) + "\n")
+                except OSError as e:
+                    logging.warning(f"Could not write progress event to {self.path}: {e}")
+
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logging.warning(f"Progress subscriber failed on {kind} {stage}: {e}")
+        return event
+
+    def stage_started(self, stage: str, total: Optional[int] = None) -> Dict[str, Any]:
+        """A stage begins; `total` is the number of items it will process, if it has items."""
+        return self.emit(STAGE_STARTED, stage, total=total)
+
+    def item_done(self, stage: str, done: int, total: Optional[int] = None) -> Dict[str, Any]:
+        """`done` of a stage's `total` items are finished."""
+        return self.emit(ITEM_DONE, stage, done=done, total=total)
+
+    def stage_finished(self, stage: str, **details) -> Dict[str, Any]:
+        """A stage is complete; details are stage results worth showing (e.g. posts found)."""
+        return self.emit(STAGE_FINISHED, stage, **details)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the progress so far: the current stage and each stage's status and counts."""
+        with self._lock:
+            return {
+                "seq": self._seq,
+                "stage": self._current,
+                "stages": {name: dict(state) for name, state in self._stages.items()}
+            }
+
+def overall_progress(snapshot: Dict[str, Any]) -> float:
+    """Fraction of the whole validation done (0-1), weighting stages by STAGE_STEPS."""
+    stages = snapshot.get("stages", {}) if snapshot else {}
+    total_weight = sum(weight for _, _, weight in STAGE_STEPS.values())
+    done_weight = 0.0
+    for name, (_, _, weight) in STAGE_STEPS.items():
+        state = stages.get(name)
+        if state is None:
+            continue
+        if state["status"] == "finished":
+            done_weight += weight
+        elif state["total"]:
+            done_weight += weight * min(1.0, state["done"] / state["total"])
+    return done_weight / total_weight
+
+def describe_progress(snapshot: Dict[str, Any]) -> str:
+    """One-line description of the current stage, e.g. "Step 5/7: Analyzing HackerNews posts (12/40)"."""
+    stage = snapshot.get("stage") if snapshot else None
+    if stage is None:
+        return "Starting..."
+    state = snapshot["stages"][stage]
+    text = f"Step {state['step']}/{TOTAL_STEPS}: {state['label']}"
+    if state["status"] == "finished":
+        return f"{text} - Completed"
+    if state["total"]:
+        return f"{text} ({state['done']}/{state['total']})"
+    return f"{text} - In progress..."
+
+def read_events(path: str, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Read the events appended to an events file since `offset`.
+
+    Args:
+        path: A run's events.jsonl
+        offset: Byte offset returned by the previous call (0 to read from the start)
+
+    Returns:
+        Tuple of (new events, offset to pass next time)
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], offset
+    # Leave a line that is still being written for the next call
+    complete = data[:data.rfind(b"\n") + 1]
+    events = [json.loads(line) for line in complete.splitlines() if line.strip()]
+    return events, offset + len(complete)
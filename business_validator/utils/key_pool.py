@@ -0,0 +1,167 @@
+"""
+API key pools with per-key concurrency and rate limits.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+class NoKeysConfiguredError(RuntimeError):
+    """Raised when a pool is used without any keys."""
+
+class KeyPool:
+    """Hand out API keys to callers, least-loaded first.
+
+    Each key has its own concurrency limit (requests in flight) and rate limit
+    (requests per rolling minute). Keys that hit a quota error are ejected for
+    a cooldown period and come back automatically afterwards.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        keys: List[str],
+        concurrency: int,
+        rpm: int = 0,
+        cooldown_seconds: float = 60
+    ):
+        """
+        Args:
+            name: Pool name used in logs
+            keys: API keys in the pool
+            concurrency: Maximum requests in flight per key
+            rpm: Maximum requests per minute per key (0 = unlimited)
+            cooldown_seconds: Default ejection time after a quota error
+        """
+        self.name = name
+        self.keys = list(dict.fromkeys(keys))
+        self.concurrency = max(1, concurrency)
+        self.rpm = rpm
+        self.cooldown_seconds = cooldown_seconds
+        self._cond = threading.Condition()
+        self._in_flight: Dict[str, int] = {key: 0 for key in self.keys}
+        self._recent: Dict[str, deque] = {key: deque() for key in self.keys}
+        self._ejected_until: Dict[str, float] = {key: 0.0 for key in self.keys}
+        self._key_limits: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def set_concurrency(self, concurrency: int):
+        """Change the default per-key concurrency limit."""
+        with self._cond:
+            self.concurrency = max(1, concurrency)
+            self._cond.notify_all()
+
+    def set_key_concurrency(self, key: str, concurrency: Optional[int]):
+        """Override one key's concurrency limit (None restores the default)."""
+        with self._cond:
+            if concurrency is None:
+                self._key_limits.pop(key, None)
+            elif key in self._in_flight:
+                self._key_limits[key] = max(1, concurrency)
+            self._cond.notify_all()
+
+    def _limit(self, key: str) -> int:
+        return self._key_limits.get(key, self.concurrency)
+
+    def capacity(self) -> int:
+        """Total requests the pool allows in flight across keys that are not ejected."""
+        now = time.monotonic()
+        with self._cond:
+            return sum(self._limit(key) for key in self.keys if self._ejected_until[key] <= now)
+
+    def _wait_time(self, key: str, now: float) -> float:
+        """Seconds until the key can take another request (0 if it can now)."""
+        if self._ejected_until[key] > now:
+            return self._ejected_until[key] - now
+        if self._in_flight[key] >= self._limit(key):
+            return float("inf")
+        recent = self._recent[key]
+        while recent and now - recent[0] >= 60:
+            recent.popleft()
+        if self.rpm and len(recent) >= self.rpm:
+            return 60 - (now - recent[0])
+        return 0.0
+
+    def _pick(self, preferred: Optional[str], now: float):
+        """Return (key, 0) for the least-loaded usable key, or (None, wait)."""
+        # A preferred key the pool does not hold (e.g. removed from the config) is ignored
+        candidates = [preferred] if preferred in self._in_flight else self.keys
+        best_key = None
+        best_load = None
+        min_wait = float("inf")
+        for key in candidates:
+            wait = self._wait_time(key, now)
+            if wait > 0:
+                min_wait = min(min_wait, wait)
+                continue
+            # Ties on in-flight load go to the key with the fewest recent requests
+            load = (self._in_flight[key] / self._limit(key), len(self._recent[key]))
+            if best_load is None or load < best_load:
+                best_key, best_load = key, load
+        return best_key, min_wait
+
+    @contextmanager
+    def acquire(self, preferred: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        """Reserve a key for one request.
+
+        Args:
+            preferred: Only use this key (e.g. one bound to provider-side state);
+                ignored if the pool does not hold it
+            timeout: Maximum seconds to wait for a free key (None waits forever)
+
+        Yields:
+            The API key to use
+        """
+        if not self.keys:
+            raise NoKeysConfiguredError(f"No API keys configured for {self.name}")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                key, wait = self._pick(preferred, now)
+                if key is not None:
+                    break
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError(f"No {self.name} key available within {timeout}s")
+                    wait = min(wait, deadline - now)
+                self._cond.wait(None if wait == float("inf") else wait)
+            self._in_flight[key] += 1
+            self._recent[key].append(now)
+
+        try:
+            yield key
+        finally:
+            with self._cond:
+                self._in_flight[key] -= 1
+                self._cond.notify_all()
+
+    def report_quota_error(self, key: str, cooldown_seconds: Optional[float] = None):
+        """Temporarily eject a key that returned a quota or rate-limit error."""
+        cooldown = self.cooldown_seconds if cooldown_seconds is None else cooldown_seconds
+        with self._cond:
+            if key not in self._ejected_until:
+                return
+            self._ejected_until[key] = time.monotonic() + cooldown
+            self._cond.notify_all()
+        logging.warning(f"{self.name} key ...{key[-4:]} ejected for {cooldown:.0f}s after a quota error")
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-key load snapshot (keys are masked) for metrics and logs."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                f"...{key[-4:]}": {
+                    "in_flight": self._in_flight[key],
+                    "concurrency": self._limit(key),
+                    "requests_last_minute": sum(1 for t in self._recent[key] if now - t < 60),
+                    "ejected": self._ejected_until[key] > now
+                }
+                for key in self.keys
+            }
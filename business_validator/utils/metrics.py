@@ -0,0 +1,68 @@
+"""
+Lightweight run metrics: counters, timings and sampled values.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from business_validator.utils.context import RunLocal
+
+class Metrics:
+    """Thread-safe collection of counters, timings and values for a validation run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded metrics."""
+        with self._lock:
+            self.counters: Dict[str, float] = {}
+            self.values: Dict[str, Dict[str, float]] = {}
+            self.info: Dict[str, Any] = {}
+
+    def increment(self, name: str, amount: float = 1):
+        """Increase a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_value(self, name: str, value: float):
+        """Record one sample of a value (latency, token count, ...)."""
+        with self._lock:
+            stats = self.values.setdefault(name, {"count": 0, "total": 0.0, "min": value, "max": value})
+            stats["count"] += 1
+            stats["total"] += value
+            stats["min"] = min(stats["min"], value)
+            stats["max"] = max(stats["max"], value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Record the wall-clock duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_value(name, time.perf_counter() - start)
+
+    def set_info(self, name: str, value: Any):
+        """Store a free-form, JSON-serializable value (e.g. a stage report)."""
+        with self._lock:
+            self.info[name] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable copy of all metrics with averages filled in."""
+        with self._lock:
+            values = {
+                name: dict(stats, avg=stats["total"] / stats["count"] if stats["count"] else 0.0)
+                for name, stats in self.values.items()
+            }
+            return {
+                "counters": dict(self.counters),
+                "values": values,
+                "info": dict(self.info)
+            }
+
+# Metrics for the current validation run (each RunContext has its own)
+metrics = RunLocal("metrics", Metrics())
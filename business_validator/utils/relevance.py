@@ -0,0 +1,135 @@
+"""
+Cheap lexical relevance scoring used to pre-filter scraped posts before any LLM call.
+"""
+
+import re
+import math
+import heapq
+from typing import Any, Dict, Iterable, List, Set
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "for",
+    "from", "has", "have", "how", "i", "in", "into", "is", "it", "its", "my",
+    "of", "on", "or", "our", "that", "the", "their", "this", "to", "was", "we",
+    "what", "when", "which", "who", "why", "will", "with", "you", "your"
+}
+
+def _normalize_token(token: str) -> str:
+    """Apply a very light stemming so 'ideas' matches 'idea'."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def search_key(keyword: str) -> str:
+    """Normalize a search keyword so equivalent searches share one fetch."""
+    return " ".join(keyword.lower().split())
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized, stopword-free tokens.
+
+    Args:
+        text: Raw text (titles may contain markdown/highlight markers)
+
+    Returns:
+        List of normalized tokens
+    """
+    if not text:
+        return []
+    return [
+        _normalize_token(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in STOPWORDS and len(token) > 1
+    ]
+
+def build_relevance_terms(business_idea: str, keywords: Iterable[str] = ()) -> Set[str]:
+    """Build the set of terms a relevant post is expected to mention.
+
+    Args:
+        business_idea: The business idea being validated
+        keywords: Search keywords generated for the idea
+
+    Returns:
+        Set of normalized terms
+    """
+    terms = set(tokenize(business_idea))
+    for keyword in keywords or ():
+        terms.update(tokenize(keyword))
+    return terms
+
+def score_relevance(text: str, terms: Set[str]) -> float:
+    """Score text by the fraction of relevance terms it mentions.
+
+    Args:
+        text: Text to score (e.g. title plus selftext)
+        terms: Terms from build_relevance_terms
+
+    Returns:
+        Relevance score between 0.0 and 1.0
+    """
+    if not terms:
+        return 0.0
+    tokens = set(tokenize(text))
+    return len(tokens & terms) / len(terms)
+
+def post_text(post: dict) -> str:
+    """Return the text of a scraped post used for relevance triage."""
+    return f"{post.get('title', '')} {post.get('selftext', '')}"
+
+def engagement_weight(post: dict) -> float:
+    """Return a dampened engagement weight (>= 1) from upvotes/points and comment count."""
+    votes = max(post.get('upvotes', post.get('points', 0)) or 0, 0)
+    comments = max(post.get('comments', 0) or 0, 0)
+    return 1.0 + math.log1p(votes) + math.log1p(comments)
+
+def _keep_top(heap: list, limit: int, rank: tuple, value: Any):
+    """Keep the `limit` highest-ranked values seen so far in a min-heap of (rank, value)."""
+    if len(heap) < limit:
+        heapq.heappush(heap, (rank, value))
+    elif limit > 0 and rank > heap[0][0]:
+        heapq.heapreplace(heap, (rank, value))
+
+def rank_spilled_posts_for_comments(
+    posts: Any,
+    terms: Set[str],
+    limit: int,
+    min_relevance: float,
+    output: Any
+) -> Dict[str, int]:
+    """Select the posts worth fetching comment pages for from a spill file.
+
+    Posts are triaged on title/selftext relevance first; survivors are ranked
+    by relevance x engagement so popular but off-topic threads do not take up
+    the comment budget. The ranking is one pass that holds only the positions
+    of the top `limit` posts; the selected posts are then copied from `posts`
+    to `output` best first.
+
+    Args:
+        posts: SpillFile of scraped posts
+        terms: Terms from build_relevance_terms
+        limit: Maximum number of posts to fetch comments for
+        min_relevance: Minimum pre-filter relevance for a post to pass triage
+        output: SpillFile receiving the selected posts
+
+    Returns:
+        Fetch statistics: candidates, passed_triage and comment_fetches
+    """
+    # Ranks end with -position, so ties keep the earlier post (as a stable sort would)
+    top = []
+    candidates = passed = 0
+    for position, post in enumerate(posts):
+        relevance = score_relevance(post_text(post), terms)
+        candidates += 1
+        if relevance >= min_relevance:
+            passed += 1
+            _keep_top(top, limit, (relevance * engagement_weight(post), -position), position)
+
+    positions = [position for _, position in sorted(top, reverse=True)]
+    for post in posts.read(positions):
+        post['relevance'] = round(score_relevance(post_text(post), terms), 3)
+        output.append(post)
+    output.flush()
+    return {"candidates": candidates, "passed_triage": passed, "comment_fetches": len(positions)}
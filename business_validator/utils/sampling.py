@@ -0,0 +1,226 @@
+"""
+Stratified sampling of collected posts for LLM analysis.
+
+A keyword can return hundreds of posts, and analyzing every one is wasteful;
+cutting by upvotes alone biases the analysis towards viral threads. Instead,
+posts are split into strata by platform, search keyword, subreddit and
+engagement band, and ANALYSIS_BUDGET posts are drawn at random across them:
+every stratum gets one post first (the largest strata first when the budget
+is smaller than the number of strata), the rest of the budget goes to the
+strata with the smallest sampled share, so the allocation is proportional to
+stratum size.
+
+The analyses of the sample then stand for all collected posts: the share of
+relevant posts is extrapolated stratum by stratum (weighted by stratum size),
+with a 95% confidence interval. Each stratum's rate rests on the sampled posts
+it actually had analyzed, which can be fewer than its allocation (early
+stopping, failed analyses).
+
+    sample = draw_stratified_sample({"Reddit": posts}, {"Reddit": sampled}, budget=80, bands=[10, 100], seed=run_id)
+    ...
+    sample.estimate(analyses)["Reddit"]   # {"relevance_rate": 0.41, "low": 0.3, "high": 0.52, ...}
+"""
+
+import math
+import heapq
+import random
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from business_validator.utils.spill import SpillFile
+
+Z_95 = 1.96
+
+# (platform, keyword, subreddit, engagement band)
+Stratum = Tuple[str, str, str, str]
+
+def engagement_band(post: dict, bands: Sequence[int]) -> str:
+    """Name the engagement band of a post's upvotes (Reddit) or points (HN), e.g. "10-99"."""
+    votes = max(post.get('upvotes', post.get('points', 0)) or 0, 0)
+    lower = 0
+    for upper in sorted(bands):
+        if votes < upper:
+            return f"{lower}-{upper - 1}"
+        lower = upper
+    return f"{lower}+"
+
+def stratum_of(post: dict, platform: str, bands: Sequence[int]) -> Stratum:
+    """Return the stratum a post belongs to."""
+    return (platform, post.get('keyword') or "", post.get('subreddit') or "", engagement_band(post, bands))
+
+def allocate(sizes: Dict[Any, int], budget: int) -> Dict[Any, int]:
+    """Split a sample budget over strata of the given sizes.
+
+    Each slot goes to the stratum with the smallest sampled share (the larger
+    stratum on ties), so every stratum gets one slot before any gets two and
+    the allocation approaches proportional allocation. No stratum gets more
+    slots than it has posts.
+    """
+    allocation = {stratum: 0 for stratum in sizes}
+    heap = [(0.0, -size, i, stratum) for i, (stratum, size) in enumerate(sizes.items()) if size > 0]
+    heapq.heapify(heap)
+    for _ in range(max(0, budget)):
+        if not heap:
+            break
+        _, negative_size, i, stratum = heapq.heappop(heap)
+        allocation[stratum] += 1
+        if allocation[stratum] < -negative_size:
+            heapq.heappush(heap, (allocation[stratum] / -negative_size, negative_size, i, stratum))
+    return allocation
+
+def _estimate(strata: List[Tuple[int, int, int, int]]) -> Dict[str, Any]:
+    """Stratified estimate of a proportion.
+
+    Args:
+        strata: (stratum size, sampled posts, analyzed posts, relevant analyzed posts) per stratum
+
+    Returns:
+        The estimate, its 95% confidence interval and the share of posts in analyzed strata
+    """
+    population = sum(size for size, _, _, _ in strata)
+    sampled = sum(allocated for _, allocated, _, _ in strata)
+    covered = [(size, n, relevant) for size, _, n, relevant in strata if n > 0]
+    covered_population = sum(size for size, _, _ in covered)
+    if not covered_population:
+        return {"posts": population, "sampled": sampled, "analyzed": 0, "relevance_rate": None, "low": None,
+                "high": None, "estimated_relevant_posts": None, "coverage": 0.0}
+    rate = variance = 0.0
+    for size, n, relevant in covered:
+        weight = size / covered_population
+        rate += weight * relevant / n
+        # Smoothed so that strata with all (or no) relevant posts still carry uncertainty
+        smoothed = (relevant + 0.5) / (n + 1)
+        finite_population = max(0.0, 1 - n / size) if size else 0.0
+        variance += weight * weight * finite_population * smoothed * (1 - smoothed) / n
+    margin = Z_95 * math.sqrt(variance)
+    return {
+        "posts": population,
+        "sampled": sampled,
+        "analyzed": sum(n for _, n, _ in covered),
+        "relevance_rate": round(rate, 3),
+        "low": round(max(0.0, rate - margin), 3),
+        "high": round(min(1.0, rate + margin), 3),
+        "estimated_relevant_posts": round(rate * population),
+        "coverage": round(covered_population / population, 3)
+    }
+
+class StratifiedSample:
+    """A drawn sample: its strata, and which stratum each sampled post came from."""
+
+    def __init__(self, budget: int, sizes: Dict[Stratum, int], allocation: Dict[Stratum, int]):
+        self.budget = budget
+        self.sizes = sizes
+        self.allocation = allocation
+        self.post_strata: Dict[str, Stratum] = {}
+
+    def __len__(self) -> int:
+        return sum(self.allocation.values())
+
+    def plan(self) -> Dict[str, Any]:
+        """Return the strata with their sizes and sampled posts (JSON-serializable)."""
+        return {
+            "budget": self.budget,
+            "posts": sum(self.sizes.values()),
+            "sampled": len(self),
+            "strata": [
+                {"platform": platform, "keyword": keyword, "subreddit": subreddit, "engagement": band,
+                 "posts": size, "sampled": self.allocation[(platform, keyword, subreddit, band)]}
+                for (platform, keyword, subreddit, band), size in self.sizes.items()
+            ]
+        }
+
+    def estimate(self, analyses: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Extrapolate the relevance rate of all collected posts from the sample's analyses.
+
+        Args:
+            analyses: Analyses of sampled posts (dicts with post_url and relevant)
+
+        Returns:
+            {"HackerNews": estimate, "Reddit": estimate, "overall": estimate}; an
+            estimate holds relevance_rate with its 95% interval (low, high), the
+            posts it stands for, the posts sampled and those actually analyzed,
+            and coverage, the share of posts in strata with at least one analysis
+        """
+        # A stratum's n is its sampled posts that were analyzed (once each), not its allocation
+        counts: Dict[Stratum, List[int]] = {}
+        counted = set()
+        for analysis in analyses:
+            post_url = analysis.get("post_url")
+            stratum = self.post_strata.get(post_url)
+            if stratum is None or post_url in counted:
+                continue
+            counted.add(post_url)
+            count = counts.setdefault(stratum, [0, 0])
+            count[0] += 1
+            count[1] += 1 if analysis.get("relevant") else 0
+
+        rows = {stratum: (size, self.allocation[stratum], *counts.get(stratum, (0, 0)))
+                for stratum, size in self.sizes.items()}
+        estimates = {}
+        for platform in sorted({stratum[0] for stratum in rows}):
+            estimates[platform] = _estimate([row for stratum, row in rows.items() if stratum[0] == platform])
+        estimates["overall"] = _estimate(list(rows.values()))
+        return estimates
+
+def draw_stratified_sample(
+    posts: Dict[str, SpillFile],
+    outputs: Dict[str, SpillFile],
+    budget: int,
+    bands: Sequence[int],
+    seed: Optional[Any] = None
+) -> StratifiedSample:
+    """Draw a stratified random sample of posts in two passes over their spill files.
+
+    The first pass counts the posts per stratum and splits the budget; the
+    second keeps a reservoir of positions per stratum, so memory grows with
+    the budget, not with the number of posts. The sampled posts are written
+    to `outputs`, interleaving the strata, so any prefix of a platform's
+    sample is spread over its strata.
+
+    Args:
+        posts: Collected posts per platform
+        outputs: Spill file per platform receiving the sampled posts
+        budget: Posts to sample over all platforms
+        bands: Upvote/point thresholds between engagement bands
+        seed: Random seed (e.g. the run id, so a run's sample is reproducible)
+
+    Returns:
+        The StratifiedSample, for its plan and estimates
+    """
+    sizes: Dict[Stratum, int] = {}
+    for platform, platform_posts in posts.items():
+        for post in platform_posts:
+            stratum = stratum_of(post, platform, bands)
+            sizes[stratum] = sizes.get(stratum, 0) + 1
+    sample = StratifiedSample(budget, sizes, allocate(sizes, budget))
+
+    rng = random.Random(seed)
+    for platform, platform_posts in posts.items():
+        reservoirs: Dict[Stratum, List[int]] = {}
+        seen: Dict[Stratum, int] = {}
+        for position, post in enumerate(platform_posts):
+            stratum = stratum_of(post, platform, bands)
+            wanted = sample.allocation[stratum]
+            if not wanted:
+                continue
+            seen[stratum] = seen.get(stratum, 0) + 1
+            reservoir = reservoirs.setdefault(stratum, [])
+            if len(reservoir) < wanted:
+                reservoir.append(position)
+            else:
+                slot = rng.randrange(seen[stratum])
+                if slot < wanted:
+                    reservoir[slot] = position
+
+        # Round-robin over the strata, each in random order
+        for reservoir in reservoirs.values():
+            rng.shuffle(reservoir)
+        order = [
+            (reservoir[turn], stratum)
+            for turn in range(max(map(len, reservoirs.values()), default=0))
+            for stratum, reservoir in reservoirs.items() if turn < len(reservoir)
+        ]
+        for (_, stratum), post in zip(order, platform_posts.read(position for position, _ in order)):
+            outputs[platform].append(post)
+            sample.post_strata[post.get('url')] = stratum
+        outputs[platform].flush()
+    return sample
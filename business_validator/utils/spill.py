@@ -0,0 +1,117 @@
+"""
+Append-only spill files for the items of a run.
+
+Posts, comment threads and analyses are written to JSON Lines files in the
+run's spill/ folder as they are produced, instead of being collected in
+lists, and read back lazily whenever a later step needs them. A run's memory
+then no longer grows with the number of posts it collects; only the keys
+used to deduplicate posts are kept in memory.
+
+    posts = run.checkpoints.spill("02_hn_posts", key=post_key)
+    posts.extend(new_posts)          # duplicates (by key) are dropped
+    for post in posts:               # streamed from disk
+        ...
+"""
+
+import os
+import json
+import threading
+from array import array
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
+
+SPILL_DIR = "spill"
+
+class SpillFile:
+    """One list of a run's items, kept on disk as JSON Lines.
+
+    Appends go to the end of the file; iterating reads the file from the
+    start, so a spill file can be read any number of times, also while it is
+    still being written. Items can also be read by position (read()), as the
+    file offset of every item is kept. Every `flush_every` appends the file
+    is flushed, so the file doubles as the stage's partial checkpoint.
+    """
+
+    def __init__(self, path: str, key: Optional[Callable[[Any], Hashable]] = None, flush_every: int = 1):
+        """
+        Args:
+            path: The JSONL file (created, or truncated if it exists)
+            key: Optional function giving an item's identity; items whose key
+                was appended before are dropped
+            flush_every: Appends between flushes to disk
+        """
+        self.path = path
+        self.key = key
+        self.flush_every = max(1, flush_every)
+        self._keys = set()
+        self._offsets = array("q")
+        self._size = 0
+        self._unflushed = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", newline="\n")
+
+    def append(self, item: Any) -> bool:
+        """Append an item; returns False if it was dropped as a duplicate."""
+        line = json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self.key is not None:
+                item_key = self.key(item)
+                if item_key in self._keys:
+                    return False
+                self._keys.add(item_key)
+            self._file.write(line)
+            self._offsets.append(self._size)
+            self._size += len(line.encode("utf-8"))
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._flush_locked()
+        return True
+
+    def seen(self, item_key: Hashable) -> bool:
+        """Return whether an item with this key was appended (needs a key function)."""
+        with self._lock:
+            return item_key in self._keys
+
+    def extend(self, items: Iterable[Any]) -> int:
+        """Append several items; returns how many were not duplicates."""
+        return sum(1 for item in items if self.append(item))
+
+    def flush(self):
+        """Write buffered items to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._file.closed:
+            self._file.flush()
+        self._unflushed = 0
+
+    def close(self):
+        """Flush and close the file for writing (it can still be read)."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+            self._unflushed = 0
+
+    def read(self, positions: Iterable[int]) -> Iterator[Any]:
+        """Yield the items at the given positions (0-based), in the order given."""
+        self.flush()
+        with open(self.path, "rb") as f:
+            for position in positions:
+                f.seek(self._offsets[position])
+                yield json.loads(f.readline())
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[Any]:
+        self.flush()
+        with self._lock:
+            count = len(self._offsets)
+        # Only the items appended so far; later appends belong to the next read
+        with open(self.path, "r", encoding="utf-8", newline="\n") as f:
+            for _, line in zip(range(count), f):
+                yield json.loads(line)
+
+    def __repr__(self) -> str:
+        return f"SpillFile({self.path!r}, {len(self)} items)"
@@ -5,226 +5,436 @@ This module provides the main entry point for validating business ideas
 by scraping and analyzing data from HackerNews and Reddit.
 """
 
-import time
-import logging
 import traceback
-from typing import List
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sized
 
-from business_validator.config import (
-    MAX_PAGES_PER_KEYWORD_HN,
-    MAX_PAGES_PER_KEYWORD_REDDIT,
-    MAX_POSTS_TO_ANALYZE,
-    HN_DELAY,
-    REDDIT_DELAY,
-    CHECKPOINT_INTERVAL
-)
 from business_validator.models import CombinedAnalysis
-from business_validator.utils.environment import setup_environment, save_checkpoint, load_checkpoint
+from business_validator.run_context import RunContext, RunCancelled
+from business_validator.stages import InProcessStages, StageStopped, merge_policies
+from business_validator.utils.spill import SpillFile
+from business_validator.utils.sampling import draw_stratified_sample
 from business_validator.utils.reporting import print_validation_report
+from business_validator.utils.relevance import build_relevance_terms, rank_spilled_posts_for_comments
 
 from business_validator.analyzers.keyword_generator_simple import generate_keywords
-from business_validator.analyzers.hackernews_analyzer import analyze_hn_post
-from business_validator.analyzers.reddit_analyzer import analyze_reddit_post
+from business_validator.analyzers.triage import (
+    iter_triage,
+    rejected_hn_analysis,
+    rejected_reddit_analysis
+)
+from business_validator.analyzers.summary import AnalysisSummary
+from business_validator.analyzers.convergence import ConvergenceMonitor
 from business_validator.analyzers.combined_analyzer import (
     generate_final_analysis,
     create_fallback_analysis,
     create_minimal_analysis
 )
 
-from business_validator.scrapers.hackernews import scrape_hackernews
-from business_validator.scrapers.reddit import (
-    scrape_reddit_search,
-    scrape_reddit_post_comments
-)
+from business_validator.scrapers.articles import enrich_post_stream
+from business_validator.scrapers.page_policy import post_key
+from business_validator.scrapers.transport import probe_account
 
-def validate_business_idea(business_idea: str) -> CombinedAnalysis:
+def validate_business_idea(
+    business_idea: str,
+    on_partial_result: Optional[Callable[[str, Any], None]] = None,
+    run: Optional[RunContext] = None,
+    keywords: Optional[List[str]] = None,
+    stages: Optional[Any] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_result: Optional[Callable[[str, Any], None]] = None
+) -> CombinedAnalysis:
     """Main function to validate a business idea using HackerNews and Reddit.
     
+    Safe to call from several threads at once: each call works in its own
+    RunContext, while key pools, the HTTP session and caches are shared.
+    
     Args:
         business_idea: The business idea to validate
+        on_partial_result: Optional callback called with (field name, value) for
+            each field of the final report as soon as it has been generated
+        run: Optional RunContext for this idea (e.g. with config overrides, or
+            to know the data directory up front); created if omitted
+        keywords: Optional pre-generated search keywords (skips step 1)
+        stages: Optional runner for steps 2-6 (default: InProcessStages); the
+            job service passes a ShardedStages to fan them out to worker processes
+        on_progress: Optional callback called with every progress event (stage
+            started, items done with counts, stage finished); see utils/events.py
+        on_result: Optional callback called with (kind, value) for intermediate
+            results as soon as they are available: "keywords" (the list),
+            "hn_post"/"reddit_post" (each deduplicated post) and
+            "hn_analysis"/"reddit_analysis" (each post analysis as a dict with
+            the analyzed post's "post_url"); see business_validator/streaming.py
         
     Returns:
         CombinedAnalysis object with validation results
+        
+    Raises:
+        RunCancelled: If run.cancel() was called while the validation ran
     """
     # Validate API keys first
     from business_validator.config import validate_api_keys
     validate_api_keys()
     
-    # Setup environment for this run
-    env = setup_environment(business_idea)
-    run_id = env["run_id"]
-    data_dir = env["data_dir"]
+    # Each run gets its own log file, checkpoints, metrics and raw archive
+    run = run or RunContext(business_idea)
+    if on_progress:
+        run.events.subscribe(on_progress)
+    try:
+        with run:
+            return _run_validation(run, business_idea, on_partial_result, keywords, stages or InProcessStages(), on_result)
+    finally:
+        if on_progress:
+            run.events.unsubscribe(on_progress)
+
+def _run_stage(
+    run: RunContext,
+    stages: Any,
+    stage_name: str,
+    items: Sized,
+    payload: Dict[str, Any],
+    output: SpillFile,
+    on_output: Optional[Callable[[List[Any]], None]] = None,
+    monitor: Optional[ConvergenceMonitor] = None
+) -> List[Dict[str, Any]]:
+    """Run one of steps 2-6, publishing its progress events.
+    
+    The stage's output goes to a spill file, which is flushed to disk as the
+    stage goes (its flush interval doubles as the partial checkpoint interval).
+    
+    Args:
+        run: The active RunContext
+        stages: Stage runner (InProcessStages or ShardedStages)
+        stage_name: Registered stage to run
+        items: Keywords or posts the stage works on (a list or a SpillFile)
+        payload: Run-wide inputs passed to the stage
+        output: Spill file receiving the stage's output items
+        on_output: Optional callback called with the new output items as input items finish
+        monitor: Optional ConvergenceMonitor that stops the stage once its outputs have converged
+        
+    Returns:
+        The stage's shard results (without their items)
+    """
+    total = len(items)
+    
+    def progress(done: int, new_items: List[Any]):
+        run.events.item_done(stage_name, done, total)
+        if on_output and new_items:
+            on_output(new_items)
+        if monitor and monitor.update(done, new_items):
+            raise StageStopped(stage_name)
+    
+    run.events.stage_started(stage_name, total=total)
+    try:
+        results = stages.map(run, stage_name, items, payload, progress, output)
+    except StageStopped:
+        report = monitor.report()
+        run.logger.info(f"   {report['platform']} analyses converged after {report['posts_analyzed']}/{total} posts "
+                        f"({report['relevant']} relevant); skipping {report['analyses_saved']}")
+        results = []
+    output.flush()
+    fields = {"stopped_early": True, "skipped": monitor.report()["analyses_saved"]} if monitor and monitor.converged else {}
+    run.events.stage_finished(stage_name, outputs=len(output), **fields)
+    return results
+
+def _new_items(on_result: Optional[Callable[[str, Any], None]], kind: str, key: Optional[Callable[[Any], Any]] = None) -> Optional[Callable[[List[Any]], None]]:
+    """Return a callback that passes new stage output items to on_result(kind, item).
+
+    With a key, items seen before are skipped: search shards run separately
+    can find the same post, so posts are recognized by key.
+    """
+    if on_result is None:
+        return None
+    seen = set()
+    
+    def emit(items: List[Any]):
+        for item in items:
+            if key is not None:
+                item_key = key(item)
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+            on_result(kind, item)
+    
+    return emit
+
+def _summarized(summary: AnalysisSummary, emit: Optional[Callable[[List[Any]], None]]) -> Callable[[List[Any]], None]:
+    """Return a stage output callback that folds new analyses into `summary`, then calls `emit`."""
+    def on_output(analyses: List[Any]):
+        for analysis in analyses:
+            summary.add(analysis)
+        if emit:
+            emit(analyses)
+    
+    return on_output
+
+def _record_early_stop(run: RunContext, monitor: Optional[ConvergenceMonitor], prefix: str, early_stops: Dict[str, Any]):
+    """Record where an analysis stage stopped (or that it did not) and the analyses that saved."""
+    if monitor is None:
+        return
+    report = monitor.report()
+    early_stops[report["platform"]] = report
+    run.metrics.increment(f"{prefix}.analyses_saved", report["analyses_saved"])
+
+def _analysis_inputs(
+    run: RunContext,
+    name: str,
+    posts: Iterable[dict],
+    analyses: SpillFile,
+    rejected_analysis: Callable[[], Any],
+    business_idea: str,
+    platform: str,
+    kind: str,
+    on_result: Optional[Callable[[str, Any], None]]
+) -> SpillFile:
+    """Triage posts (in cascade mode) and return the ones to analyze fully.
+    
+    Analyses of triage-rejected posts go to `analyses` (and the platform's
+    running summary) right away; survivors are spilled to their own file,
+    which the analysis stage then reads.
+    """
+    if not run.config.CASCADE_MODE and isinstance(posts, SpillFile):
+        return posts
+    survivors = run.checkpoints.spill(name, flush_every=run.config.CHECKPOINT_INTERVAL)
+    verdicts = iter_triage(posts, business_idea, platform) if run.config.CASCADE_MODE else ((post, False) for post in posts)
+    for post, rejected in verdicts:
+        if not rejected:
+            survivors.append(post)
+            continue
+        analysis = dict(rejected_analysis().dict(), post_url=post.get('url'))
+        analyses.append(analysis)
+        run.summaries[platform].add(analysis)
+        if on_result:
+            on_result(kind, analysis)
+    survivors.flush()
+    return survivors
+
+def _in_sample_order(sample: SpillFile, with_comments: SpillFile) -> Iterable[dict]:
+    """Yield the sampled posts in the order they were drawn, with their comment threads where fetched.
+    
+    The sample interleaves its strata, each in random order, so wherever early
+    stopping cuts the analysis, the posts analyzed are a random part of every
+    stratum rather than the best-ranked ones.
+    """
+    threads = {post_key(post): post for post in with_comments}
+    for post in sample:
+        yield threads.get(post_key(post), post)
+
+def _run_validation(
+    run: RunContext,
+    business_idea: str,
+    on_partial_result: Optional[Callable[[str, Any], None]],
+    keywords: Optional[List[str]],
+    stages: Any,
+    on_result: Optional[Callable[[str, Any], None]] = None
+) -> CombinedAnalysis:
+    """Run the validation steps inside an active RunContext."""
+    config = run.config
+    
+    # Size scraper concurrency from the ScraperAPI account (static config if unavailable)
+    probe_account()
     
-    logging.info(f"[STARTING] Validating business idea: {business_idea}")
+    run.logger.info(f"[STARTING] Validating business idea: {business_idea}")
     
     try:
         # Step 1: Generate keywords
-        logging.info("\n[STEP 1] Generating search keywords...")
-        keywords = generate_keywords(business_idea)
-        logging.info(f"Generated keywords: {keywords}")
+        run.logger.info("\n[STEP 1] Generating search keywords...")
+        run.events.stage_started("keywords")
+        if keywords:
+            run.logger.info(f"Using planned keywords: {keywords}")
+        else:
+            keywords = generate_keywords(business_idea)
+            run.logger.info(f"Generated keywords: {keywords}")
         
         # Save keywords checkpoint
-        save_checkpoint({"keywords": keywords, "business_idea": business_idea}, 
-                        "01_keywords.json", data_dir)
+        run.checkpoints.save({"keywords": keywords, "business_idea": business_idea}, 
+                              "01_keywords.json")
+        run.events.stage_finished("keywords", outputs=len(keywords))
+        if on_result:
+            on_result("keywords", keywords)
+        
+        relevance_terms = build_relevance_terms(business_idea, keywords)
+        payload = {"business_idea": business_idea, "keywords": keywords, "config_overrides": config.overrides()}
+        # Posts and analyses are spilled to the run's spill/ folder as they come in and
+        # streamed back from there; only post keys and small summaries stay in memory
+        every = config.CHECKPOINT_INTERVAL
         
         # Step 2: Scrape HackerNews
-        logging.info("\n[STEP 2] Searching HackerNews...")
-        hn_posts = []
-        for keyword in keywords:
-            logging.info(f"   Searching HN for: '{keyword}'")
-            
-            for page in range(MAX_PAGES_PER_KEYWORD_HN):
-                logging.info(f"      Scraping page {page}...")
-                results = scrape_hackernews(keyword, page)
-                
-                if not results['posts']:
-                    logging.info(f"      No more results on page {page}")
-                    break
-                    
-                hn_posts.extend(results['posts'])
-                
-                # Save checkpoint periodically
-                if len(hn_posts) % CHECKPOINT_INTERVAL == 0:
-                    save_checkpoint({"hn_posts": hn_posts}, 
-                                    f"02_hn_posts_partial_{len(hn_posts)}.json", data_dir)
-                
-                time.sleep(HN_DELAY)
-        
-        logging.info(f"   [STATS] Total HN posts collected: {len(hn_posts)}")
+        run.logger.info("\n[STEP 2] Searching HackerNews...")
+        # Flushed after every keyword; posts are streamed as soon as they are found
+        hn_posts = run.checkpoints.spill("02_hn_posts", key=post_key)
+        hn_policy = merge_policies(_run_stage(
+            run, stages, "hn_search", keywords, payload, hn_posts, _new_items(on_result, "hn_post", post_key)
+        ), "HackerNews", len(hn_posts))
+        
+        run.logger.info(f"   [STATS] Total HN posts collected: {len(hn_posts)} "
+                     f"from {hn_policy['pages_fetched']} pages")
         
         # Save HN posts checkpoint
-        save_checkpoint({"hn_posts": hn_posts}, "02_hn_posts_complete.json", data_dir)
+        run.checkpoints.save_stream(hn_posts, "02_hn_posts_complete.json", "hn_posts")
+        run.checkpoints.save(hn_policy, "02_hn_page_policy.json")
         
         # Step 3: Scrape Reddit
-        logging.info("\n[STEP 3] Searching Reddit...")
-        reddit_posts = []
-        for keyword in keywords:
-            logging.info(f"   Searching Reddit for: '{keyword}'")
-            
-            for page in range(MAX_PAGES_PER_KEYWORD_REDDIT):
-                logging.info(f"      Scraping page {page}...")
-                results = scrape_reddit_search(keyword, page)
-                
-                if not results['posts']:
-                    logging.info(f"      No more results on page {page}")
-                    break
-                    
-                reddit_posts.extend(results['posts'])
-                
-                # Save checkpoint periodically
-                if len(reddit_posts) % CHECKPOINT_INTERVAL == 0:
-                    save_checkpoint({"reddit_posts": reddit_posts}, 
-                                    f"03_reddit_posts_partial_{len(reddit_posts)}.json", data_dir)
-                
-                time.sleep(REDDIT_DELAY)
-        
-        logging.info(f"   [STATS] Total Reddit posts collected: {len(reddit_posts)}")
+        run.logger.info("\n[STEP 3] Searching Reddit...")
+        run.check_cancelled()
+        reddit_posts = run.checkpoints.spill("03_reddit_posts", key=post_key)
+        reddit_policy = merge_policies(_run_stage(
+            run, stages, "reddit_search", keywords, payload, reddit_posts, _new_items(on_result, "reddit_post", post_key)
+        ), "Reddit", len(reddit_posts))
+        
+        run.logger.info(f"   [STATS] Total Reddit posts collected: {len(reddit_posts)} "
+                     f"from {reddit_policy['pages_fetched']} pages")
         
         # Save Reddit posts checkpoint
-        save_checkpoint({"reddit_posts": reddit_posts}, "03_reddit_posts_complete.json", data_dir)
+        run.checkpoints.save_stream(reddit_posts, "03_reddit_posts_complete.json", "reddit_posts")
+        run.checkpoints.save(reddit_policy, "03_reddit_page_policy.json")
         
-        # Step 4: Scrape Reddit comments for top posts
-        logging.info(f"\n[STEP 4] Scraping comments for top {MAX_POSTS_TO_ANALYZE} Reddit posts...")
-        reddit_posts_with_comments = []
+        # Step 4: Sample posts for analysis and scrape their comment threads
+        run.logger.info("\n[STEP 4] Sampling posts and scraping comment threads...")
+        run.check_cancelled()
         
-        # Sort by upvotes and take top posts
-        reddit_posts.sort(key=lambda x: x.get('upvotes', 0), reverse=True)
-        top_reddit_posts = reddit_posts[:MAX_POSTS_TO_ANALYZE]
+        # A stratified random sample of ANALYSIS_BUDGET posts is analyzed and stands for all collected posts
+        hn_sample = run.checkpoints.spill("04_hn_sample")
+        reddit_sample = run.checkpoints.spill("04_reddit_sample")
+        sample = draw_stratified_sample(
+            {"HackerNews": hn_posts, "Reddit": reddit_posts}, {"HackerNews": hn_sample, "Reddit": reddit_sample},
+            config.ANALYSIS_BUDGET, config.SAMPLE_ENGAGEMENT_BANDS, seed=run.run_id
+        )
+        sample_plan = sample.plan()
+        run.checkpoints.save(sample_plan, "04_sample_plan.json")
+        run.logger.info(f"   [STATS] Sampled {len(hn_sample)}/{len(hn_posts)} HN and {len(reddit_sample)}/{len(reddit_posts)} "
+                     f"Reddit posts from {len(sample_plan['strata'])} strata (budget {config.ANALYSIS_BUDGET})")
         
-        for i, post in enumerate(top_reddit_posts):
-            logging.info(f"   Scraping comments {i+1}/{len(top_reddit_posts)}: {post['title'][:50]}...")
-            comments = scrape_reddit_post_comments(post['url'])
-            post['comments_data'] = comments
-            reddit_posts_with_comments.append(post)
-            
-            # Save checkpoint periodically
-            if (i+1) % CHECKPOINT_INTERVAL == 0 or i == len(top_reddit_posts) - 1:
-                save_checkpoint({"reddit_posts_with_comments": reddit_posts_with_comments}, 
-                                f"04_reddit_comments_partial_{i+1}.json", data_dir)
-            
-            time.sleep(REDDIT_DELAY)
+        # HN: one Algolia items request per story returns the whole thread
+        top_hn_posts = run.checkpoints.spill("04_hn_top_posts")
+        rank_spilled_posts_for_comments(hn_sample, relevance_terms, config.HN_COMMENT_POSTS, 0.0, top_hn_posts)
+        
+        # Optional: read the articles the top stories link to
+        if config.ENRICH_ARTICLES:
+            enriched_posts = run.checkpoints.spill("04_hn_top_posts_enriched")
+            article_stats = enrich_post_stream(top_hn_posts, enriched_posts)
+            top_hn_posts = enriched_posts
+            run.metrics.set_info("article_enrichment", article_stats)
+            run.logger.info(f"   [STATS] Enriched {article_stats['enriched']}/{article_stats['candidates']} linked articles "
+                         f"({article_stats['downloaded']} downloaded, {article_stats['cache_hits']} cached, "
+                         f"{article_stats['skipped_over_budget']} over budget)")
+        
+        run.logger.info(f"   Fetching HN comment threads for {len(top_hn_posts)} stories...")
+        hn_posts_with_comments = run.checkpoints.spill("04_hn_comments", key=post_key, flush_every=every)
+        _run_stage(run, stages, "hn_comments", top_hn_posts, payload, hn_posts_with_comments)
+        run.logger.info(f"   [STATS] {sum(1 for p in hn_posts_with_comments if p['comments_data'])} HN stories with comments")
+        run.checkpoints.save_stream(hn_posts_with_comments, "04_hn_comments_complete.json", "hn_posts_with_comments")
+        
+        # Reddit: comments for the sampled posts that pass triage on title/selftext, best first
+        top_reddit_posts = run.checkpoints.spill("04_reddit_top_posts")
+        fetch_stats = rank_spilled_posts_for_comments(
+            reddit_sample, relevance_terms, len(reddit_sample), config.REDDIT_TRIAGE_MIN_RELEVANCE, top_reddit_posts
+        )
+        # Every sampled post would get its comments without triage, so what triage saves is the rejected posts
+        triage_stats = {
+            "candidates": fetch_stats["candidates"],
+            "passed_triage": fetch_stats["passed_triage"],
+            "comment_fetches": fetch_stats["comment_fetches"],
+            "comment_fetches_skipped": fetch_stats["candidates"] - fetch_stats["comment_fetches"]
+        }
+        run.metrics.set_info("reddit_comment_triage", triage_stats)
+        run.metrics.increment("reddit.comment_fetches_skipped", triage_stats["comment_fetches_skipped"])
+        run.logger.info(f"   [STATS] {triage_stats['passed_triage']}/{triage_stats['candidates']} sampled Reddit posts passed triage; "
+                     f"fetching comments for {triage_stats['comment_fetches']} "
+                     f"(skipped {triage_stats['comment_fetches_skipped']} off-topic posts; they are analyzed without comments)")
+        
+        # Comment pages are independent, so they are fetched concurrently
+        reddit_posts_with_comments = run.checkpoints.spill("04_reddit_comments", key=post_key, flush_every=every)
+        _run_stage(run, stages, "reddit_comments", top_reddit_posts, payload, reddit_posts_with_comments)
         
         # Save Reddit posts with comments checkpoint
-        save_checkpoint({"reddit_posts_with_comments": reddit_posts_with_comments}, 
-                        "04_reddit_comments_complete.json", data_dir)
+        run.checkpoints.save_stream(reddit_posts_with_comments, "04_reddit_comments_complete.json", "reddit_posts_with_comments")
         
         # Step 5: Analyze HackerNews posts
-        logging.info("\n[STEP 5] Analyzing HackerNews posts...")
-        hn_analyses = []
-        for i, post in enumerate(hn_posts):
-            logging.info(f"   Analyzing HN post {i+1}/{len(hn_posts)}: {post['title'][:50]}...")
-            try:
-                analysis = analyze_hn_post(post, business_idea)
-                hn_analyses.append(analysis)
-                
-                # Save checkpoint periodically
-                if (i+1) % CHECKPOINT_INTERVAL == 0 or i == len(hn_posts) - 1:
-                    save_checkpoint([a.dict() for a in hn_analyses], 
-                                    f"05_hn_analyses_partial_{i+1}.json", data_dir)
-                
-            except Exception as e:
-                logging.error(f"Error analyzing HN post {i+1}: {e}")
-                logging.error(traceback.format_exc())
-                # Continue with other posts
-            
-            time.sleep(0.5)
+        run.logger.info("\n[STEP 5] Analyzing HackerNews posts...")
+        run.check_cancelled()
+        hn_analyses = run.checkpoints.spill("05_hn_analyses", flush_every=every)
+        # Where each platform's analysis stopped, for the run report
+        early_stops: Dict[str, Any] = {}
+        # Every sampled HN post is analyzed, in sample order; the top stories carry their comment threads and articles
+        hn_to_analyze = _analysis_inputs(
+            run, "05_hn_to_analyze", _in_sample_order(hn_sample, hn_posts_with_comments),
+            hn_analyses, rejected_hn_analysis, business_idea, "HackerNews", "hn_analysis", on_result
+        )
+        hn_monitor = ConvergenceMonitor("HackerNews", len(hn_to_analyze), config) if config.EARLY_STOPPING else None
+        _run_stage(run, stages, "hn_analysis", hn_to_analyze, payload, hn_analyses,
+                   _summarized(run.summaries["HackerNews"], _new_items(on_result, "hn_analysis")), hn_monitor)
+        _record_early_stop(run, hn_monitor, "hn", early_stops)
         
         # Save HN analyses checkpoint
-        save_checkpoint([a.dict() for a in hn_analyses], "05_hn_analyses_complete.json", data_dir)
+        run.checkpoints.save_stream(hn_analyses, "05_hn_analyses_complete.json")
         
         # Step 6: Analyze Reddit posts
-        logging.info("\n[STEP 6] Analyzing Reddit posts...")
-        reddit_analyses = []
-        for i, post in enumerate(reddit_posts_with_comments):
-            logging.info(f"   Analyzing Reddit post {i+1}/{len(reddit_posts_with_comments)}: {post['title'][:50]}...")
-            try:
-                comments = post.get('comments_data', [])
-                analysis = analyze_reddit_post(post, comments, business_idea)
-                reddit_analyses.append(analysis)
-                
-                # Save checkpoint periodically
-                if (i+1) % CHECKPOINT_INTERVAL == 0 or i == len(reddit_posts_with_comments) - 1:
-                    save_checkpoint([a.dict() for a in reddit_analyses], 
-                                    f"06_reddit_analyses_partial_{i+1}.json", data_dir)
-                
-            except Exception as e:
-                logging.error(f"Error analyzing Reddit post {i+1}: {e}")
-                logging.error(traceback.format_exc())
-                # Continue with other posts
-            
-            time.sleep(0.5)
+        run.logger.info("\n[STEP 6] Analyzing Reddit posts...")
+        run.check_cancelled()
+        reddit_analyses = run.checkpoints.spill("06_reddit_analyses", flush_every=every)
+        # Every sampled Reddit post is analyzed, in sample order; those that passed triage carry their comment threads
+        reddit_to_analyze = _analysis_inputs(
+            run, "06_reddit_to_analyze", _in_sample_order(reddit_sample, reddit_posts_with_comments),
+            reddit_analyses, rejected_reddit_analysis, business_idea, "Reddit", "reddit_analysis", on_result
+        )
+        reddit_monitor = ConvergenceMonitor("Reddit", len(reddit_to_analyze), config) if config.EARLY_STOPPING else None
+        _run_stage(run, stages, "reddit_analysis", reddit_to_analyze, payload, reddit_analyses,
+                   _summarized(run.summaries["Reddit"], _new_items(on_result, "reddit_analysis")), reddit_monitor)
+        _record_early_stop(run, reddit_monitor, "reddit", early_stops)
         
         # Save Reddit analyses checkpoint
-        save_checkpoint([a.dict() for a in reddit_analyses], "06_reddit_analyses_complete.json", data_dir)
+        run.checkpoints.save_stream(reddit_analyses, "06_reddit_analyses_complete.json")
         
         # Step 7: Generate final analysis
-        logging.info("\n[STEP 7] Generating combined validation report...")
+        run.check_cancelled()
+        run.logger.info("\n[STEP 7] Generating combined validation report...")
+        run.events.stage_started("final_analysis")
+        run.checkpoints.save({platform: summary.snapshot() for platform, summary in run.summaries.items()}, "07_analysis_summaries.json")
+        # The running summaries already hold everything the report needs
+        hn_summary = run.summaries["HackerNews"]
+        reddit_summary = run.summaries["Reddit"]
+        # What the sample's analyses say about all collected posts
+        estimates = sample.estimate(chain(hn_analyses, reddit_analyses))
+        run.checkpoints.save(estimates, "07_relevance_estimates.json")
         try:
-            final_analysis = generate_final_analysis(hn_analyses, reddit_analyses, business_idea, keywords)
+            final_analysis = generate_final_analysis(
+                hn_summary, reddit_summary, business_idea, keywords, on_field=on_partial_result, estimates=estimates
+            )
             
             # Save final analysis
-            save_checkpoint(final_analysis.dict(), "07_final_analysis.json", data_dir)
+            run.checkpoints.save(final_analysis.dict(), "07_final_analysis.json")
             
         except Exception as e:
-            logging.error(f"Error generating final analysis: {e}")
-            logging.error(traceback.format_exc())
+            run.logger.error(f"Error generating final analysis: {e}")
+            run.logger.error(traceback.format_exc())
             
             # Create a simplified fallback analysis
-            logging.info("Creating fallback analysis from collected data...")
-            final_analysis = create_fallback_analysis(hn_analyses, reddit_analyses, business_idea, keywords)
+            run.logger.info("Creating fallback analysis from collected data...")
+            final_analysis = create_fallback_analysis(hn_summary, reddit_summary, business_idea, keywords, estimates)
             
             # Save fallback analysis
-            save_checkpoint(final_analysis.dict(), "07_fallback_analysis.json", data_dir)
+            run.checkpoints.save(final_analysis.dict(), "07_fallback_analysis.json")
+        run.events.stage_finished("final_analysis", overall_score=final_analysis.overall_score)
+        
+        # The complete checkpoints hold everything the spill files do
+        if not config.KEEP_SPILL_FILES:
+            run.checkpoints.remove_spills()
         
+        run.checkpoints.save(dict(run.metrics.snapshot(), early_stopping=early_stops), "08_run_metrics.json")
         return final_analysis
         
+    except RunCancelled:
+        run.logger.warning("Validation cancelled")
+        raise
+        
     except Exception as e:
-        logging.error(f"Unexpected error in validation process: {e}")
-        logging.error(traceback.format_exc())
+        run.logger.error(f"Unexpected error in validation process: {e}")
+        run.logger.error(traceback.format_exc())
         
         # Try to create a minimal analysis from whatever data we have
         try:
-            return create_minimal_analysis(business_idea, data_dir)
+            return create_minimal_analysis(business_idea)
         except:
             # If all else fails, return an empty analysis
             return CombinedAnalysis(
@@ -236,13 +446,31 @@ def validate_business_idea(business_idea: str) -> CombinedAnalysis:
                 platform_insights={"error": "Analysis failed"},
                 recommendations=["Review collected data manually", "Try again with fewer keywords"]
             )
+    
+    finally:
+        run.checkpoints.close_spills()
 
 if __name__ == "__main__":
+    from business_validator.jobs import JobClient, SUCCEEDED
+    
     # Example usage
     business_idea = input("Enter your business idea: ")
     
-    # Validate the idea
-    analysis = validate_business_idea(business_idea)
+    # Validate the idea through the job service when it is running, otherwise in this process
+    client = JobClient()
+    if client.available():
+        job = client.submit(business_idea)
+        print(f"Submitted job {job['id']} to {client.base_url}; waiting for it to finish...")
+        job = client.wait(job["id"])
+        if job["status"] != SUCCEEDED:
+            raise SystemExit(f"Job {job['id']} {job['status']}: {job.get('error') or ''}")
+        analysis = CombinedAnalysis(**client.result(job["id"]))
+        data_dir = job["data_dir"]
+    else:
+        print(f"Job service not reachable at {client.base_url}; validating in this process")
+        run = RunContext(business_idea)
+        analysis = validate_business_idea(business_idea, run=run)
+        data_dir = run.data_dir
     
     # Print the report
     print_validation_report(analysis, business_idea)
@@ -10,15 +10,22 @@ import pandas as pd
 import json
 import os
 import time
-import glob
 from datetime import datetime
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
 
-from business_validator import validate_business_idea
 from business_validator.config import DATA_DIR
-from business_validator.utils.environment import setup_environment
+from business_validator.utils.events import overall_progress, describe_progress
+from business_validator.jobs import (
+    JobClient,
+    JobServiceError,
+    start_background_service,
+    QUEUED,
+    SUCCEEDED,
+    CANCELLED,
+    FINISHED_STATUSES
+)
 
 # Set page configuration
 st.set_page_config(
@@ -67,6 +74,15 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_job_client():
+    """Connect to the job service, starting one in this process if none is running."""
+    client = JobClient()
+    if not client.available():
+        # Shared by all sessions of this Streamlit process, so jobs outlive the session that submitted them
+        start_background_service()
+    return client
+
 def load_previous_runs():
     """Load previous validation runs from the data directory."""
     runs = []
@@ -260,179 +276,87 @@ def display_validation_results(analysis_data, business_idea):
         for recommendation in recommendations:
             st.markdown(f"- {recommendation}")
 
+def display_partial_results(partial):
+    """Display the report fields that have been generated so far."""
+    st.markdown("<h2 class='sub-header'>Early Results</h2>", unsafe_allow_html=True)
+    
+    if "overall_score" in partial:
+        st.metric("Validation Score", f"{partial['overall_score']}/100")
+    
+    if "market_validation_summary" in partial:
+        st.markdown(f"<p class='insight-text'>{partial['market_validation_summary']}</p>", unsafe_allow_html=True)
+    
+    sections = [
+        ("key_pain_points", "Key Pain Points"),
+        ("existing_solutions", "Existing Solutions"),
+        ("market_opportunities", "Market Opportunities"),
+        ("recommendations", "Recommendations")
+    ]
+    for field, title in sections:
+        if field in partial:
+            st.markdown(f"**{title}**")
+            for item in partial[field]:
+                st.markdown(f"- {item}")
+
 def run_validation_with_progress(business_idea):
-    """Run the validation process with progress indicators."""
+    """Run the validation as a background job and show its progress."""
     # Create a progress bar
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    # Define the steps and their weights
-    steps = [
-        ("Generating keywords", 5),
-        ("Searching HackerNews", 20),
-        ("Searching Reddit", 20),
-        ("Scraping Reddit comments", 15),
-        ("Analyzing HackerNews posts", 15),
-        ("Analyzing Reddit posts", 15),
-        ("Generating final report", 10)
-    ]
-    
-    total_weight = sum(weight for _, weight in steps)
-    
-    # Setup environment to get the data directory
-    env = setup_environment(business_idea)
-    run_id = env["run_id"]
-    data_dir = env["data_dir"]
-    
-    # Start the validation process
-    validation_thread = None
-    
     try:
-        # Initialize progress tracking
-        progress_state = {
-            "current_step": 0,
-            "completed_weight": 0,
-            "data_dir": data_dir,
-            "run_id": run_id,
-            "completed": False,
-            "analysis": None,
-            "error": None
-        }
+        # Queue the validation with the job service; it keeps running if this session ends
+        client = get_job_client()
+        job = client.submit(business_idea)
+        job_id = job["id"]
+        st.session_state["job_id"] = job_id
         
-        # Start validation in a separate thread
-        import threading
-        
-        def validation_worker():
-            try:
-                progress_state["analysis"] = validate_business_idea(business_idea)
-                progress_state["completed"] = True
-            except Exception as e:
-                progress_state["error"] = str(e)
-                progress_state["completed"] = True
-        
-        validation_thread = threading.Thread(target=validation_worker)
-        validation_thread.start()
+        # Placeholder for report fields streamed in before the run completes
+        partial_placeholder = st.empty()
+        rendered_fields = set()
         
         # Monitor progress while validation is running
-        while not progress_state["completed"]:
-            # Check for checkpoint files to determine progress
-            current_step = 0
-            completed_weight = 0
+        while True:
+            job = client.get(job_id)
+            if job["status"] in FINISHED_STATUSES:
+                break
             
-            # Step 1: Keywords
-            if os.path.exists(os.path.join(data_dir, "01_keywords.json")):
-                current_step = 1
-                completed_weight += steps[0][1]
-                status_text.text(f"Step 1/7: {steps[0][0]} - Completed")
-                
-                # Step 2: HackerNews scraping
-                hn_complete = os.path.exists(os.path.join(data_dir, "02_hn_posts_complete.json"))
-                hn_partial_files = glob.glob(os.path.join(data_dir, "02_hn_posts_partial_*.json"))
-                
-                if hn_complete:
-                    current_step = 2
-                    completed_weight += steps[1][1]
-                    status_text.text(f"Step 2/7: {steps[1][0]} - Completed")
-                elif hn_partial_files:
-                    current_step = 2
-                    # Calculate partial progress based on number of files
-                    partial_progress = len(hn_partial_files) / 10  # Assuming ~10 partial files for full completion
-                    partial_progress = min(0.9, partial_progress)  # Cap at 90% for partial completion
-                    completed_weight += steps[1][1] * partial_progress
-                    status_text.text(f"Step 2/7: {steps[1][0]} - In progress...")
-                
-                # Step 3: Reddit scraping
-                reddit_complete = os.path.exists(os.path.join(data_dir, "03_reddit_posts_complete.json"))
-                reddit_partial_files = glob.glob(os.path.join(data_dir, "03_reddit_posts_partial_*.json"))
-                
-                if reddit_complete:
-                    current_step = 3
-                    completed_weight += steps[2][1]
-                    status_text.text(f"Step 3/7: {steps[2][0]} - Completed")
-                elif reddit_partial_files and current_step >= 2:
-                    current_step = 3
-                    partial_progress = len(reddit_partial_files) / 10
-                    partial_progress = min(0.9, partial_progress)
-                    completed_weight += steps[2][1] * partial_progress
-                    status_text.text(f"Step 3/7: {steps[2][0]} - In progress...")
-                
-                # Step 4: Reddit comments
-                comments_complete = os.path.exists(os.path.join(data_dir, "04_reddit_comments_complete.json"))
-                comments_partial_files = glob.glob(os.path.join(data_dir, "04_reddit_comments_partial_*.json"))
-                
-                if comments_complete:
-                    current_step = 4
-                    completed_weight += steps[3][1]
-                    status_text.text(f"Step 4/7: {steps[3][0]} - Completed")
-                elif comments_partial_files and current_step >= 3:
-                    current_step = 4
-                    partial_progress = len(comments_partial_files) / 5  # Usually fewer comment files
-                    partial_progress = min(0.9, partial_progress)
-                    completed_weight += steps[3][1] * partial_progress
-                    status_text.text(f"Step 4/7: {steps[3][0]} - In progress...")
-                
-                # Step 5: HN analysis
-                hn_analysis_complete = os.path.exists(os.path.join(data_dir, "05_hn_analyses_complete.json"))
-                hn_analysis_partial_files = glob.glob(os.path.join(data_dir, "05_hn_analyses_partial_*.json"))
-                
-                if hn_analysis_complete:
-                    current_step = 5
-                    completed_weight += steps[4][1]
-                    status_text.text(f"Step 5/7: {steps[4][0]} - Completed")
-                elif hn_analysis_partial_files and current_step >= 4:
-                    current_step = 5
-                    partial_progress = len(hn_analysis_partial_files) / 20  # More analysis files
-                    partial_progress = min(0.9, partial_progress)
-                    completed_weight += steps[4][1] * partial_progress
-                    status_text.text(f"Step 5/7: {steps[4][0]} - In progress...")
-                
-                # Step 6: Reddit analysis
-                reddit_analysis_complete = os.path.exists(os.path.join(data_dir, "06_reddit_analyses_complete.json"))
-                reddit_analysis_partial_files = glob.glob(os.path.join(data_dir, "06_reddit_analyses_partial_*.json"))
-                
-                if reddit_analysis_complete:
-                    current_step = 6
-                    completed_weight += steps[5][1]
-                    status_text.text(f"Step 6/7: {steps[5][0]} - Completed")
-                elif reddit_analysis_partial_files and current_step >= 5:
-                    current_step = 6
-                    partial_progress = len(reddit_analysis_partial_files) / 5
-                    partial_progress = min(0.9, partial_progress)
-                    completed_weight += steps[5][1] * partial_progress
-                    status_text.text(f"Step 6/7: {steps[5][0]} - In progress...")
-                
-                # Step 7: Final analysis
-                final_analysis = os.path.exists(os.path.join(data_dir, "07_final_analysis.json"))
-                
-                if final_analysis:
-                    current_step = 7
-                    completed_weight += steps[6][1]
-                    status_text.text(f"Step 7/7: {steps[6][0]} - Completed")
-                elif current_step >= 6:
-                    current_step = 7
-                    status_text.text(f"Step 7/7: {steps[6][0]} - In progress...")
+            # The job carries the run's latest progress events (stage and exact item counts)
+            if job["status"] == QUEUED:
+                status_text.text("Queued - waiting for a free worker...")
             else:
-                # Still on first step
-                status_text.text(f"Step 1/7: {steps[0][0]} - In progress...")
+                status_text.text(describe_progress(job["progress"]))
+            progress_bar.progress(overall_progress(job["progress"]))
             
-            # Update progress bar
-            progress_bar.progress(completed_weight / total_weight)
+            # Render report fields as soon as they are streamed back
+            partial = job["partial"]
+            if partial and set(partial) != rendered_fields:
+                rendered_fields = set(partial)
+                with partial_placeholder.container():
+                    display_partial_results(partial)
             
             # Sleep briefly to avoid excessive CPU usage
             time.sleep(0.5)
         
-        # Check if there was an error
-        if progress_state["error"]:
-            st.error(f"Error during validation: {progress_state['error']}")
+        # Check if the job failed or was cancelled
+        if job["status"] == CANCELLED:
+            st.warning("The validation was cancelled.")
+            return None
+        if job["status"] != SUCCEEDED:
+            st.error(f"Error during validation: {job['error']}")
             return None
         
         # Show completion
+        partial_placeholder.empty()
         progress_bar.progress(1.0)
         status_text.text("Validation complete!")
         
         # Return the analysis
-        return progress_state["analysis"]
+        return client.result(job_id)
         
+    except JobServiceError as e:
+        st.error(f"Job service error: {e}")
+        return None
     except Exception as e:
         st.error(f"Error during validation: {e}")
         return None
@@ -459,6 +383,22 @@ def main():
     else:
         view_previous = False
     
+    # Jobs queued or running in the job service (from any session)
+    try:
+        active_jobs = [job for job in get_job_client().list(limit=20) if job["status"] not in FINISHED_STATUSES]
+    except JobServiceError:
+        active_jobs = []
+    if active_jobs:
+        st.sidebar.markdown("## Active Jobs")
+        for job in active_jobs:
+            st.sidebar.markdown(f"`{job['id']}` {job['status']}: {job['business_idea'][:40]}")
+            if job["status"] != QUEUED:
+                st.sidebar.caption(describe_progress(job["progress"]))
+        job_to_cancel = st.sidebar.selectbox("Cancel a job:", options=[job["id"] for job in active_jobs], index=None)
+        if job_to_cancel and st.sidebar.button("Cancel job"):
+            get_job_client().cancel(job_to_cancel)
+            st.sidebar.info(f"Cancellation requested for job {job_to_cancel}")
+    
     # Main content
     if not view_previous:
         # New validation form
@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the business_validator package importable from the repo root.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
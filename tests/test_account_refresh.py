@@ -0,0 +1,38 @@
+"""
+Tests for re-reading the ScraperAPI account limits during long jobs.
+"""
+
+import threading
+import time
+
+from business_validator.scrapers import transport
+from business_validator.utils.key_pool import KeyPool
+
+def test_stale_limits_are_refreshed_by_one_thread(monkeypatch):
+    probes = []
+
+    def read_account(key):
+        probes.append(key)
+        time.sleep(0.2)
+        return {"concurrency_limit": 5, "request_limit": 1000, "request_count": 10}
+
+    monkeypatch.setattr(transport, "scraperapi_pool", KeyPool("scraperapi", ["key-1"], concurrency=1))
+    monkeypatch.setattr(transport, "_read_account", read_account)
+    monkeypatch.setattr(transport, "_resize_connection_pool", lambda size: None)
+    monkeypatch.setattr(transport, "_account_limits", {})
+    monkeypatch.setattr(transport, "_last_probe", time.monotonic() - transport.ACCOUNT_REFRESH_SECONDS - 1)
+
+    start = threading.Barrier(8)
+
+    def request():
+        start.wait()
+        transport._maybe_refresh_account()
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert probes == ["key-1"]
+    assert transport.scraper_capacity() == 5
@@ -0,0 +1,69 @@
+"""
+Tests that the per-post comment limit follows the run's config overrides.
+"""
+
+import json
+
+import pytest
+
+from business_validator.run_context import RunContext
+from business_validator.scrapers import hackernews, reddit
+from business_validator.scrapers.hackernews import flatten_hn_comments
+from business_validator.utils.cache import BoundedCache
+
+THREAD = {"children": [
+    {"type": "comment", "text": f"<p>Comment {i}</p>", "author": "a", "children": []} for i in range(5)
+]}
+
+POST_URL = "https://www.reddit.com/r/smallbusiness/comments/abc/invoices/"
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(hackernews, "_comment_cache", BoundedCache(16, 60))
+    monkeypatch.setattr(reddit, "_comment_cache", BoundedCache(16, 60))
+    with RunContext("Invoicing for freelancers", {"MAX_COMMENTS_PER_POST": 2}) as run:
+        yield run
+
+def test_hn_comments_follow_the_run_limit(run, monkeypatch):
+    monkeypatch.setattr(hackernews, "direct_get", lambda url, endpoint="default": Response(json.dumps(THREAD)))
+
+    assert len(flatten_hn_comments(THREAD)) == 2
+    assert len(flatten_hn_comments(THREAD, limit=4)) == 4
+    comments = hackernews.scrape_hn_post_comments({"hn_id": "1"})
+    assert [c["text"] for c in comments] == ["Comment 0", "Comment 1"]
+
+def test_reddit_comments_follow_the_run_limit(run, monkeypatch):
+    requested = []
+
+    def fetch_tiered(endpoint, tiers, context=None):
+        requested.append(tiers[0].url)
+        return [{"text": f"Comment {i}"} for i in range(5)], "json"
+
+    monkeypatch.setattr(reddit, "fetch_tiered", fetch_tiered)
+
+    assert len(reddit.scrape_reddit_post_comments(POST_URL)) == 2
+    assert "limit=2&" in requested[0]
+
+def test_comment_cache_is_not_shared_across_limits(run, monkeypatch):
+    monkeypatch.setattr(hackernews, "direct_get", lambda url, endpoint="default": Response(json.dumps(THREAD)))
+
+    assert len(hackernews.scrape_hn_post_comments({"hn_id": "1"})) == 2
+    with RunContext("Invoicing for freelancers", {"MAX_COMMENTS_PER_POST": 4}):
+        assert len(hackernews.scrape_hn_post_comments({"hn_id": "1"})) == 4
+
+def test_cached_comments_are_not_shared_between_posts(run, monkeypatch):
+    monkeypatch.setattr(hackernews, "direct_get", lambda url, endpoint="default": Response(json.dumps(THREAD)))
+    monkeypatch.setattr(reddit, "fetch_tiered", lambda endpoint, tiers, context=None: ([{"text": "Comment"}], "json"))
+
+    for scrape in (lambda: hackernews.scrape_hn_post_comments({"hn_id": "1"}),
+                   lambda: reddit.scrape_reddit_post_comments(POST_URL)):
+        first = scrape()
+        expected = list(first)
+        first.append({"text": "Added by one post"})
+        scrape().clear()
+        assert scrape() == expected
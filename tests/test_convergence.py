@@ -0,0 +1,59 @@
+"""
+Tests for early stopping of the post analysis stages at the default settings.
+"""
+
+import random
+
+from business_validator import config
+from business_validator.analyzers.convergence import ConvergenceMonitor
+from business_validator.utils.sampling import allocate
+
+PAIN_POINTS = ["Late payments", "Chasing clients", "Tax paperwork", "Currency fees"]
+
+def platform_share():
+    """HN's share of the default ANALYSIS_BUDGET when both platforms collected as many posts."""
+    sizes = {("HackerNews", "invoicing", "", "0-9"): 300, ("Reddit", "invoicing", "freelance", "0-9"): 300}
+    return allocate(sizes, config.ANALYSIS_BUDGET)[("HackerNews", "invoicing", "", "0-9")]
+
+def analyses(total, pain_points):
+    rng = random.Random(7)
+    for i in range(total):
+        relevant = rng.random() < 0.5
+        yield {
+            "relevant": relevant,
+            "sentiment": rng.choices(["negative", "neutral", "positive"], [6, 3, 1])[0] if relevant else "neutral",
+            "pain_points": pain_points(rng, i) if relevant else []
+        }
+
+def run(monitor, stream, batch=5):
+    posts_done = 0
+    pending = []
+    for analysis in stream:
+        pending.append(analysis)
+        if len(pending) == batch:
+            posts_done += len(pending)
+            if monitor.update(posts_done, pending):
+                return posts_done
+            pending = []
+    return posts_done
+
+def test_defaults_stop_before_the_sample_is_used_up():
+    total = platform_share()
+    assert total == config.ANALYSIS_BUDGET // 2
+    monitor = ConvergenceMonitor("HackerNews", total, config)
+
+    stopped_at = run(monitor, analyses(total, lambda rng, i: rng.choices(PAIN_POINTS, [8, 4, 2, 1])))
+
+    assert monitor.converged
+    assert stopped_at < total
+    assert monitor.report()["analyses_saved"] == total - stopped_at
+
+def test_one_off_pain_points_are_not_a_stable_ranking():
+    total = platform_share()
+    monitor = ConvergenceMonitor("HackerNews", total, config)
+
+    run(monitor, analyses(total, lambda rng, i: [f"Complaint {i}"]))
+
+    assert not monitor.converged
+    assert monitor.stable == 0
+    assert monitor.report()["top_pain_points"] == []
@@ -0,0 +1,59 @@
+"""
+Tests for the cheapest-first fetch tiers and the memory of escalations.
+"""
+
+import json
+
+import pytest
+
+from business_validator.scrapers import transport
+from business_validator.scrapers.transport import FetchTier, fetch_tiered
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+def parse_listing(text):
+    return json.loads(text)["items"]
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Record every fetch; the JSON tier of Reddit comment threads is blocked, everything else works."""
+    calls = []
+
+    def direct_get(url, endpoint="default"):
+        calls.append(endpoint)
+        if "/comments/" in url:
+            raise ConnectionError("403 Forbidden")
+        return Response(json.dumps({"items": [{"url": url}]}))
+
+    def scraperapi_get(payload, endpoint="default", timeout=None):
+        calls.append(endpoint)
+        return Response(json.dumps({"items": [{"url": payload["url"]}]}))
+
+    monkeypatch.setattr(transport, "direct_get", direct_get)
+    monkeypatch.setattr(transport, "scraperapi_get", scraperapi_get)
+    monkeypatch.setattr(transport, "_tier_memory", {})
+    return calls
+
+def tiers(url):
+    return [
+        FetchTier("json", url, parse_listing),
+        FetchTier("rendered", url, parse_listing, {"render": "true"})
+    ]
+
+def test_escalation_is_remembered_for_its_endpoint(fetches):
+    thread = "https://old.reddit.com/r/freelance/comments/abc/late_invoices/"
+    assert fetch_tiered("reddit_comments", tiers(thread))[1] == "rendered"
+    assert fetch_tiered("reddit_comments", tiers(thread))[1] == "rendered"
+    # The second thread goes straight to the tier that worked
+    assert fetches == ["reddit_comments.json", "reddit_comments.rendered", "reddit_comments.rendered"]
+
+def test_comment_escalation_does_not_affect_search(fetches):
+    fetch_tiered("reddit_comments", tiers("https://www.reddit.com/r/freelance/comments/abc/late_invoices/"))
+    fetches.clear()
+
+    items, tier = fetch_tiered("reddit_search", tiers("https://www.reddit.com/search.json?q=invoicing"))
+
+    assert tier == "json" and items
+    assert fetches == ["reddit_search.json"]
@@ -0,0 +1,84 @@
+"""
+Tests for the streamed final report: what streaming consumers see, and the
+pooled key being held while the stream is read.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+from google.generativeai import protos
+
+from business_validator.analyzers import llm_client
+from business_validator.analyzers.combined_analyzer import generate_final_analysis
+from business_validator.analyzers.summary import AnalysisSummary
+from business_validator.run_context import RunContext
+from business_validator.utils.key_pool import KeyPool
+
+REPORT = {
+    "overall_score": 62,
+    "market_validation_summary": "Freelancers chase late invoices by hand",
+    "key_pain_points": ["Late payments"],
+    "existing_solutions": ["Spreadsheets"],
+    "market_opportunities": ["Automatic reminders"],
+    "platform_insights": [{"platform": "HackerNews", "insights": "Developers want automation"},
+                          {"platform": "Reddit", "insights": "Freelancers complain about late payers"}],
+    "recommendations": ["Interview ten freelancers"]
+}
+
+ESTIMATES = {
+    "HackerNews": {"posts": 120, "sampled": 40, "analyzed": 40, "relevance_rate": 0.4, "low": 0.25, "high": 0.55,
+                   "estimated_relevant_posts": 48, "coverage": 1.0},
+    "Reddit": {"posts": 80, "sampled": 40, "analyzed": 30, "relevance_rate": 0.5, "low": 0.3, "high": 0.7,
+               "estimated_relevant_posts": 40, "coverage": 0.9}
+}
+
+class GenerativeService:
+    """Stand-in for Gemini's generative service that streams the report in small chunks."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.in_flight_while_streaming = []
+
+    def stream_generate_content(self, request, **kwargs):
+        text = json.dumps(REPORT)
+        for start in range(0, len(text), 40):
+            self.in_flight_while_streaming.append(self.pool.stats()["...-key"]["in_flight"])
+            yield protos.GenerateContentResponse(candidates=[protos.Candidate(
+                content=protos.Content(parts=[protos.Part(text=text[start:start + 40])], role="model")
+            )])
+
+@pytest.fixture
+def gemini(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pool = KeyPool("gemini", ["test-key"], concurrency=1)
+    service = GenerativeService(pool)
+    monkeypatch.setattr(llm_client, "google_pool", pool)
+    monkeypatch.setattr(llm_client, "_client_for_key", lambda api_key: service)
+    monkeypatch.setattr(llm_client, "_models", {})
+    return service
+
+def test_streamed_insights_match_the_final_report(gemini):
+    streamed = {}
+    with RunContext("Invoicing for freelancers"):
+        analysis = generate_final_analysis(
+            AnalysisSummary("HackerNews"), AnalysisSummary("Reddit"), "Invoicing for freelancers", ["invoicing"],
+            on_field=streamed.__setitem__, estimates=ESTIMATES
+        )
+
+    final = [insight.dict() for insight in analysis.platform_insights]
+    assert streamed["platform_insights"] == final
+    assert "an estimated 40% of 120 posts are relevant" in final[0]["insights"]
+    assert streamed["overall_score"] == 62
+
+def test_pooled_key_is_held_until_the_stream_is_drained(gemini):
+    with RunContext("Invoicing for freelancers"):
+        generate_final_analysis(
+            AnalysisSummary("HackerNews"), AnalysisSummary("Reddit"), "Invoicing for freelancers",
+            on_field=lambda name, value: None
+        )
+
+    assert len(gemini.in_flight_while_streaming) > 1
+    assert set(gemini.in_flight_while_streaming) == {1}
+    assert llm_client.google_pool.stats()["...-key"]["in_flight"] == 0
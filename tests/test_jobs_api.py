@@ -0,0 +1,69 @@
+"""
+Tests for request validation in the job service's HTTP API.
+"""
+
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from business_validator.jobs.server import make_server
+from business_validator.jobs.service import JobService
+from business_validator.jobs.store import JobStore
+
+@pytest.fixture
+def api(tmp_path):
+    """An API over a job store with one queued job; no workers are started."""
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.submit("Invoicing for freelancers")
+    server = make_server(JobService(store=store), "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def get(url):
+    return send(Request(url))
+
+def post(url, body):
+    return send(Request(url, data=json.dumps(body).encode("utf-8"), headers={"Content-Type": "application/json"}))
+
+def send(request):
+    try:
+        with urlopen(request) as response:
+            return response.status, json.load(response)
+    except HTTPError as e:
+        return e.code, json.load(e)
+
+@pytest.mark.parametrize("limit", ["abc", "1.5", "0", "-3"])
+def test_bad_list_limit_is_rejected(api, limit):
+    status, body = get(f"{api}/jobs?limit={limit}")
+    assert status == 400
+    assert "limit" in body["error"]
+
+def test_list_limit(api):
+    status, body = get(f"{api}/jobs?limit=5")
+    assert status == 200
+    assert [job["business_idea"] for job in body["jobs"]] == ["Invoicing for freelancers"]
+
+@pytest.mark.parametrize("overrides", [5, True, [1], "MAX_COMMENTS_PER_POST", {"max_comments": 3}])
+def test_bad_config_overrides_are_rejected(api, overrides):
+    status, body = post(f"{api}/jobs", {"business_idea": "Invoicing for agencies", "config_overrides": overrides})
+    assert status == 400
+    assert "config" in body["error"].lower()
+    # The handler survived to serve the next request
+    assert get(f"{api}/jobs")[0] == 200
+
+@pytest.mark.parametrize("business_idea", [5, ["Invoicing"], "  "])
+def test_bad_business_idea_is_rejected(api, business_idea):
+    status, body = post(f"{api}/jobs", {"business_idea": business_idea})
+    assert status == 400
+    assert "business_idea" in body["error"]
+
+def test_submit(api):
+    status, body = post(f"{api}/jobs", {"business_idea": "Invoicing for agencies",
+                                        "config_overrides": {"MAX_COMMENTS_PER_POST": 3}})
+    assert status == 202
+    assert body["business_idea"] == "Invoicing for agencies"
@@ -0,0 +1,16 @@
+"""
+Tests for handing out pooled API keys.
+"""
+
+from business_validator.utils.key_pool import KeyPool
+
+def test_preferred_key_is_used_while_in_the_pool():
+    pool = KeyPool("gemini", ["key-a", "key-b"], concurrency=2)
+    with pool.acquire(preferred="key-b") as key:
+        assert key == "key-b"
+
+def test_unknown_preferred_key_falls_back_to_the_pool():
+    pool = KeyPool("gemini", ["key-a", "key-b"], concurrency=1)
+    with pool.acquire(preferred="key-gone", timeout=1) as first:
+        with pool.acquire(preferred="key-gone", timeout=1) as second:
+            assert {first, second} == {"key-a", "key-b"}
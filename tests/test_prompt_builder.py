@@ -0,0 +1,12 @@
+"""
+Tests for the cleanup of scraped text before it goes into analysis prompts.
+"""
+
+from business_validator.analyzers.prompt_builder import clean_text
+
+def test_emphasis_markers_are_stripped():
+    assert clean_text("This is *really* _bad_ and __very__ ~~old~~ `code`") == "This is really bad and very old code"
+
+def test_underscores_inside_identifiers_are_kept():
+    text = "We moved the snake_case_name setting of my_lib into _private_fn and MAX_RETRIES"
+    assert clean_text(text) == text
@@ -0,0 +1,20 @@
+"""
+Tests for each run's log file.
+"""
+
+import logging
+
+from business_validator.run_context import RunContext
+
+def test_run_log_keeps_info_when_the_root_logger_is_quieter(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "level", logging.WARNING)
+
+    with RunContext("Invoicing for freelancers") as run:
+        run.logger.info("Step 1 done")
+
+    with open(run.log_file) as f:
+        log = f.read()
+    assert "Starting validation for business idea: Invoicing for freelancers" in log
+    assert "Step 1 done" in log
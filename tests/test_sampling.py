@@ -0,0 +1,54 @@
+"""
+Tests for the relevance estimates extrapolated from a partly analyzed sample.
+"""
+
+import math
+
+import pytest
+
+from business_validator.utils.sampling import StratifiedSample, Z_95
+
+A = ("Reddit", "invoicing", "freelance", "0-9")
+B = ("Reddit", "invoicing", "smallbusiness", "0-9")
+C = ("Reddit", "invoicing", "accounting", "0-9")
+
+def sample():
+    """Two strata of 100 posts and one of 50, four posts sampled from each."""
+    drawn = StratifiedSample(12, {A: 100, B: 100, C: 50}, {A: 4, B: 4, C: 4})
+    for stratum in (A, B, C):
+        for i in range(4):
+            drawn.post_strata[f"https://reddit.com/{stratum[2]}/{i}"] = stratum
+    return drawn
+
+def analysis(stratum, i, relevant):
+    return {"post_url": f"https://reddit.com/{stratum[2]}/{i}", "relevant": relevant}
+
+def margin(strata):
+    """95% margin for (weight, n, relevant, size) per stratum, as the estimator computes it."""
+    variance = 0.0
+    for weight, n, relevant, size in strata:
+        smoothed = (relevant + 0.5) / (n + 1)
+        variance += weight * weight * (1 - n / size) * smoothed * (1 - smoothed) / n
+    return Z_95 * math.sqrt(variance)
+
+def test_estimate_rests_on_the_posts_actually_analyzed():
+    # Early stop: half of A's sample and all of B's were analyzed, none of C's
+    analyses = [analysis(A, 0, True), analysis(A, 1, True)] + [analysis(B, i, False) for i in range(4)]
+    # An analysis repeated on resume counts once
+    analyses.append(analysis(A, 0, True))
+
+    estimate = sample().estimate(analyses)["Reddit"]
+
+    assert estimate["posts"] == 250
+    assert estimate["sampled"] == 12
+    assert estimate["analyzed"] == 6
+    assert estimate["relevance_rate"] == 0.5
+    assert estimate["coverage"] == 0.8
+    expected = margin([(0.5, 2, 2, 100), (0.5, 4, 0, 100)])
+    assert estimate["low"] == pytest.approx(round(0.5 - expected, 3))
+    assert estimate["high"] == pytest.approx(round(0.5 + expected, 3))
+
+def test_estimate_without_analyses():
+    estimate = sample().estimate([])["overall"]
+    assert estimate["analyzed"] == 0 and estimate["sampled"] == 12
+    assert estimate["relevance_rate"] is None and estimate["coverage"] == 0.0
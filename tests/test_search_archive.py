@@ -0,0 +1,68 @@
+"""
+Tests that search pages served from the cache shared by runs are still
+archived with every run, so each run can be re-parsed on its own.
+"""
+
+import json
+
+import pytest
+
+from business_validator.reparse import reparse_run
+from business_validator.run_context import RunContext
+from business_validator.scrapers import hackernews, reddit, transport
+from business_validator.utils.archive import read_index
+from business_validator.utils.cache import BoundedCache
+
+HN_SEARCH = {"hits": [{"title": "Invoicing for freelancers", "objectID": "101", "url": "https://example.com/invoices",
+                       "points": 40, "num_comments": 12}], "page": 0, "nbPages": 1}
+REDDIT_SEARCH = {"data": {"after": None, "children": [{"kind": "t3", "data": {
+    "title": "How do you chase late invoices?", "permalink": "/r/freelance/comments/abc/late_invoices/",
+    "score": 25, "num_comments": 9, "subreddit": "freelance", "selftext": ""}}]}}
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+@pytest.fixture
+def services(tmp_path, monkeypatch):
+    """Serve the HN search API directly and the Reddit JSON listing through ScraperAPI, counting fetches."""
+    fetches = []
+
+    def direct_get(url, endpoint="default"):
+        fetches.append(url)
+        return Response(json.dumps(HN_SEARCH))
+
+    def scraperapi_get(payload, endpoint="default", timeout=None):
+        fetches.append(payload["url"])
+        return Response(json.dumps(REDDIT_SEARCH))
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transport, "direct_get", direct_get)
+    monkeypatch.setattr(transport, "scraperapi_get", scraperapi_get)
+    monkeypatch.setattr(transport, "_tier_memory", {})
+    monkeypatch.setattr(hackernews, "_search_cache", BoundedCache(16, 60))
+    monkeypatch.setattr(reddit, "_search_cache", BoundedCache(16, 60))
+    return fetches
+
+def search(business_idea):
+    with RunContext(business_idea) as run:
+        hackernews.scrape_hackernews("invoicing")
+        reddit.scrape_reddit_search("invoicing")
+    return run
+
+def test_run_served_from_the_search_cache_can_be_reparsed(services, tmp_path):
+    first = search("Invoicing for freelancers")
+    second = search("Invoicing for agencies")
+
+    # The second run fetched nothing, but archived the pages it was served
+    assert len(services) == 2
+    assert [(entry["endpoint"], entry["context"]) for entry in read_index(second.data_dir)] == [
+        ("hn_search", {"keyword": "invoicing", "page": 0}),
+        ("reddit_search", {"keyword": "invoicing", "page": 0})
+    ]
+
+    counts = reparse_run(second.data_dir, str(tmp_path / "reparsed"), workers=1)
+    assert counts["hn_posts"] == counts["reddit_posts"] == 1
+    assert counts == reparse_run(first.data_dir, str(tmp_path / "reparsed_first"), workers=1)
+    with open(tmp_path / "reparsed" / "02_hn_posts_complete.json") as f:
+        assert [post["title"] for post in json.load(f)["hn_posts"]] == ["Invoicing for freelancers"]
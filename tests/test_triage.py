@@ -0,0 +1,51 @@
+"""
+Tests for the triage verdicts of the analysis cascade.
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from business_validator.analyzers import llm_client
+from business_validator.analyzers.triage import _triage_batch
+from business_validator.models import TriageVerdict
+
+POSTS = [{"title": "Chasing late invoices"}, {"title": "My cat"}, {"title": "Billing software for freelancers"}]
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+def respond_with(monkeypatch, *payloads):
+    """Make Gemini calls return the given JSON payloads in turn."""
+    responses = iter(payloads)
+    monkeypatch.setattr(llm_client, "generate", lambda prompt, **kwargs: Response(json.dumps(next(responses))))
+
+@pytest.mark.parametrize("value, expected", [(True, True), (False, False), ("false", False), ("FALSE", False), (" True ", True)])
+def test_verdict_flag_accepts_booleans_and_true_false_strings(value, expected):
+    assert TriageVerdict(id=1, relevant=value, confidence=0.9).relevant is expected
+
+@pytest.mark.parametrize("value", ["no", "yes", "maybe", "", 1, None])
+def test_verdict_flag_rejects_anything_else(value):
+    with pytest.raises(ValidationError):
+        TriageVerdict(id=1, relevant=value, confidence=0.9)
+
+def test_string_verdicts_are_parsed_strictly(monkeypatch):
+    respond_with(monkeypatch, {"verdicts": [
+        {"id": 1, "relevant": "true", "confidence": 0.8},
+        {"id": 2, "relevant": "false", "confidence": 0.95},
+        {"id": 3, "relevant": "False", "confidence": 0.4}
+    ]})
+    assert _triage_batch(POSTS, "Invoicing for freelancers", "Reddit") == [(True, 0.8), (False, 0.95), (False, 0.4)]
+
+def test_posts_without_a_verdict_pass(monkeypatch):
+    respond_with(monkeypatch, {"verdicts": [{"id": 2, "relevant": False, "confidence": 0.9}]})
+    assert _triage_batch(POSTS, "Invoicing for freelancers", "Reddit") == [(True, 0.0), (False, 0.9), (True, 0.0)]
+
+def test_unparseable_verdicts_fail_the_batch(monkeypatch):
+    # The first answer and its repair both say "no"; the batch must not be read as relevant or irrelevant
+    bad = {"verdicts": [{"id": 1, "relevant": "no", "confidence": 0.9}]}
+    respond_with(monkeypatch, bad, bad)
+    with pytest.raises(ValueError):
+        _triage_batch(POSTS, "Invoicing for freelancers", "Reddit")